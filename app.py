@@ -3,9 +3,14 @@ Application Streamlit pour visualiser le catalogue de livres
 Mode lecture seule - L'ajout se fera via OCR de couvertures
 """
 
+import os
+
 import streamlit as st
 from services.bibliotheque import Bibliotheque
+from services.cached_repository import CachedRepository
+from services.connection_pool import get_pool
 from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+from services.migrations import migrate
 from const import BookFormat, Genre
 
 
@@ -16,18 +21,61 @@ st.set_page_config(
     layout="wide"
 )
 
+# Nombre maximal de résultats de recherche affichés
+SEARCH_LIMIT = 20
+# Nombre d'éléments par page de liste
+PAGE_SIZE = 50
+
+# Base de données du catalogue
+DB_PATH = "catalogue.db"
+# Durée de vie (s) des lectures mises en cache: les imports écrivent depuis un autre processus
+CACHE_TTL = 30
+
 # Initialiser la bibliothèque avec SQLite
 @st.cache_resource
 def get_bibliotheque():
     """Retourne une instance de Bibliotheque avec repositories SQLite"""
+    # Consultation seule: lectures concurrentes (WAL) pendant les imports,
+    # en lecture seule dès que la base a été créée par l'import
+    read_only = os.path.exists(DB_PATH)
+    if read_only:
+        # Mettre à jour le schéma d'une base existante avant de l'ouvrir en lecture seule
+        # (une base à jour ne coûte qu'une lecture de user_version)
+        with get_pool(DB_PATH, profile="read-heavy").connection() as conn:
+            migrate(conn)
+    pool = get_pool(DB_PATH, profile="read-heavy", read_only=read_only)
     return Bibliotheque(
-        OeuvreSQLiteRepository("catalogue.db"),
-        EditionSQLiteRepository("catalogue.db")
+        CachedRepository(OeuvreSQLiteRepository(DB_PATH, pool), ttl=CACHE_TTL),
+        CachedRepository(EditionSQLiteRepository(DB_PATH, pool), ttl=CACHE_TTL)
     )
 
 
 biblio = get_bibliotheque()
 
+
+def show_page(name, fetch_page, key_of):
+    """
+    Récupère la page courante d'une liste et affiche les boutons de navigation
+
+    Pagination par clé: seule la page affichée est chargée. La pile des clés
+    de début de page est gardée dans la session pour revenir en arrière.
+    """
+    page_keys = st.session_state.setdefault(f"{name}_page_keys", [None])
+    items = fetch_page(page_keys[-1], PAGE_SIZE + 1)
+    has_next = len(items) > PAGE_SIZE
+    items = items[:PAGE_SIZE]
+
+    col_previous, col_page, col_next = st.columns([1, 2, 1])
+    if col_previous.button("◀ Précédent", disabled=len(page_keys) == 1, key=f"{name}_previous"):
+        page_keys.pop()
+        st.rerun()
+    col_page.caption(f"Page {len(page_keys)}")
+    if col_next.button("Suivant ▶", disabled=not has_next, key=f"{name}_next"):
+        page_keys.append(key_of(items[-1]))
+        st.rerun()
+    return items
+
+
 # Titre principal
 st.title("📚 Catalogue de Livres")
 
@@ -58,14 +106,17 @@ if view_mode == "📖 Par Œuvres":
 
     # Récupérer les œuvres
     if search_query:
-        oeuvres = biblio.search_oeuvres(search_query)
-        st.caption(f"{len(oeuvres)} résultat(s) pour '{search_query}'")
+        oeuvres = [oeuvre for oeuvre, _ in biblio.search_oeuvres_ranked(search_query, SEARCH_LIMIT)]
+        st.caption(f"{len(oeuvres)} meilleur(s) résultat(s) pour '{search_query}'")
     else:
-        oeuvres = biblio.oeuvres
+        oeuvres = show_page("oeuvres", biblio.page_oeuvres, lambda oeuvre: oeuvre.work_id)
 
     if not oeuvres:
         st.info("Aucune œuvre dans le catalogue. Utilisez le scan de couverture pour ajouter des livres.")
     else:
+        # Récupérer les éditions de toutes les œuvres affichées en une seule requête
+        editions_by_work = biblio.get_editions_of_oeuvres(oeuvre.work_id for oeuvre in oeuvres)
+
         # Afficher chaque œuvre
         for oeuvre in oeuvres:
             with st.expander(f"📖 {oeuvre.title} — {oeuvre.author}"):
@@ -111,7 +162,7 @@ if view_mode == "📖 Par Œuvres":
                             st.markdown(f"- {theme}")
 
                 # Afficher les éditions de cette œuvre
-                editions = biblio.get_editions_of_oeuvre(oeuvre.work_id)
+                editions = editions_by_work.get(oeuvre.work_id, [])
                 if editions:
                     st.markdown(f"**📚 {len(editions)} édition(s) disponible(s):**")
 
@@ -131,18 +182,20 @@ else:  # Mode "Par Éditions"
 
     # Récupérer les éditions
     if search_query:
-        editions = biblio.search_editions(search_query)
-        st.caption(f"{len(editions)} résultat(s) pour '{search_query}'")
+        editions = [edition for edition, _ in biblio.search_editions_ranked(search_query, SEARCH_LIMIT)]
+        st.caption(f"{len(editions)} meilleur(s) résultat(s) pour '{search_query}'")
     else:
-        editions = biblio.editions
+        editions = show_page("editions", biblio.page_editions, lambda edition: edition.isbn)
 
     if not editions:
         st.info("Aucune édition dans le catalogue. Utilisez le scan de couverture pour ajouter des livres.")
     else:
+        # Récupérer les œuvres associées en une seule requête
+        oeuvres_by_isbn = biblio.get_oeuvres_for_editions(editions)
+
         # Afficher chaque édition
         for edition in editions:
-            # Récupérer l'œuvre associée
-            oeuvre = biblio.get_oeuvre_of_edition(edition.isbn)
+            oeuvre = oeuvres_by_isbn.get(edition.isbn)
             oeuvre_title = oeuvre.title if oeuvre else "Œuvre inconnue"
             oeuvre_author = oeuvre.author if oeuvre else ""
 
@@ -0,0 +1,94 @@
+"""
+Benchmark des requêtes analytiques sur les éditions
+
+Compare un parcours des objets Edition en Python à l'instantané en colonnes
+(EditionColumns, NumPy) pour trois requêtes: pages moyennes par format, valeur
+du catalogue par devise, éditions de 1950 à 1970 de plus de 500 pages.
+
+Usage:
+    python -m benchmarks.bench_edition_columns [--rows 1000000]
+"""
+import argparse
+import time
+from collections import defaultdict
+
+from const.book_format import BookFormat
+from models.edition import Edition
+from services.edition_columns import EditionColumns
+
+
+FORMATS = list(BookFormat)
+CURRENCIES = ["EUR", "USD", "GBP"]
+
+
+def make_edition(i: int) -> Edition:
+    """Crée une édition de test (pages absentes une fois sur dix)"""
+    edition = Edition(f"{i:013d}", f"WORK-{i // 3:06d}")
+    edition.format = FORMATS[i % len(FORMATS)]
+    edition.publication_year = 1900 + i % 120
+    edition.pages = None if i % 10 == 0 else 50 + i % 900
+    edition.price = 5.0 + i % 30
+    edition.currency = CURRENCIES[i % len(CURRENCIES)]
+    return edition
+
+
+def with_objects(editions: list) -> tuple:
+    """Les trois requêtes par parcours des objets"""
+    pages, counts = defaultdict(int), defaultdict(int)
+    totals = defaultdict(float)
+    selected = []
+    for edition in editions:
+        if edition.pages is not None:
+            pages[edition.format] += edition.pages
+            counts[edition.format] += 1
+        if edition.price is not None:
+            totals[edition.currency] += edition.price
+        if 1950 <= (edition.publication_year or 0) <= 1970 and (edition.pages or 0) > 500:
+            selected.append(edition.isbn)
+    means = {key: pages[key] / counts[key] for key in counts}
+    return means, dict(totals), selected
+
+
+def with_columns(columns: EditionColumns) -> tuple:
+    """Les trois requêtes sur l'instantané en colonnes"""
+    mask = columns.between("publication_year", 1950, 1970) & columns.between("pages", low=501)
+    return (
+        columns.group_by("format", "pages", "mean"),
+        columns.group_by("currency", "price", "sum"),
+        columns.isbns(mask),
+    )
+
+
+def best(function, argument, repeat: int) -> float:
+    """Meilleure durée (s) sur plusieurs passes"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main() -> None:
+    """Construit l'instantané puis affiche les durées des deux chemins et le gain"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rows", type=int, default=1_000_000, help="nombre d'éditions")
+    parser.add_argument("--repeat", type=int, default=3, help="nombre de passes par chemin")
+    args = parser.parse_args()
+
+    editions = [make_edition(i) for i in range(args.rows)]
+    start = time.perf_counter()
+    columns = EditionColumns()
+    columns.upsert(editions)
+    build = time.perf_counter() - start
+
+    reference = best(with_objects, editions, args.repeat)
+    fast = best(with_columns, columns, args.repeat)
+    print(f"{args.rows} éditions (instantané construit en {build:.2f} s)")
+    print(f"objets Edition  : {reference * 1000:10.1f} ms")
+    print(f"EditionColumns  : {fast * 1000:10.1f} ms")
+    print(f"gain            : x{reference / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
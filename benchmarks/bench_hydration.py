@@ -0,0 +1,127 @@
+"""
+Benchmark de l'hydratation des lignes SQLite en objets Edition
+
+Compare le chemin historique (sqlite3.Row lu par nom de colonne, puis un
+setter par champ qui renormalise éditeur et collection) au chemin actuel
+(tuples lus par position, Edition.from_row qui reprend les colonnes
+normalisées stockées) sur la même table.
+
+Usage:
+    python -m benchmarks.bench_hydration [--rows 1000000]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from const.book_format import BookFormat
+from models.edition import Edition
+from models.oeuvre import Oeuvre
+from services.database import (
+    EditionSQLiteRepository, OeuvreSQLiteRepository, _EDITION_SELECT, _tuples
+)
+
+
+PUBLISHERS = ["Gallimard", "Éditions du Seuil", "Flammarion", "Le Livre de Poche", "Actes Sud"]
+COLLECTIONS = [None, "Folio", "Points", "GF", "Babel"]
+FORMATS = list(BookFormat)
+
+
+def make_oeuvre(n: int) -> Oeuvre:
+    """Crée l'œuvre parente de trois éditions"""
+    oeuvre = Oeuvre(f"WORK-{n:06d}")
+    oeuvre.title = f"Titre {n}"
+    oeuvre.author = "Auteur"
+    return oeuvre
+
+
+def make_edition(i: int) -> Edition:
+    """Crée une édition de test (champs variés pour éviter les cas triviaux)"""
+    edition = Edition(f"{i:013d}", f"WORK-{i // 3:06d}")
+    edition.publisher = PUBLISHERS[i % len(PUBLISHERS)]
+    edition.publication_year = 1900 + i % 120
+    edition.format = FORMATS[i % len(FORMATS)]
+    edition.pages = 100 + i % 700
+    edition.price = 5.0 + i % 30
+    edition.currency = "EUR"
+    edition.collection = COLLECTIONS[i % len(COLLECTIONS)]
+    return edition
+
+
+def row_to_edition_legacy(row: sqlite3.Row) -> Edition:
+    """Conversion historique: lecture par nom, setters et BookFormat(valeur)"""
+    edition = Edition(row['isbn'], row['work_id'])
+    edition.publisher = row['publisher'] or ''
+    edition.publication_year = row['publication_year']
+    edition.language = row['language'] or 'fr'
+    if row['format']:
+        edition.format = BookFormat(row['format'])
+    edition.pages = row['pages']
+    edition.dimensions_height = row['dimensions_height']
+    edition.dimensions_width = row['dimensions_width']
+    edition.dimensions_thickness = row['dimensions_thickness']
+    edition.weight = row['weight']
+    edition.cover_front_url = row['cover_front_url']
+    edition.cover_back_url = row['cover_back_url']
+    edition.cover_spine_url = row['cover_spine_url']
+    edition.cover_color = row['cover_color']
+    edition.price = row['price']
+    edition.currency = row['currency']
+    edition.ean = row['ean']
+    edition.edition_number = row['edition_number']
+    edition.collection = row['collection']
+    edition.translator = row['translator']
+    edition.illustrator = row['illustrator']
+    edition.preface_by = row['preface_by']
+    return edition
+
+
+def legacy(conn: sqlite3.Connection) -> int:
+    """Hydrate toute la table par le chemin historique"""
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    return len([row_to_edition_legacy(row) for row in cursor.execute("SELECT * FROM editions")])
+
+
+def positional(conn: sqlite3.Connection) -> int:
+    """Hydrate toute la table par le chemin actuel"""
+    cursor = _tuples(conn, f"SELECT {_EDITION_SELECT} FROM editions")
+    return len(EditionSQLiteRepository._hydrate(cursor))
+
+
+def rate(function, conn: sqlite3.Connection, repeat: int) -> float:
+    """Retourne le meilleur débit (lignes/s) sur plusieurs passes"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = function(conn)
+        best = min(best, time.perf_counter() - start)
+    return rows / best
+
+
+def main() -> None:
+    """Remplit une base temporaire puis affiche les débits des deux chemins et le gain"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rows", type=int, default=1_000_000, help="nombre d'éditions")
+    parser.add_argument("--repeat", type=int, default=3, help="nombre de passes par chemin")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "bench.db")
+        OeuvreSQLiteRepository(db_path).add_many(make_oeuvre(n) for n in range((args.rows + 2) // 3))
+        repo = EditionSQLiteRepository(db_path)
+        repo.add_many(make_edition(i) for i in range(args.rows))
+
+        with repo.transaction() as conn:
+            reference = rate(legacy, conn, args.repeat)
+            fast = rate(positional, conn, args.repeat)
+
+    print(f"{args.rows} éditions")
+    print(f"sqlite3.Row + setters    : {reference:12,.0f} lignes/s")
+    print(f"tuples + Edition.from_row: {fast:12,.0f} lignes/s")
+    print(f"gain                     : x{fast / reference:.1f}")
+
+
+if __name__ == "__main__":
+    main()
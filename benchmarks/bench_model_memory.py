@@ -0,0 +1,112 @@
+"""
+Benchmark de l'empreinte mémoire des modèles Oeuvre et Edition
+
+Compare les modèles actuels (__slots__, champs multivalués vides partagés tant
+qu'ils ne sont pas lus, horodatages fixés à l'enregistrement) à une reproduction de l'ancienne
+disposition (attributs dans un __dict__, quatre listes vides par œuvre, deux
+datetime.now() par édition), en octets alloués par entité (tracemalloc).
+
+Usage:
+    python -m benchmarks.bench_model_memory [--count 100000]
+"""
+import argparse
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List
+
+from models.edition import Edition
+from models.oeuvre import Oeuvre
+from unicorn.u_string import U_String
+
+
+class LegacyOeuvre:
+    """Ancienne disposition d'une œuvre: attributs dans un __dict__, listes vides allouées"""
+
+    def __init__(self, work_id: str) -> None:
+        self.work_id = work_id
+        self._title = ""
+        self._title_normalized = U_String("").normalize()
+        self._author = ""
+        self._author_normalized = U_String("").normalize()
+        self.co_authors: List[str] = []
+        self.original_language = "fr"
+        self._original_publication_year = None
+        self._summary = None
+        self.genres: list = []
+        self.themes: List[str] = []
+        self.awards: List[str] = []
+        self._series = None
+        self._series_normalized = None
+        self.series_number = None
+
+
+class LegacyEdition:
+    """Ancienne disposition d'une édition: attributs dans un __dict__, deux horodatages"""
+
+    def __init__(self, isbn: str, work_id: str) -> None:
+        self.isbn = isbn
+        self.work_id = work_id
+        self._publisher = ""
+        self._publisher_normalized = U_String("").normalize()
+        self._publication_year = None
+        self.publication_date = None
+        self.language = "fr"
+        self.format = None
+        self.pages = None
+        self.dimensions_height = None
+        self.dimensions_width = None
+        self.dimensions_thickness = None
+        self.weight = None
+        self._cover_front_url = None
+        self._cover_back_url = None
+        self._cover_spine_url = None
+        self.cover_color = None
+        self.price = None
+        self.currency = "EUR"
+        self.ean = None
+        self.edition_number = None
+        self._collection = None
+        self._collection_normalized = None
+        self.translator = None
+        self.illustrator = None
+        self.preface_by = None
+        self.condition = "Neuf"
+        self.notes = None
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+
+
+def bytes_per_entity(factory: Callable[[int], object], count: int) -> float:
+    """Octets alloués par entité pour count entités gardées en vie (liste et identifiants exclus)"""
+    keys = [f"{i:013d}" for i in range(count)]
+    entities: List[object] = [None] * count
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for i, key in enumerate(keys):
+            entities[i] = factory(key)
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return allocated / count
+
+
+def main() -> None:
+    """Affiche les octets par entité des deux dispositions et le gain"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--count", type=int, default=100_000, help="nombre d'entités par mesure")
+    args = parser.parse_args()
+
+    cases = [
+        ("Oeuvre", lambda key: LegacyOeuvre(key), lambda key: Oeuvre(key)),
+        ("Edition", lambda key: LegacyEdition(key, "W1"), lambda key: Edition(key, "W1")),
+    ]
+    print(f"{args.count} entités par mesure (octets par entité)")
+    for name, legacy, current in cases:
+        before = bytes_per_entity(legacy, args.count)
+        after = bytes_per_entity(current, args.count)
+        print(f"{name:8}: __dict__ {before:8.0f} | __slots__ {after:8.0f} | gain {1 - after / before:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Champs différés - champs volumineux chargés à la première lecture
+
+Un repository peut reconstruire une entité sans ses champs volumineux (résumé,
+URLs de couverture): ils valent alors NOT_LOADED et l'entité reçoit un
+chargeur (_deferred_loader) qui les lit à la première lecture de l'un d'eux.
+"""
+from typing import Any, Optional, Tuple
+
+
+class _NotLoaded:
+    """Type de la valeur sentinelle NOT_LOADED"""
+
+    def __repr__(self) -> str:
+        return "NOT_LOADED"
+
+
+# Valeur d'un champ différé pas encore chargé (None est une valeur valide)
+NOT_LOADED = _NotLoaded()
+
+
+class DeferredField:
+    """
+    Descripteur d'un champ qui peut être chargé à la première lecture
+
+    La valeur est rangée dans l'attribut privé du même nom (summary -> _summary).
+    Si elle vaut NOT_LOADED, la lecture appelle load(entité) sur le chargeur de
+    l'entité, qui remplit les champs différés avant que la valeur soit relue.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.attribute = f"_{name}"
+
+    def __get__(self, instance: Optional[Any], owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        value = getattr(instance, self.attribute)
+        if value is NOT_LOADED:
+            instance._deferred_loader.load(instance)
+            value = getattr(instance, self.attribute)
+        return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        setattr(instance, self.attribute, value)
+
+
+def deferred_fields(cls: type) -> Tuple[str, ...]:
+    """
+    Liste les champs différables d'une classe de modèle
+
+    Args:
+        cls: La classe (Oeuvre, Edition)
+
+    Returns:
+        Noms des champs déclarés par DeferredField, dans l'ordre de déclaration
+    """
+    return tuple(
+        name
+        for klass in reversed(cls.__mro__)
+        for name, value in vars(klass).items()
+        if isinstance(value, DeferredField)
+    )
@@ -5,6 +5,8 @@ Une édition est identifiée par son ISBN unique
 from typing import Optional
 from datetime import datetime
 from const.book_format import BookFormat
+from models.deferred import DeferredField
+from unicorn.u_string import U_String
 
 
 class Edition:
@@ -48,8 +50,36 @@ class Edition:
         # Qualité et état
         condition: État du livre (Neuf, Bon, Acceptable, etc.)
         notes: Notes personnelles
+
+    Les formes normalisées (sans accents, en minuscules) de l'éditeur et de la
+    collection sont calculées à l'écriture et exposées en lecture seule
+    (publisher_normalized, collection_normalized).
+
+    Les URLs de couverture peuvent être différées par le repository (voir
+    models.deferred): elles sont alors chargées à la première lecture de l'une d'elles.
+
+    Les attributs sont dans des __slots__ (pas de __dict__ par instance).
+    created_at est horodaté au premier enregistrement par un repository (ou au
+    chargement), et updated_at vaut created_at tant que l'édition n'a pas été
+    modifiée (update_timestamp). Une édition construite mais pas encore
+    enregistrée a donc created_at et updated_at à None (ils n'étaient autrefois
+    jamais None: created_at était fixé dès la construction).
     """
 
+    __slots__ = (
+        "isbn", "work_id", "_publisher", "_publisher_normalized", "_publication_year",
+        "publication_date", "language", "format", "pages", "dimensions_height",
+        "dimensions_width", "dimensions_thickness", "weight", "_cover_front_url",
+        "_cover_back_url", "_cover_spine_url", "cover_color", "price", "currency", "ean",
+        "edition_number", "_collection", "_collection_normalized", "translator",
+        "illustrator", "preface_by", "condition", "notes", "_created_at", "_updated_at",
+        "_deferred_loader",
+    )
+
+    cover_front_url = DeferredField()
+    cover_back_url = DeferredField()
+    cover_spine_url = DeferredField()
+
     def __init__(self, isbn: str, work_id: Optional[str] = None) -> None:
         """
         Initialise une nouvelle édition
@@ -98,9 +128,111 @@ class Edition:
         self.condition: str = "Neuf"
         self.notes: Optional[str] = None
 
-        # Métadonnées de gestion
-        self.created_at: datetime = datetime.now()
-        self.updated_at: datetime = datetime.now()
+        # Métadonnées de gestion (None jusqu'au premier enregistrement: voir mark_created)
+        self._created_at: Optional[datetime] = None
+        self._updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_row(
+        cls,
+        isbn: str,
+        work_id: Optional[str],
+        publisher: Optional[str],
+        publication_year: Optional[int],
+        language: Optional[str],
+        format: Optional[BookFormat],
+        pages: Optional[int],
+        dimensions_height: Optional[float],
+        dimensions_width: Optional[float],
+        dimensions_thickness: Optional[float],
+        weight: Optional[int],
+        cover_front_url: Optional[str],
+        cover_back_url: Optional[str],
+        cover_spine_url: Optional[str],
+        cover_color: Optional[str],
+        price: Optional[float],
+        currency: Optional[str],
+        ean: Optional[str],
+        edition_number: Optional[int],
+        collection: Optional[str],
+        translator: Optional[str],
+        illustrator: Optional[str],
+        preface_by: Optional[str],
+        publisher_normalized: Optional[str],
+        collection_normalized: Optional[str],
+        loaded_at: Optional[datetime] = None
+    ) -> "Edition":
+        """
+        Reconstruit une édition enregistrée, sans repasser par __init__ ni les setters
+
+        Les valeurs ont été validées et normalisées à l'écriture: les formes
+        normalisées stockées sont reprises telles quelles (recalculées si absentes).
+
+        Args:
+            Les colonnes de la table editions, dans l'ordre de l'INSERT (format déjà converti)
+            loaded_at: Horodatage commun de chargement (created_at et updated_at),
+                partagé par les éditions d'un même paquet; None: édition non horodatée
+
+        Returns:
+            L'édition reconstruite
+        """
+        publisher = publisher or ""
+        edition = cls.__new__(cls)
+        edition.isbn = isbn
+        edition.work_id = work_id
+        edition._publisher = publisher
+        edition._publisher_normalized = (
+            publisher_normalized if publisher_normalized is not None else U_String(publisher).normalize()
+        )
+        edition._publication_year = publication_year
+        edition.publication_date = None
+        edition.language = language or "fr"
+        edition.format = format
+        edition.pages = pages
+        edition.dimensions_height = dimensions_height
+        edition.dimensions_width = dimensions_width
+        edition.dimensions_thickness = dimensions_thickness
+        edition.weight = weight
+        edition._cover_front_url = cover_front_url
+        edition._cover_back_url = cover_back_url
+        edition._cover_spine_url = cover_spine_url
+        edition.cover_color = cover_color
+        edition.price = price
+        edition.currency = currency
+        edition.ean = ean
+        edition.edition_number = edition_number
+        edition._collection = collection
+        edition._collection_normalized = (
+            (collection_normalized or U_String(collection).normalize()) if collection else None
+        )
+        edition.translator = translator
+        edition.illustrator = illustrator
+        edition.preface_by = preface_by
+        edition.condition = "Neuf"
+        edition.notes = None
+        edition._created_at = loaded_at
+        edition._updated_at = None
+        return edition
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        """Date de création (None tant que l'édition n'a pas été enregistrée)"""
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, created_at: Optional[datetime]) -> None:
+        """Setter pour la date de création"""
+        self._created_at = created_at
+
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        """Date de dernière modification (created_at tant que l'édition n'a pas été modifiée)"""
+        return self._updated_at if self._updated_at is not None else self.created_at
+
+    @updated_at.setter
+    def updated_at(self, updated_at: datetime) -> None:
+        """Setter pour la date de dernière modification"""
+        self._updated_at = updated_at
 
     @property
     def publication_year(self) -> Optional[int]:
@@ -114,6 +246,38 @@ class Edition:
             raise ValueError("L'année de publication doit être entre 1000 et 3000")
         self._publication_year = year
 
+    @property
+    def publisher(self) -> str:
+        """Getter pour l'éditeur"""
+        return self._publisher
+
+    @publisher.setter
+    def publisher(self, publisher: str) -> None:
+        """Setter pour l'éditeur, met à jour sa forme normalisée"""
+        self._publisher = publisher
+        self._publisher_normalized = U_String(publisher or "").normalize()
+
+    @property
+    def publisher_normalized(self) -> str:
+        """Éditeur sans accents et en minuscules"""
+        return self._publisher_normalized
+
+    @property
+    def collection(self) -> Optional[str]:
+        """Getter pour la collection"""
+        return self._collection
+
+    @collection.setter
+    def collection(self, collection: Optional[str]) -> None:
+        """Setter pour la collection, met à jour sa forme normalisée"""
+        self._collection = collection
+        self._collection_normalized = U_String(collection).normalize() if collection else None
+
+    @property
+    def collection_normalized(self) -> Optional[str]:
+        """Collection sans accents et en minuscules (None si pas de collection)"""
+        return self._collection_normalized
+
     @property
     def dimensions_str(self) -> str:
         """Retourne les dimensions formatées"""
@@ -180,6 +344,11 @@ class Edition:
         if spine:
             self.cover_spine_url = spine
 
+    def mark_created(self, created_at: datetime) -> None:
+        """Horodate la création au premier enregistrement (sans effet si elle l'est déjà)"""
+        if self._created_at is None:
+            self._created_at = created_at
+
     def update_timestamp(self) -> None:
         """Met à jour le timestamp de dernière modification"""
         self.updated_at = datetime.now()
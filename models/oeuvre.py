@@ -1,8 +1,39 @@
 """
 Modèle Oeuvre - Représente une œuvre littéraire (indépendante de ses éditions)
 """
-from typing import Optional, List
+from typing import Any, Optional, List, Sequence, Tuple
 from const.genre import Genre
+from models.deferred import DeferredField
+from unicorn.u_string import U_String
+
+
+# Valeur stockée des champs multivalués vides tant qu'ils ne sont pas lus: aucune liste allouée par œuvre
+_NO_VALUES: Tuple[()] = ()
+
+
+class _ValuesField:
+    """
+    Descripteur d'un champ multivalué (co-auteurs, genres, thèmes, prix)
+
+    Un champ vide stocke le tuple vide partagé _NO_VALUES; une liste propre à
+    l'œuvre n'est allouée qu'à sa première lecture ou au premier ajout. La valeur
+    lue est toujours une liste modifiable en place, et l'affectation en copie une.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.attribute = f"_{name}"
+
+    def __get__(self, instance: Optional[Any], owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        values = getattr(instance, self.attribute)
+        if values is _NO_VALUES:
+            values = []
+            setattr(instance, self.attribute, values)
+        return values
+
+    def __set__(self, instance: Any, values: Sequence) -> None:
+        setattr(instance, self.attribute, list(values) if values else _NO_VALUES)
 
 
 class Oeuvre:
@@ -23,8 +54,32 @@ class Oeuvre:
         awards: Prix littéraires reçus
         series: Nom de la série (si applicable)
         series_number: Numéro dans la série
+
+    Les formes normalisées (sans accents, en minuscules) du titre, de l'auteur et
+    de la série sont calculées à l'écriture et exposées en lecture seule
+    (title_normalized, author_normalized, series_normalized).
+
+    Le résumé peut être différé par le repository (voir models.deferred): il est
+    alors chargé à sa première lecture.
+
+    Les attributs sont dans des __slots__ (pas de __dict__ par instance). Les
+    champs multivalués vides ne reçoivent leur liste qu'à la première lecture;
+    values_of les lit sans l'allouer (parcours des repositories).
     """
 
+    __slots__ = (
+        "work_id", "_title", "_title_normalized", "_author", "_author_normalized",
+        "_co_authors", "original_language", "_original_publication_year", "_summary",
+        "_genres", "_themes", "_awards", "_series", "_series_normalized", "series_number",
+        "_deferred_loader",
+    )
+
+    summary = DeferredField()
+    co_authors = _ValuesField()
+    genres = _ValuesField()
+    themes = _ValuesField()
+    awards = _ValuesField()
+
     def __init__(self, work_id: str) -> None:
         """
         Initialise une nouvelle œuvre
@@ -35,24 +90,122 @@ class Oeuvre:
         self.work_id: str = work_id
         self.title: str = ""
         self.author: str = ""
-        self.co_authors: List[str] = []
+        self._co_authors: Sequence[str] = _NO_VALUES
 
         # Informations de publication originale
         self.original_language: str = "fr"  # Par défaut français
         self._original_publication_year: Optional[int] = None
 
         # Description
-        self.summary: Optional[str] = None
-        self.genres: List[Genre] = []
-        self.themes: List[str] = []
+        self._summary: Optional[str] = None
+        self._genres: Sequence[Genre] = _NO_VALUES
+        self._themes: Sequence[str] = _NO_VALUES
 
         # Distinctions
-        self.awards: List[str] = []
+        self._awards: Sequence[str] = _NO_VALUES
 
         # Série
         self.series: Optional[str] = None
         self.series_number: Optional[int] = None
 
+    @classmethod
+    def from_row(
+        cls,
+        work_id: str,
+        title: str,
+        author: str,
+        original_language: Optional[str],
+        original_publication_year: Optional[int],
+        summary: Optional[str],
+        series: Optional[str],
+        series_number: Optional[int],
+        title_normalized: Optional[str],
+        author_normalized: Optional[str],
+        series_normalized: Optional[str]
+    ) -> "Oeuvre":
+        """
+        Reconstruit une œuvre enregistrée, sans repasser par __init__ ni les setters
+
+        Les valeurs ont été validées et normalisées à l'écriture: les formes
+        normalisées stockées sont reprises telles quelles (recalculées si absentes).
+        Les champs multivalués sont vides (tuple partagé), à affecter par l'appelant.
+
+        Args:
+            Les colonnes de la table oeuvres, dans l'ordre de l'INSERT
+
+        Returns:
+            L'œuvre reconstruite
+        """
+        oeuvre = cls.__new__(cls)
+        oeuvre.work_id = work_id
+        oeuvre._title = title
+        oeuvre._title_normalized = (
+            title_normalized if title_normalized is not None else U_String(title or "").normalize()
+        )
+        oeuvre._author = author
+        oeuvre._author_normalized = (
+            author_normalized if author_normalized is not None else U_String(author or "").normalize()
+        )
+        oeuvre._co_authors = _NO_VALUES
+        oeuvre.original_language = original_language or "fr"
+        oeuvre._original_publication_year = original_publication_year
+        oeuvre._summary = summary
+        oeuvre._genres = _NO_VALUES
+        oeuvre._themes = _NO_VALUES
+        oeuvre._awards = _NO_VALUES
+        oeuvre._series = series
+        oeuvre._series_normalized = (series_normalized or U_String(series).normalize()) if series else None
+        oeuvre.series_number = series_number
+        return oeuvre
+
+    @property
+    def title(self) -> str:
+        """Getter pour le titre"""
+        return self._title
+
+    @title.setter
+    def title(self, title: str) -> None:
+        """Setter pour le titre, met à jour sa forme normalisée"""
+        self._title = title
+        self._title_normalized = U_String(title or "").normalize()
+
+    @property
+    def title_normalized(self) -> str:
+        """Titre sans accents et en minuscules"""
+        return self._title_normalized
+
+    @property
+    def author(self) -> str:
+        """Getter pour l'auteur"""
+        return self._author
+
+    @author.setter
+    def author(self, author: str) -> None:
+        """Setter pour l'auteur, met à jour sa forme normalisée"""
+        self._author = author
+        self._author_normalized = U_String(author or "").normalize()
+
+    @property
+    def author_normalized(self) -> str:
+        """Auteur sans accents et en minuscules"""
+        return self._author_normalized
+
+    @property
+    def series(self) -> Optional[str]:
+        """Getter pour la série"""
+        return self._series
+
+    @series.setter
+    def series(self, series: Optional[str]) -> None:
+        """Setter pour la série, met à jour sa forme normalisée"""
+        self._series = series
+        self._series_normalized = U_String(series).normalize() if series else None
+
+    @property
+    def series_normalized(self) -> Optional[str]:
+        """Série sans accents et en minuscules (None si pas de série)"""
+        return self._series_normalized
+
     @property
     def original_publication_year(self) -> Optional[int]:
         """Getter pour l'année de publication originale"""
@@ -78,34 +231,46 @@ class Oeuvre:
     def authors_list(self) -> List[str]:
         """Retourne la liste complète des auteurs"""
         authors = [self.author] if self.author else []
-        authors.extend(self.co_authors)
+        authors.extend(self._co_authors)
         return authors
 
     def add_genre(self, genre: Genre) -> None:
         """Ajoute un genre littéraire"""
-        if genre not in self.genres:
+        if genre not in self._genres:
             self.genres.append(genre)
 
     def remove_genre(self, genre: Genre) -> None:
         """Retire un genre littéraire"""
-        if genre in self.genres:
-            self.genres.remove(genre)
+        if genre in self._genres:
+            self._genres.remove(genre)
 
     def add_theme(self, theme: str) -> None:
         """Ajoute un thème"""
-        if theme and theme not in self.themes:
+        if theme and theme not in self._themes:
             self.themes.append(theme)
 
     def add_award(self, award: str) -> None:
         """Ajoute un prix littéraire"""
-        if award and award not in self.awards:
+        if award and award not in self._awards:
             self.awards.append(award)
 
     def add_co_author(self, author: str) -> None:
         """Ajoute un co-auteur"""
-        if author and author not in self.co_authors:
+        if author and author not in self._co_authors:
             self.co_authors.append(author)
 
+    def values_of(self, field: str) -> Sequence:
+        """
+        Lit un champ multivalué sans allouer de liste s'il est vide
+
+        Args:
+            field: Nom du champ (co_authors, genres, themes ou awards)
+
+        Returns:
+            Les valeurs du champ, en lecture seule (tuple vide partagé si le champ est vide)
+        """
+        return getattr(self, f"_{field}")
+
     def __repr__(self) -> str:
         """Représentation textuelle de l'œuvre"""
         authors = ", ".join(self.authors_list)
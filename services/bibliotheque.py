@@ -3,11 +3,13 @@ Service Bibliothèque gérant les Oeuvres et Editions
 Architecture à 2 niveaux avec pattern Repository
 """
 
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from models.oeuvre import Oeuvre
 from models.edition import Edition
-from services.repository import IRepository
+from const.book_format import BookFormat
+from services.repository import IRepository, iter_pages
 from services.oeuvre_repository import OeuvreMemoryRepository
 from services.edition_repository import EditionMemoryRepository
 
@@ -47,6 +49,89 @@ class Bibliotheque:
         """Retourne la liste de toutes les éditions"""
         return self._edition_repo.get_all()
 
+    ####################################################
+    # Parcours et pagination
+    ####################################################
+
+    def iter_oeuvres(self, batch_size: int = 500, defer: Iterable[str] = ()) -> Iterator[Oeuvre]:
+        """
+        Parcourt toutes les œuvres par paquets, sans les charger toutes en mémoire
+
+        Args:
+            batch_size: Nombre d'œuvres chargées à la fois
+            defer: Champs volumineux à ne charger qu'à leur première lecture (voir models.deferred)
+
+        Returns:
+            Itérateur sur les œuvres, triées par work_id
+        """
+        return self._oeuvre_repo.iter_all(batch_size, defer=defer)
+
+    def iter_editions(self, batch_size: int = 500, defer: Iterable[str] = ()) -> Iterator[Edition]:
+        """
+        Parcourt toutes les éditions par paquets, sans les charger toutes en mémoire
+
+        Args:
+            batch_size: Nombre d'éditions chargées à la fois
+            defer: Champs volumineux à ne charger qu'à leur première lecture (voir models.deferred)
+
+        Returns:
+            Itérateur sur les éditions, triées par ISBN
+        """
+        return self._edition_repo.iter_all(batch_size, defer=defer)
+
+    def page_oeuvres(
+        self, after_key: Optional[str] = None, limit: int = 50, defer: Iterable[str] = ()
+    ) -> List[Oeuvre]:
+        """
+        Récupère une page d'œuvres (pagination par clé)
+
+        Args:
+            after_key: work_id de la dernière œuvre de la page précédente (None: première page)
+            limit: Nombre maximal d'œuvres
+            defer: Champs volumineux à ne charger qu'à leur première lecture (voir models.deferred)
+
+        Returns:
+            Liste des œuvres de la page
+        """
+        return self._oeuvre_repo.page(after_key, limit, defer)
+
+    def page_editions(
+        self, after_key: Optional[str] = None, limit: int = 50, defer: Iterable[str] = ()
+    ) -> List[Edition]:
+        """
+        Récupère une page d'éditions (pagination par clé)
+
+        Args:
+            after_key: ISBN de la dernière édition de la page précédente (None: première page)
+            limit: Nombre maximal d'éditions
+            defer: Champs volumineux à ne charger qu'à leur première lecture (voir models.deferred)
+
+        Returns:
+            Liste des éditions de la page
+        """
+        return self._edition_repo.page(after_key, limit, defer)
+
+    ####################################################
+    # Transactions
+    ####################################################
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Unité de travail couvrant les deux repositories
+
+        Les opérations du bloc sont validées ensemble, ou annulées ensemble si
+        une exception en sort. Avec deux repositories SQLite sur la même base,
+        elles partagent une seule connexion et un seul commit.
+
+        Exemple:
+            with biblio.transaction():
+                biblio.add_oeuvre(oeuvre)
+                biblio.add_edition(edition)
+        """
+        with self._oeuvre_repo.transaction(), self._edition_repo.transaction():
+            yield
+
     ####################################################
     # CRUD Oeuvres
     ####################################################
@@ -106,14 +191,15 @@ class Bibliotheque:
         Note:
             Supprime aussi toutes les éditions associées
         """
-        if not self._oeuvre_repo.delete(work_id):
-            raise ValueError(f"Aucune œuvre avec le work_id {work_id}")
+        with self.transaction():
+            # Éditions relevées avant la suppression de l'œuvre (avec SQLite, la
+            # cascade les effacerait sans passer par le repository des éditions)
+            isbns = [edition.isbn for edition in self.get_editions_of_oeuvre(work_id)]
+            if not self._oeuvre_repo.delete(work_id):
+                raise ValueError(f"Aucune œuvre avec le work_id {work_id}")
 
-        # Supprimer toutes les éditions de cette œuvre
-        editions = self._edition_repo.get_all()
-        for edition in editions:
-            if edition.work_id == work_id:
-                self._edition_repo.delete(edition.isbn)
+            # Supprimer toutes les éditions de cette œuvre
+            self._edition_repo.delete_many(isbns)
 
     def search_oeuvres(self, query: str) -> List[Oeuvre]:
         """
@@ -127,6 +213,19 @@ class Bibliotheque:
         """
         return self._oeuvre_repo.search(query)
 
+    def search_oeuvres_ranked(self, query: str, limit: int = 20) -> List[Tuple[Oeuvre, float]]:
+        """
+        Recherche les œuvres les plus pertinentes
+
+        Args:
+            query: La requête de recherche
+            limit: Nombre maximal de résultats
+
+        Returns:
+            Liste de couples (œuvre, score), du plus au moins pertinent
+        """
+        return self._oeuvre_repo.search_ranked(query, limit)
+
     ####################################################
     # CRUD Editions
     ####################################################
@@ -145,12 +244,13 @@ class Bibliotheque:
         if not isinstance(edition, Edition):
             raise TypeError("Seuls les objets de type Edition peuvent être ajoutés")
 
-        # Vérifier que l'œuvre existe
-        if edition.work_id and not self._oeuvre_repo.get_by_id(edition.work_id):
-            raise ValueError(f"Aucune œuvre avec le work_id {edition.work_id}")
+        with self.transaction():
+            # Vérifier que l'œuvre existe
+            if edition.work_id and not self._oeuvre_repo.get_by_id(edition.work_id):
+                raise ValueError(f"Aucune œuvre avec le work_id {edition.work_id}")
 
-        if not self._edition_repo.add(edition):
-            raise ValueError(f"Une édition avec l'ISBN {edition.isbn} existe déjà")
+            if not self._edition_repo.add(edition):
+                raise ValueError(f"Une édition avec l'ISBN {edition.isbn} existe déjà")
 
     def get_edition(self, isbn: str) -> Optional[Edition]:
         """
@@ -202,6 +302,19 @@ class Bibliotheque:
         """
         return self._edition_repo.search(query)
 
+    def search_editions_ranked(self, query: str, limit: int = 20) -> List[Tuple[Edition, float]]:
+        """
+        Recherche les éditions les plus pertinentes
+
+        Args:
+            query: La requête de recherche
+            limit: Nombre maximal de résultats
+
+        Returns:
+            Liste de couples (édition, score), du plus au moins pertinent
+        """
+        return self._edition_repo.search_ranked(query, limit)
+
     ####################################################
     # Relations Oeuvre ↔ Editions
     ####################################################
@@ -216,8 +329,51 @@ class Bibliotheque:
         Returns:
             Liste des éditions de cette œuvre
         """
-        editions = self._edition_repo.get_all()
-        return [e for e in editions if e.work_id == work_id]
+        return self._edition_repo.get_by_work_id(work_id)
+
+    def get_editions_of_oeuvres(self, work_ids: Iterable[str]) -> Dict[str, List[Edition]]:
+        """
+        Récupère les éditions de plusieurs œuvres en une seule requête
+
+        Args:
+            work_ids: Les identifiants des œuvres
+
+        Returns:
+            Dictionnaire {work_id: éditions}, sans les œuvres sans édition
+        """
+        return self._edition_repo.get_by_work_ids(work_ids)
+
+    def page_oeuvres_with_editions(
+        self, after_key: Optional[str] = None, limit: int = 50
+    ) -> List[Tuple[Oeuvre, List[Edition]]]:
+        """
+        Récupère une page d'œuvres avec leurs éditions
+
+        Coûte une requête pour les œuvres et une pour toutes leurs éditions,
+        quel que soit le nombre d'œuvres de la page.
+
+        Args:
+            after_key: work_id de la dernière œuvre de la page précédente (None: première page)
+            limit: Nombre maximal d'œuvres
+
+        Returns:
+            Liste de couples (œuvre, éditions), triés par work_id
+        """
+        oeuvres = self._oeuvre_repo.page(after_key, limit)
+        editions = self.get_editions_of_oeuvres(oeuvre.work_id for oeuvre in oeuvres)
+        return [(oeuvre, editions.get(oeuvre.work_id, [])) for oeuvre in oeuvres]
+
+    def iter_oeuvres_with_editions(self, batch_size: int = 500) -> Iterator[Tuple[Oeuvre, List[Edition]]]:
+        """
+        Parcourt toutes les œuvres avec leurs éditions, par paquets
+
+        Args:
+            batch_size: Nombre d'œuvres chargées à la fois
+
+        Returns:
+            Itérateur sur les couples (œuvre, éditions), triés par work_id
+        """
+        return iter_pages(self.page_oeuvres_with_editions, lambda pair: pair[0].work_id, batch_size)
 
     def get_oeuvre_of_edition(self, isbn: str) -> Optional[Oeuvre]:
         """
@@ -235,6 +391,28 @@ class Bibliotheque:
 
         return self._oeuvre_repo.get_by_id(edition.work_id)
 
+    def get_oeuvres_for_editions(self, editions: Iterable[Edition]) -> Dict[str, Oeuvre]:
+        """
+        Récupère les œuvres d'une liste d'éditions en une seule requête
+
+        À préférer à get_oeuvre_of_edition dans une boucle, qui coûte
+        deux requêtes par édition. Le résumé des œuvres est différé: il n'est
+        lu que si on y accède.
+
+        Args:
+            editions: Les éditions déjà chargées
+
+        Returns:
+            Dictionnaire {isbn: œuvre}, sans les éditions dont l'œuvre est introuvable
+        """
+        editions = [edition for edition in editions if edition.work_id]
+        oeuvres = self._oeuvre_repo.get_many((edition.work_id for edition in editions), defer=("summary",))
+        return {
+            edition.isbn: oeuvres[edition.work_id]
+            for edition in editions
+            if edition.work_id in oeuvres
+        }
+
     ####################################################
     # Statistiques
     ####################################################
@@ -246,22 +424,21 @@ class Bibliotheque:
         Returns:
             Dictionnaire avec les statistiques
         """
-        oeuvres = self._oeuvre_repo.get_all()
-        editions = self._edition_repo.get_all()
-
-        # Compter les éditions numériques et physiques
-        digital_count = sum(1 for e in editions if e.is_digital)
-        physical_count = sum(1 for e in editions if e.is_physical)
-
-        # Compter les œuvres avec/sans éditions
-        oeuvres_with_editions = set(e.work_id for e in editions if e.work_id)
-        oeuvres_without_editions = len([o for o in oeuvres if o.work_id not in oeuvres_with_editions])
+        # Agrégats calculés par les repositories: aucune entité n'est chargée
+        by_format = self._edition_repo.count_by_format()
+        total_oeuvres = self._oeuvre_repo.count()
+        # Œuvres sans édition comptées parmi les œuvres du repository d'œuvres, qui
+        # peut ne pas partager la base des éditions: une édition orpheline (work_id
+        # sans œuvre) ne rend pas le décompte négatif
+        without_editions = self._edition_repo.count_works_without_editions(
+            oeuvre.work_id for oeuvre in self._oeuvre_repo.iter_all(defer=("summary",))
+        )
 
         return {
-            "total_oeuvres": len(oeuvres),
-            "total_editions": len(editions),
-            "editions_numeriques": digital_count,
-            "editions_physiques": physical_count,
-            "oeuvres_avec_editions": len(oeuvres_with_editions),
-            "oeuvres_sans_editions": oeuvres_without_editions,
+            "total_oeuvres": total_oeuvres,
+            "total_editions": sum(by_format.values()),
+            "editions_numeriques": sum(n for f, n in by_format.items() if f and BookFormat.is_digital(f)),
+            "editions_physiques": sum(n for f, n in by_format.items() if f and BookFormat.is_physical(f)),
+            "oeuvres_avec_editions": total_oeuvres - without_editions,
+            "oeuvres_sans_editions": without_editions,
         }
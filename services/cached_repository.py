@@ -0,0 +1,363 @@
+"""
+Cache de lecture (LRU) devant un repository quelconque
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from models.edition import Edition
+from services.repository import IRepository
+
+T = TypeVar('T')
+
+# Valeur absente du cache (None est une valeur de cache valide pour les recherches vides)
+_MISSING = object()
+
+
+def _entity_key(entity: Any) -> str:
+    """Identifiant d'une entité: ISBN pour une édition, work_id pour une œuvre"""
+    return entity.isbn if isinstance(entity, Edition) else entity.work_id
+
+
+class _LRU(Generic[T]):
+    """Dictionnaire borné, du moins au plus récemment utilisé, avec durée de vie optionnelle"""
+
+    def __init__(self, max_entries: int, ttl: Optional[float]) -> None:
+        self._entries: "OrderedDict[Hashable, Tuple[T, Optional[float]]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """Retourne la valeur (et la marque récente), ou _MISSING si absente ou expirée"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: T) -> int:
+        """Range une valeur, retourne le nombre d'entrées évincées pour rester sous la borne"""
+        expires_at = None if self._ttl is None else time.monotonic() + self._ttl
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        evicted = 0
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def pop(self, key: Hashable) -> None:
+        """Retire une entrée si elle existe"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Vide le cache"""
+        self._entries.clear()
+
+
+class CachedRepository(IRepository[T]):
+    """
+    Décorateur de repository: cache LRU des lectures par identifiant et des recherches
+
+    get_by_id, get_many et les résultats de search / search_ranked sont servis
+    depuis le cache tant qu'ils n'ont pas expiré (ttl) ni été évincés
+    (max_entries). Les écritures passées par ce repository invalident les
+    entités concernées et toutes les recherches mémorisées. Les autres méthodes
+    du repository enveloppé (get_by_work_id, count_by_format...) lui sont
+    déléguées telles quelles, sans cache.
+
+    Une écriture faite par un autre chemin (autre processus, autre instance)
+    n'est vue qu'à l'expiration de l'entrée: choisir ttl en conséquence.
+
+    Comme avec les repositories en mémoire, les entités rendues sont partagées:
+    une entité modifiée doit être repassée à update().
+
+    Exemple:
+        biblio = Bibliotheque(
+            CachedRepository(OeuvreSQLiteRepository(db_path), max_entries=2048, ttl=60),
+            CachedRepository(EditionSQLiteRepository(db_path), max_entries=4096, ttl=60)
+        )
+    """
+
+    def __init__(
+        self,
+        inner: IRepository[T],
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        max_searches: int = 64,
+        key: Callable[[T], str] = _entity_key
+    ) -> None:
+        """
+        Initialise un cache vide devant le repository
+
+        Args:
+            inner: Le repository enveloppé (SQLite ou autre)
+            max_entries: Nombre maximal d'entités gardées en cache
+            ttl: Durée de vie d'une entrée en secondes (None: jusqu'à éviction ou invalidation)
+            max_searches: Nombre maximal de résultats de recherche gardés en cache
+            key: Fonction donnant l'identifiant d'une entité
+
+        Raises:
+            ValueError: Si une borne n'est pas positive
+        """
+        if max_entries < 1 or max_searches < 1:
+            raise ValueError("max_entries et max_searches doivent être positifs")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl doit être positif")
+
+        self._inner = inner
+        self._key = key
+        self._entities: _LRU[T] = _LRU(max_entries, ttl)
+        self._searches: _LRU[list] = _LRU(max_searches, ttl)
+        self._lock = threading.Lock()
+        # Incrémenté à chaque invalidation: une lecture commencée avant n'est pas mise en cache
+        self._generation = 0
+        # Profondeur de transaction et identifiants écrits, par thread
+        self._local = threading.local()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __getattr__(self, name: str) -> Any:
+        """Délègue les méthodes propres au repository enveloppé (sans cache)"""
+        if name == "_inner":
+            raise AttributeError(name)
+        return getattr(self._inner, name)
+
+    ####################################################
+    # Compteurs
+    ####################################################
+
+    @property
+    def hits(self) -> int:
+        """Nombre de lectures servies par le cache"""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Nombre de lectures transmises au repository enveloppé"""
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """Nombre d'entrées évincées pour rester sous les bornes"""
+        return self._evictions
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Résume l'état du cache
+
+        Returns:
+            Dictionnaire des compteurs et du nombre d'entrées en cache
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entities": len(self._entities),
+                "searches": len(self._searches),
+            }
+
+    def clear(self) -> None:
+        """Vide le cache (les compteurs sont conservés)"""
+        with self._lock:
+            self._generation += 1
+            self._entities.clear()
+            self._searches.clear()
+
+    ####################################################
+    # Lectures
+    ####################################################
+
+    def get_by_id(self, entity_id: str) -> Optional[T]:
+        """Récupère une entité depuis le cache, ou depuis le repository enveloppé puis la met en cache"""
+        generation, entity = self._lookup(self._entities, entity_id)
+        if entity is not _MISSING:
+            return entity
+
+        entity = self._inner.get_by_id(entity_id)
+        if entity is not None:
+            self._store(self._entities, generation, [(entity_id, entity)])
+        return entity
+
+    def get_many(self, entity_ids: Iterable[str], defer: Iterable[str] = ()) -> Dict[str, T]:
+        """
+        Récupère plusieurs entités: celles du cache, puis les autres en un seul appel au repository enveloppé
+
+        Les entités en cache sont complètes et servent aussi les demandes avec defer;
+        celles chargées avec des champs différés sont rendues sans être mises en cache.
+        """
+        defer = tuple(defer)
+        found: Dict[str, T] = {}
+        missing: List[str] = []
+        with self._lock:
+            generation = self._generation
+            for entity_id in dict.fromkeys(entity_ids):
+                entity = self._entities.get(entity_id)
+                if entity is _MISSING:
+                    missing.append(entity_id)
+                else:
+                    found[entity_id] = entity
+            self._hits += len(found)
+            self._misses += len(missing)
+
+        if missing:
+            loaded = self._inner.get_many(missing, defer)
+            if not defer:
+                self._store(self._entities, generation, loaded.items())
+            found.update(loaded)
+        return found
+
+    def get_all(self) -> List[T]:
+        """Récupère toutes les entités (sans cache)"""
+        return self._inner.get_all()
+
+    def count(self) -> int:
+        """Compte les entités (sans cache)"""
+        return self._inner.count()
+
+    def page(self, after_key: Optional[str] = None, limit: int = 50, defer: Iterable[str] = ()) -> List[T]:
+        """Récupère une page d'entités (sans cache)"""
+        return self._inner.page(after_key, limit, defer)
+
+    def iter_all(self, batch_size: int = 500, after: Optional[str] = None, defer: Iterable[str] = ()) -> Iterator[T]:
+        """Parcourt toutes les entités (sans cache: un parcours complet viderait le LRU)"""
+        return self._inner.iter_all(batch_size, after, defer)
+
+    def search(self, query: str) -> List[T]:
+        """Recherche des entités, résultat mémorisé par requête"""
+        return self._cached_search(("search", query), lambda: self._inner.search(query))
+
+    def search_ranked(self, query: str, limit: int = 20) -> List[Tuple[T, float]]:
+        """Recherche classée, résultat mémorisé par couple (requête, limite)"""
+        return self._cached_search(
+            ("search_ranked", query, limit), lambda: self._inner.search_ranked(query, limit)
+        )
+
+    def _cached_search(self, cache_key: tuple, search: Callable[[], list]) -> list:
+        """Sert une recherche depuis le cache, ou l'exécute puis la met en cache"""
+        generation, results = self._lookup(self._searches, cache_key)
+        if results is _MISSING:
+            results = search()
+            self._store(self._searches, generation, [(cache_key, results)])
+        # Copie: l'appelant peut modifier la liste sans toucher au cache
+        return list(results)
+
+    def _lookup(self, cache: _LRU, cache_key: Hashable) -> Tuple[int, Any]:
+        """Cherche une entrée, compte le succès ou l'échec, retourne (génération, valeur ou _MISSING)"""
+        with self._lock:
+            value = cache.get(cache_key)
+            if value is _MISSING:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return self._generation, value
+
+    def _store(self, cache: _LRU, generation: int, items: Iterable[Tuple[Hashable, Any]]) -> None:
+        """
+        Met en cache des valeurs lues, sauf si une invalidation a eu lieu depuis la lecture
+
+        Rien n'est mis en cache dans une transaction: les valeurs lues peuvent
+        encore être annulées.
+        """
+        if getattr(self._local, "depth", 0):
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            for cache_key, value in items:
+                self._evictions += cache.put(cache_key, value)
+
+    ####################################################
+    # Écritures (invalidation)
+    ####################################################
+
+    def add(self, entity: T) -> bool:
+        """Ajoute une entité, invalide les recherches mémorisées"""
+        try:
+            return self._inner.add(entity)
+        finally:
+            self._invalidate([self._key(entity)])
+
+    def update(self, entity: T) -> bool:
+        """Met à jour une entité, l'invalide ainsi que les recherches mémorisées"""
+        try:
+            return self._inner.update(entity)
+        finally:
+            self._invalidate([self._key(entity)])
+
+    def delete(self, entity_id: str) -> bool:
+        """Supprime une entité, l'invalide ainsi que les recherches mémorisées"""
+        try:
+            return self._inner.delete(entity_id)
+        finally:
+            self._invalidate([entity_id])
+
+    def add_many(self, entities: Iterable[T]) -> List[str]:
+        """Ajoute plusieurs entités, invalide les recherches mémorisées"""
+        entities = list(entities)
+        try:
+            return self._inner.add_many(entities)
+        finally:
+            self._invalidate([self._key(entity) for entity in entities])
+
+    def update_many(self, entities: Iterable[T]) -> List[str]:
+        """Met à jour plusieurs entités, les invalide ainsi que les recherches mémorisées"""
+        entities = list(entities)
+        try:
+            return self._inner.update_many(entities)
+        finally:
+            self._invalidate([self._key(entity) for entity in entities])
+
+    def delete_many(self, entity_ids: Iterable[str]) -> List[str]:
+        """Supprime plusieurs entités, les invalide ainsi que les recherches mémorisées"""
+        entity_ids = list(entity_ids)
+        try:
+            return self._inner.delete_many(entity_ids)
+        finally:
+            self._invalidate(entity_ids)
+
+    @contextmanager
+    def transaction(self) -> Iterator[Any]:
+        """
+        Unité de travail du repository enveloppé
+
+        Les entités écrites dans le bloc sont invalidées une nouvelle fois à sa
+        sortie (validation ou annulation): un autre thread a pu relire entre-temps
+        leur ancienne version.
+        """
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            self._local.written = set()
+        self._local.depth = depth + 1
+        try:
+            with self._inner.transaction() as conn:
+                yield conn
+        finally:
+            self._local.depth = depth
+            if depth == 0 and self._local.written:
+                self._invalidate(self._local.written)
+
+    def _invalidate(self, entity_ids: Iterable[str]) -> None:
+        """Retire des entités du cache et vide les recherches mémorisées"""
+        entity_ids = list(entity_ids)
+        with self._lock:
+            self._generation += 1
+            for entity_id in entity_ids:
+                self._entities.pop(entity_id)
+            self._searches.clear()
+        if getattr(self._local, "depth", 0):
+            written: Set[str] = self._local.written
+            written.update(entity_ids)
@@ -0,0 +1,213 @@
+"""
+Pool de connexions SQLite par thread, partagé par les repositories SQLite
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple, Union
+from urllib.parse import quote
+
+from unicorn.u_string import U_String
+
+
+def _normalize(value: Optional[str]) -> Optional[str]:
+    """Forme normalisée d'une valeur texte (fonction SQL normalize)"""
+    return U_String(value).normalize() if value is not None else None
+
+
+# Profils de performance, appliqués à l'ouverture de chaque connexion
+# (cache_size négatif: en Kio; mmap_size et busy_timeout: en octets et millisecondes)
+PRAGMA_PROFILES: Dict[str, Dict[str, Union[int, str]]] = {
+    # Application de consultation: lectures concurrentes pendant les écritures
+    "read-heavy": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # Import en masse: débit maximal, les dernières transactions peuvent être
+    # perdues en cas de coupure de courant (imports à pouvoir rejouer)
+    "bulk-ingest": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -262144,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+    # Chaque transaction validée est sur disque avant de rendre la main
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16384,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+}
+
+DEFAULT_PROFILE = "durable"
+
+
+class SQLiteConnectionPool:
+    """
+    Pool de connexions SQLite: une connexion réutilisable par thread
+
+    Une connexion SQLite ne doit pas être utilisée par deux threads à la fois:
+    chaque thread (script Streamlit, worker d'API) reçoit donc sa propre
+    connexion, ouverte à la première utilisation puis gardée ouverte. Les
+    pragmas et la fonction SQL normalize ne sont appliqués qu'une fois par
+    connexion, et le cache de requêtes préparées de sqlite3 est conservé
+    d'un appel à l'autre.
+
+    Les connexions des threads terminés sont fermées au fil de l'eau.
+
+    Le profil (PRAGMA_PROFILES) règle journal WAL, synchronisation, caches et
+    attente sur verrou. En lecture seule (read_only), la base est ouverte avec
+    mode=ro: elle doit exister, et son mode de journal reste celui choisi par
+    l'écrivain.
+    """
+
+    # Nombre de requêtes préparées gardées en cache par connexion
+    _cachedStatements = 256
+
+    def __init__(self, db_path: str, profile: str = DEFAULT_PROFILE, read_only: bool = False) -> None:
+        """
+        Initialise un pool vide (les connexions sont ouvertes à la demande)
+
+        Args:
+            db_path: Chemin vers le fichier de base de données
+            profile: Nom du profil de pragmas (voir PRAGMA_PROFILES)
+            read_only: Ouvrir la base en lecture seule (mode=ro)
+        """
+        if profile not in PRAGMA_PROFILES:
+            raise ValueError(f"Profil inconnu: {profile} (profils: {', '.join(PRAGMA_PROFILES)})")
+        self.db_path = db_path
+        self.profile = profile
+        self.read_only = read_only
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+        self._pid = os.getpid()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Fournit la connexion du thread courant dans une transaction
+
+        Les appels imbriqués partagent la même transaction: seul le bloc le plus
+        externe valide (commit) ou annule (rollback).
+
+        Yields:
+            La connexion SQLite du thread courant
+        """
+        conn = self._thread_connection()
+        local = self._local
+        local.depth += 1
+        try:
+            yield conn
+            if local.depth == 1:
+                conn.commit()
+        except Exception:
+            if local.depth == 1:
+                conn.rollback()
+            raise
+        finally:
+            local.depth -= 1
+
+    def close(self) -> None:
+        """Ferme toutes les connexions du pool (elles seront rouvertes à la demande)"""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for _, conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def __len__(self) -> int:
+        """Nombre de connexions ouvertes"""
+        return len(self._connections)
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        """Retourne la connexion du thread courant, en l'ouvrant si nécessaire"""
+        if os.getpid() != self._pid:
+            # Processus fils (fork): les connexions du parent ne sont pas réutilisables
+            self._pid = os.getpid()
+            self._connections = {}
+            self._local = threading.local()
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._lock:
+                self._close_dead_threads()
+                self._connections[threading.get_ident()] = (threading.current_thread(), conn)
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """Ouvre une connexion et lui applique la configuration une fois pour toutes"""
+        # check_same_thread=False: seul close() touche la connexion d'un autre thread,
+        # le pool garantit sinon qu'elle n'est utilisée que par son thread
+        if self.read_only:
+            conn = sqlite3.connect(
+                f"file:{quote(os.path.abspath(self.db_path))}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=self._cachedStatements
+            )
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=self._cachedStatements
+            )
+        conn.row_factory = sqlite3.Row
+        conn.create_function("normalize", 1, _normalize, deterministic=True)
+        conn.execute("PRAGMA foreign_keys = ON")  # Activer les clés étrangères
+        for name, value in PRAGMA_PROFILES[self.profile].items():
+            # Le mode de journal est stocké dans le fichier: réservé aux écrivains
+            if name == "journal_mode" and self.read_only:
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _close_dead_threads(self) -> None:
+        """Ferme les connexions des threads terminés (appelé sous verrou)"""
+        for ident, (thread, conn) in list(self._connections.items()):
+            if not thread.is_alive():
+                del self._connections[ident]
+                conn.close()
+
+
+_pools: Dict[Tuple[str, str, bool], SQLiteConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str, profile: str = DEFAULT_PROFILE, read_only: bool = False) -> SQLiteConnectionPool:
+    """
+    Retourne le pool partagé d'une base de données (créé au premier appel)
+
+    Les repositories ouverts sur le même fichier, avec le même profil, partagent
+    ainsi leurs connexions.
+
+    Args:
+        db_path: Chemin vers le fichier de base de données
+        profile: Nom du profil de pragmas (voir PRAGMA_PROFILES)
+        read_only: Ouvrir la base en lecture seule (mode=ro)
+
+    Returns:
+        Le pool de connexions de cette base
+    """
+    path = db_path if db_path == ":memory:" else os.path.abspath(db_path)
+    key = (path, profile, read_only)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = SQLiteConnectionPool(db_path, profile, read_only)
+        return pool
@@ -4,103 +4,451 @@ Architecture à 2 tables avec relation 1:N
 """
 
 import sqlite3
-from typing import List, Optional
-from contextlib import contextmanager
+from datetime import datetime
+from functools import partial
+from itertools import islice
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
 
 from models.oeuvre import Oeuvre
 from models.edition import Edition
+from models.deferred import NOT_LOADED, deferred_fields
 from const.book_format import BookFormat
 from const.genre import Genre
-from services.repository import IRepository
+from services.repository import IRepository, iter_pages
+from services.edition_repository import ISBN_FRAGMENT_MIN_LENGTH
+from services.connection_pool import SQLiteConnectionPool, get_pool
+from services.migrations import OEUVRE_LISTS, SEARCH_TEXTS, migrate
+from services.search_index import (
+    FTS_WORD, index_documents, matching_keys, rebuild_search_index, search_words, typo_words
+)
+from services.ranking import (
+    score_edition, score_oeuvre, top_k,
+    TITLE_WEIGHT, AUTHOR_WEIGHT, ISBN_WEIGHT, PUBLISHER_WEIGHT
+)
+from unicorn.u_fuzzy_query import U_FuzzyQuery
+from unicorn.u_string import U_String
+
+T = TypeVar('T')
+
+
+def _fts_query(conn: sqlite3.Connection, table: str, query: str) -> Optional[str]:
+    """
+    Construit l'expression FTS5 MATCH d'une saisie libre
+
+    Chaque mot devient un préfixe ("mot"*), et tous les mots sont requis.
+    Un mot qui ne préfixe aucun terme de l'index est remplacé par les termes
+    à distance de Levenshtein tolérée (1, ou 2 au-delà de 4 lettres), trouvés
+    par la table de variantes par suppression (voir services.search_index).
+
+    Args:
+        conn: Connexion SQLite
+        table: Table dont l'index plein texte ({table}_fts) est interrogé
+        query: La saisie de l'utilisateur
+
+    Returns:
+        L'expression MATCH, ou None si aucune ligne ne peut correspondre
+    """
+    clauses = []
+    for word in FTS_WORD.findall(U_String(query).normalize()):
+        prefixed = conn.execute(
+            f"SELECT 1 FROM {table}_fts_vocab WHERE term >= ? AND term < ? LIMIT 1",
+            (word, word + "\U0010ffff")
+        ).fetchone()
+        if prefixed:
+            clauses.append(f'"{word}"*')
+            continue
+
+        # Aucun terme ne commence par ce mot: tolérer les fautes de frappe
+        # (la table de variantes contient aussi des mots avec ponctuation, absents de l'index)
+        terms = [term for term in typo_words(conn, table, word) if FTS_WORD.fullmatch(term)]
+        if not terms:
+            return None
+        clauses.append("(" + " OR ".join(f'"{term}"' for term in terms) + ")")
+
+    return " AND ".join(clauses) or None
+
+
+def _fts_string(text: str) -> str:
+    """Chaîne FTS5 entre guillemets (guillemets internes doublés)"""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _fuzzy_rows(
+    conn: sqlite3.Connection, table: str, key: str, columns: str, keys: Set[str], seen: Set[str]
+) -> Iterator[tuple]:
+    """
+    Parcourt, triées par clé, les lignes de la recherche floue absentes de seen
+
+    Args:
+        conn: Connexion SQLite
+        table: Table interrogée
+        key: Clé texte de la table
+        columns: Colonnes lues
+        keys: Clés des lignes correspondantes (voir services.search_index.matching_keys)
+        seen: Clés déjà rendues (classement bm25)
+    """
+    for chunk in _chunks(sorted(keys - seen), BULK_CHUNK_SIZE):
+        placeholders = ", ".join("?" * len(chunk))
+        yield from _tuples(
+            conn, f"SELECT {columns} FROM {table} WHERE {key} IN ({placeholders}) ORDER BY {key}", chunk
+        )
+
+
+# Nombre de lignes envoyées par executemany dans les opérations en masse
+# (reste sous la limite historique de 999 paramètres pour les requêtes IN)
+BULK_CHUNK_SIZE = 500
+
+_OEUVRE_INSERT = """
+    INSERT INTO oeuvres (
+        work_id, title, author, original_language,
+        original_publication_year, summary, series, series_number,
+        title_normalized, author_normalized, series_normalized
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_OEUVRE_UPDATE = """
+    UPDATE oeuvres SET
+        title = ?, author = ?, original_language = ?,
+        original_publication_year = ?, summary = ?, series = ?, series_number = ?,
+        title_normalized = ?, author_normalized = ?, series_normalized = ?
+    WHERE work_id = ?
+"""
+
+_EDITION_INSERT = """
+    INSERT INTO editions (
+        isbn, work_id, publisher, publication_year, language,
+        format, pages, dimensions_height, dimensions_width,
+        dimensions_thickness, weight, cover_front_url,
+        cover_back_url, cover_spine_url, cover_color,
+        price, currency, ean, edition_number, collection,
+        translator, illustrator, preface_by,
+        publisher_normalized, collection_normalized
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_EDITION_UPDATE = """
+    UPDATE editions SET
+        work_id = ?, publisher = ?, publication_year = ?, language = ?,
+        format = ?, pages = ?, dimensions_height = ?, dimensions_width = ?,
+        dimensions_thickness = ?, weight = ?, cover_front_url = ?,
+        cover_back_url = ?, cover_spine_url = ?, cover_color = ?,
+        price = ?, currency = ?, ean = ?, edition_number = ?,
+        collection = ?, translator = ?, illustrator = ?, preface_by = ?,
+        publisher_normalized = ?, collection_normalized = ?
+    WHERE isbn = ?
+"""
+
+
+# Colonnes lues pour reconstruire les entités, dans l'ordre des paramètres de
+# Oeuvre.from_row et Edition.from_row: les lignes sont des tuples lus par position
+_OEUVRE_SELECT = ", ".join((
+    "work_id", "title", "author", "original_language",
+    "original_publication_year", "summary", "series", "series_number",
+    "title_normalized", "author_normalized", "series_normalized",
+))
+
+_EDITION_SELECT = ", ".join((
+    "isbn", "work_id", "publisher", "publication_year", "language",
+    "format", "pages", "dimensions_height", "dimensions_width",
+    "dimensions_thickness", "weight", "cover_front_url",
+    "cover_back_url", "cover_spine_url", "cover_color",
+    "price", "currency", "ean", "edition_number", "collection",
+    "translator", "illustrator", "preface_by",
+    "publisher_normalized", "collection_normalized",
+))
+
+# Position de la colonne format, lue par position
+_FORMAT_COLUMN = 5
+
+# Valeur stockée -> membre de l'enum (un dict, au lieu de l'appel BookFormat(value))
+_BOOK_FORMATS: Dict[str, BookFormat] = {book_format.value: book_format for book_format in BookFormat}
+_GENRES: Dict[str, Genre] = {genre.value: genre for genre in Genre}
+
+
+def _prefixed(columns: str, alias: str) -> str:
+    """Préfixe une liste de colonnes par l'alias d'une table (jointures)"""
+    return ", ".join(f"{alias}.{column}" for column in columns.split(", "))
+
+
+def _projection(columns: str, model: type, defer: Iterable[str]) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Liste de colonnes d'une lecture avec champs différés
+
+    Les colonnes différées sont remplacées par NULL: les positions lues par
+    from_row ne changent pas, mais SQLite ne copie pas leur contenu.
+
+    Args:
+        columns: Colonnes lues (_OEUVRE_SELECT, _EDITION_SELECT)
+        model: Classe des entités, qui déclare ses champs différables
+        defer: Champs à différer
+
+    Returns:
+        Couple (liste de colonnes, champs différés)
+    """
+    deferred = tuple(dict.fromkeys(defer))
+    unknown = set(deferred).difference(deferred_fields(model))
+    if unknown:
+        raise ValueError(f"Champs non différables pour {model.__name__}: {', '.join(sorted(unknown))}")
+    if not deferred:
+        return columns, ()
+    return ", ".join("NULL" if column in deferred else column for column in columns.split(", ")), deferred
+
+
+class _DeferredLoader:
+    """
+    Chargeur des champs différés d'un lot d'entités (voir models.deferred)
+
+    La première lecture d'un champ différé, sur n'importe quelle entité du lot,
+    charge les champs de tout le lot: une requête IN (...) par paquet, au lieu
+    d'une requête par entité.
+    """
+
+    def __init__(
+        self,
+        pool: SQLiteConnectionPool,
+        table: str,
+        key: str,
+        fields: Tuple[str, ...],
+        entities: Iterable[object]
+    ) -> None:
+        """
+        Marque les champs des entités comme non chargés et leur attache le chargeur
+
+        Args:
+            pool: Pool de connexions de la base
+            table: Table des entités
+            key: Clé primaire, qui est aussi l'attribut identifiant des entités
+            fields: Champs différés (noms de colonnes et d'attributs)
+            entities: Entités du lot
+        """
+        self._pool = pool
+        self._table = table
+        self._key = key
+        self._fields = fields
+        self._pending = {getattr(entity, key): entity for entity in entities}
+        for entity in self._pending.values():
+            for field in fields:
+                setattr(entity, f"_{field}", NOT_LOADED)
+            entity._deferred_loader = self
+
+    def load(self, entity: object) -> None:
+        """Charge les champs différés de toutes les entités du lot encore en attente"""
+        pending, self._pending = self._pending, {}
+        columns = ", ".join(self._fields)
+        with self._pool.connection() as conn:
+            for chunk in _chunks(list(pending), BULK_CHUNK_SIZE):
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = _tuples(
+                    conn, f"SELECT {self._key}, {columns} FROM {self._table} WHERE {self._key} IN ({placeholders})",
+                    chunk
+                )
+                for key, *values in cursor:
+                    self._fill(pending.pop(key), values)
+        # Entités supprimées depuis leur lecture: champs vides
+        for remaining in pending.values():
+            self._fill(remaining, [None] * len(self._fields))
+
+    def _fill(self, entity: object, values: List[object]) -> None:
+        """Range les valeurs chargées, sans écraser un champ affecté entre-temps"""
+        for field, value in zip(self._fields, values):
+            if getattr(entity, f"_{field}") is NOT_LOADED:
+                setattr(entity, f"_{field}", value)
+        entity._deferred_loader = None
+
+
+def _tuples(conn: sqlite3.Connection, sql: str, parameters: Iterable = ()) -> sqlite3.Cursor:
+    """Exécute une requête dont les lignes sont des tuples (sans sqlite3.Row, lecture par position)"""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor.execute(sql, parameters)
+
+
+def _chunks(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Découpe un itérable en listes d'au plus size éléments"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _begin(conn: sqlite3.Connection) -> None:
+    """Ouvre une transaction si aucune n'est en cours (un seul commit pour tout le lot)"""
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+
+
+def _write_chunk(
+    conn: sqlite3.Connection,
+    sql: str,
+    chunk: List[Tuple[str, tuple]],
+    existing_in: Optional[Tuple[str, str]] = None
+) -> List[int]:
+    """
+    Écrit un paquet de lignes avec un seul executemany, dans un savepoint
+
+    Si une contrainte d'intégrité échoue, le paquet est annulé puis rejoué ligne
+    par ligne: seules les lignes fautives sont écartées, le reste est écrit.
+
+    Args:
+        conn: Connexion SQLite (dans une transaction)
+        sql: Requête paramétrée (INSERT, UPDATE ou DELETE)
+        chunk: Couples (identifiant, paramètres de la requête)
+        existing_in: (table, clé primaire) pour écarter d'abord les identifiants
+            absents de la table (UPDATE et DELETE)
+
+    Returns:
+        Positions, dans le paquet, des lignes non écrites
+    """
+    failed: List[int] = []
+    positions = range(len(chunk))
+    if existing_in is not None:
+        table, key = existing_in
+        ids = list({entity_id for entity_id, _ in chunk})
+        placeholders = ", ".join("?" * len(ids))
+        existing = {
+            entity_id for (entity_id,) in conn.execute(
+                f"SELECT {key} FROM {table} WHERE {key} IN ({placeholders})", ids
+            )
+        }
+        failed = [i for i in positions if chunk[i][0] not in existing]
+        positions = [i for i in positions if chunk[i][0] in existing]
+
+    conn.execute("SAVEPOINT bulk_chunk")
+    try:
+        conn.executemany(sql, [chunk[i][1] for i in positions])
+    except sqlite3.IntegrityError:
+        conn.execute("ROLLBACK TO bulk_chunk")
+        # Repli ligne par ligne: une erreur n'annule que sa propre instruction
+        for i in positions:
+            try:
+                conn.execute(sql, chunk[i][1])
+            except sqlite3.IntegrityError:
+                failed.append(i)
+    conn.execute("RELEASE bulk_chunk")
+    return sorted(failed)
+
+
+def _write_many(
+    conn: sqlite3.Connection,
+    sql: str,
+    rows: Iterable[Tuple[str, tuple]],
+    chunk_size: int,
+    existing_in: Optional[Tuple[str, str]] = None
+) -> List[str]:
+    """
+    Exécute une écriture en masse dans une seule transaction, par paquets
+
+    Args:
+        conn: Connexion SQLite
+        sql: Requête paramétrée (INSERT, UPDATE ou DELETE)
+        rows: Couples (identifiant, paramètres de la requête)
+        chunk_size: Nombre de lignes par executemany
+        existing_in: (table, clé primaire) pour écarter d'abord les identifiants
+            absents de la table (UPDATE et DELETE)
+
+    Returns:
+        Identifiants des lignes non écrites
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size doit être positif")
+    _begin(conn)
+
+    failed: List[str] = []
+    for chunk in _chunks(rows, chunk_size):
+        failed.extend(chunk[i][0] for i in _write_chunk(conn, sql, chunk, existing_in))
+    return failed
 
 
 class OeuvreSQLiteRepository(IRepository[Oeuvre]):
     """Repository SQLite pour les Oeuvres"""
 
-    def __init__(self, db_path: str = "catalogue.db") -> None:
+    def __init__(self, db_path: str = "catalogue.db", pool: Optional[SQLiteConnectionPool] = None) -> None:
         """
         Initialise le repository avec la base de données SQLite
 
         Args:
             db_path: Chemin vers le fichier de base de données
+            pool: Pool de connexions (par défaut, celui partagé par tous les repositories de cette base;
+                  voir get_pool pour choisir un profil ou la lecture seule)
         """
         self.db_path = db_path
-        self._create_table()
+        self._pool = pool if pool is not None else get_pool(db_path)
+        # En lecture seule, le schéma est tenu à jour par l'écrivain
+        if not self._pool.read_only:
+            with self._get_connection() as conn:
+                migrate(conn)
 
-    @contextmanager
     def _get_connection(self):
-        """Context manager pour gérer les connexions SQLite"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
-
-    def _create_table(self) -> None:
-        """Crée la table oeuvres si elle n'existe pas"""
-        with self._get_connection() as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS oeuvres (
-                    work_id TEXT PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    author TEXT NOT NULL,
-                    co_authors TEXT,
-                    original_language TEXT,
-                    original_publication_year INTEGER,
-                    summary TEXT,
-                    genres TEXT,
-                    themes TEXT,
-                    awards TEXT,
-                    series TEXT,
-                    series_number INTEGER
-                )
-            """)
+        """Context manager fournissant la connexion du thread courant (pool partagé)"""
+        return self._pool.connection()
+
+    def rebuild_search_index(self) -> None:
+        """Reconstruit les index de recherche à partir de la table (après une écriture qui les a contournés)"""
+        with self._get_connection() as conn:
+            conn.execute("INSERT INTO oeuvres_fts(oeuvres_fts) VALUES ('rebuild')")
+            rebuild_search_index(conn, "oeuvres", *SEARCH_TEXTS["oeuvres"])
 
     def get_by_id(self, work_id: str) -> Optional[Oeuvre]:
         """Récupère une œuvre par son work_id"""
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM oeuvres WHERE work_id = ?",
+            cursor = _tuples(
+                conn, f"SELECT {_OEUVRE_SELECT} FROM oeuvres WHERE work_id = ?",
                 (work_id,)
             )
             row = cursor.fetchone()
-            return self._row_to_oeuvre(row) if row else None
+            return self._hydrate(conn, [row])[0] if row else None
+
+    def get_many(self, work_ids: Iterable[str], defer: Iterable[str] = ()) -> Dict[str, Oeuvre]:
+        """Récupère plusieurs œuvres: une requête IN (...) par paquet, sous la limite de variables de SQLite"""
+        columns, deferred = _projection(_OEUVRE_SELECT, Oeuvre, defer)
+        with self._get_connection() as conn:
+            found = {}
+            for chunk in _chunks(dict.fromkeys(work_ids), BULK_CHUNK_SIZE):
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = _tuples(conn, f"SELECT {columns} FROM oeuvres WHERE work_id IN ({placeholders})", chunk)
+                found.update((oeuvre.work_id, oeuvre) for oeuvre in self._hydrate(conn, cursor.fetchall()))
+            self._defer(found.values(), deferred)
+            return found
 
     def get_all(self) -> List[Oeuvre]:
         """Récupère toutes les œuvres"""
         with self._get_connection() as conn:
-            cursor = conn.execute("SELECT * FROM oeuvres ORDER BY title")
-            return [self._row_to_oeuvre(row) for row in cursor.fetchall()]
+            cursor = _tuples(conn, f"SELECT {_OEUVRE_SELECT} FROM oeuvres ORDER BY title")
+            return self._hydrate(conn, cursor.fetchall())
+
+    def count(self) -> int:
+        """Compte les œuvres (COUNT, sans hydratation)"""
+        with self._get_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM oeuvres").fetchone()[0]
+
+    def page(self, after_key: Optional[str] = None, limit: int = 50, defer: Iterable[str] = ()) -> List[Oeuvre]:
+        """Récupère une page d'œuvres triées par work_id (pagination par clé: WHERE work_id > ? LIMIT ?)"""
+        columns, deferred = _projection(_OEUVRE_SELECT, Oeuvre, defer)
+        with self._get_connection() as conn:
+            if after_key is None:
+                cursor = _tuples(conn, f"SELECT {columns} FROM oeuvres ORDER BY work_id LIMIT ?", (limit,))
+            else:
+                cursor = _tuples(
+                    conn, f"SELECT {columns} FROM oeuvres WHERE work_id > ? ORDER BY work_id LIMIT ?",
+                    (after_key, limit)
+                )
+            return self._defer(self._hydrate(conn, cursor.fetchall()), deferred)
+
+    def iter_all(
+        self, batch_size: int = 500, after: Optional[str] = None, defer: Iterable[str] = ()
+    ) -> Iterator[Oeuvre]:
+        """Parcourt toutes les œuvres par paquets (une requête courte par paquet, mémoire constante)"""
+        return iter_pages(partial(self.page, defer=tuple(defer)), lambda oeuvre: oeuvre.work_id, batch_size, after)
 
     def add(self, oeuvre: Oeuvre) -> bool:
         """Ajoute une nouvelle œuvre"""
         try:
             with self._get_connection() as conn:
-                conn.execute("""
-                    INSERT INTO oeuvres (
-                        work_id, title, author, co_authors, original_language,
-                        original_publication_year, summary, genres, themes,
-                        awards, series, series_number
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    oeuvre.work_id,
-                    oeuvre.title,
-                    oeuvre.author,
-                    ",".join(oeuvre.co_authors) if oeuvre.co_authors else None,
-                    oeuvre.original_language,
-                    oeuvre.original_publication_year,
-                    oeuvre.summary,
-                    ",".join([g.value for g in oeuvre.genres]) if oeuvre.genres else None,
-                    ",".join(oeuvre.themes) if oeuvre.themes else None,
-                    ",".join(oeuvre.awards) if oeuvre.awards else None,
-                    oeuvre.series,
-                    oeuvre.series_number
-                ))
+                conn.execute(_OEUVRE_INSERT, self._oeuvre_values(oeuvre))
+                self._write_lists(conn, [oeuvre])
+                index_documents(conn, "oeuvres", self._search_words([oeuvre]))
                 return True
         except sqlite3.IntegrityError:
             return False
@@ -108,27 +456,12 @@ class OeuvreSQLiteRepository(IRepository[Oeuvre]):
     def update(self, oeuvre: Oeuvre) -> bool:
         """Met à jour une œuvre existante"""
         with self._get_connection() as conn:
-            cursor = conn.execute("""
-                UPDATE oeuvres SET
-                    title = ?, author = ?, co_authors = ?, original_language = ?,
-                    original_publication_year = ?, summary = ?, genres = ?,
-                    themes = ?, awards = ?, series = ?, series_number = ?
-                WHERE work_id = ?
-            """, (
-                oeuvre.title,
-                oeuvre.author,
-                ",".join(oeuvre.co_authors) if oeuvre.co_authors else None,
-                oeuvre.original_language,
-                oeuvre.original_publication_year,
-                oeuvre.summary,
-                ",".join([g.value for g in oeuvre.genres]) if oeuvre.genres else None,
-                ",".join(oeuvre.themes) if oeuvre.themes else None,
-                ",".join(oeuvre.awards) if oeuvre.awards else None,
-                oeuvre.series,
-                oeuvre.series_number,
-                oeuvre.work_id
-            ))
-            return cursor.rowcount > 0
+            cursor = conn.execute(_OEUVRE_UPDATE, self._update_values(oeuvre))
+            if cursor.rowcount == 0:
+                return False
+            self._write_lists(conn, [oeuvre])
+            index_documents(conn, "oeuvres", self._search_words([oeuvre]))
+            return True
 
     def delete(self, work_id: str) -> bool:
         """Supprime une œuvre"""
@@ -136,155 +469,335 @@ class OeuvreSQLiteRepository(IRepository[Oeuvre]):
             cursor = conn.execute("DELETE FROM oeuvres WHERE work_id = ?", (work_id,))
             return cursor.rowcount > 0
 
+    def add_many(self, oeuvres: Iterable[Oeuvre], chunk_size: int = BULK_CHUNK_SIZE) -> List[str]:
+        """Ajoute des œuvres en une transaction (executemany par paquets), retourne les work_id refusés"""
+        return self._write_oeuvres(_OEUVRE_INSERT, self._oeuvre_values, oeuvres, chunk_size)
+
+    def update_many(self, oeuvres: Iterable[Oeuvre], chunk_size: int = BULK_CHUNK_SIZE) -> List[str]:
+        """Met à jour des œuvres en une transaction, retourne les work_id absents ou refusés"""
+        return self._write_oeuvres(
+            _OEUVRE_UPDATE, self._update_values, oeuvres, chunk_size, ("oeuvres", "work_id")
+        )
+
+    def _write_oeuvres(
+        self,
+        sql: str,
+        values: Callable[[Oeuvre], tuple],
+        oeuvres: Iterable[Oeuvre],
+        chunk_size: int,
+        existing_in: Optional[Tuple[str, str]] = None
+    ) -> List[str]:
+        """Écrit des œuvres par paquets, puis les tables d'association et les mots de celles qui ont été écrites"""
+        if chunk_size < 1:
+            raise ValueError("chunk_size doit être positif")
+        failed: List[str] = []
+        with self._get_connection() as conn:
+            _begin(conn)
+            for chunk in _chunks(oeuvres, chunk_size):
+                rows = [(oeuvre.work_id, values(oeuvre)) for oeuvre in chunk]
+                chunk_failed = set(_write_chunk(conn, sql, rows, existing_in))
+                written = [o for i, o in enumerate(chunk) if i not in chunk_failed]
+                self._write_lists(conn, written)
+                index_documents(conn, "oeuvres", self._search_words(written))
+                failed.extend(chunk[i].work_id for i in sorted(chunk_failed))
+        return failed
+
+    def delete_many(self, work_ids: Iterable[str], chunk_size: int = BULK_CHUNK_SIZE) -> List[str]:
+        """Supprime des œuvres en une transaction, retourne les work_id absents"""
+        rows = ((work_id, (work_id,)) for work_id in work_ids)
+        with self._get_connection() as conn:
+            return _write_many(
+                conn, "DELETE FROM oeuvres WHERE work_id = ?", rows, chunk_size, ("oeuvres", "work_id")
+            )
+
+    def transaction(self) -> ContextManager[sqlite3.Connection]:
+        """Unité de travail: les appels du bloc partagent la connexion et un seul commit"""
+        return self._pool.connection()
+
     def search(self, query: str) -> List[Oeuvre]:
-        """Recherche des œuvres par titre ou auteur"""
+        """Recherche des œuvres par titre ou auteur (classement bm25, puis correspondances floues)"""
         with self._get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT * FROM oeuvres
-                WHERE title LIKE ? OR author LIKE ?
-                ORDER BY title
-            """, (f"%{query}%", f"%{query}%"))
-            return [self._row_to_oeuvre(row) for row in cursor.fetchall()]
+            return self._hydrate(conn, self._search_rows(conn, query))
 
-    def _row_to_oeuvre(self, row: sqlite3.Row) -> Oeuvre:
-        """Convertit une ligne SQL en objet Oeuvre"""
-        oeuvre = Oeuvre(row['work_id'])
-        oeuvre.title = row['title']
-        oeuvre.author = row['author']
-        oeuvre.co_authors = row['co_authors'].split(',') if row['co_authors'] else []
-        oeuvre.original_language = row['original_language'] or 'fr'
-        oeuvre.original_publication_year = row['original_publication_year']
-        oeuvre.summary = row['summary']
+    def search_ranked(self, query: str, limit: int = 20) -> List[Tuple[Oeuvre, float]]:
+        """Recherche des œuvres classées par pertinence (scores calculés au fil du curseur)"""
+        if not query.strip():
+            return []
 
-        # Convertir les genres stockés en texte vers des enums
-        if row['genres']:
-            oeuvre.genres = [Genre(g) for g in row['genres'].split(',')]
+        words = U_String(query).normalize().split()
+        with self._get_connection() as conn:
+            oeuvres = (Oeuvre.from_row(*row) for row in self._search_rows(conn, query))
+            ranked = top_k(((oeuvre, score_oeuvre(oeuvre, words)) for oeuvre in oeuvres), limit)
+            # Les champs multivalués ne servent pas au score: chargés pour les seuls résultats retenus
+            self._attach_lists(conn, [oeuvre for oeuvre, _ in ranked])
+            return ranked
+
+    def _search_rows(self, conn: sqlite3.Connection, query: str) -> Iterator[tuple]:
+        """
+        Parcourt les œuvres correspondant à la requête, comme la recherche en mémoire
 
-        oeuvre.themes = row['themes'].split(',') if row['themes'] else []
-        oeuvre.awards = row['awards'].split(',') if row['awards'] else []
-        oeuvre.series = row['series']
-        oeuvre.series_number = row['series_number']
+        D'abord les débuts de mots de l'index plein texte, classés par bm25, puis
+        les autres correspondances floues (milieu de mot, fautes de frappe) par work_id.
+        """
+        compiled = U_FuzzyQuery.compile(query)
+        if not compiled:
+            return
+        keys = matching_keys(conn, "oeuvres", compiled.words)
+        seen = set()
+        match = _fts_query(conn, "oeuvres", query)
+        if match is not None:
+            cursor = _tuples(conn, f"""
+                SELECT {_prefixed(_OEUVRE_SELECT, "o")} FROM oeuvres_fts f
+                JOIN oeuvres o ON o.id = f.rowid
+                WHERE oeuvres_fts MATCH ?
+                ORDER BY bm25(oeuvres_fts, {TITLE_WEIGHT}, {AUTHOR_WEIGHT})
+            """, (match,))
+            for row in cursor:
+                if row[0] in keys:
+                    seen.add(row[0])
+                    yield row
+
+        yield from _fuzzy_rows(conn, "oeuvres", "work_id", _OEUVRE_SELECT, keys, seen)
+
+    def get_by_author(self, author: str) -> List[Oeuvre]:
+        """Récupère toutes les œuvres d'un auteur (insensible aux accents et à la casse)"""
+        with self._get_connection() as conn:
+            cursor = _tuples(
+                conn, f"SELECT {_OEUVRE_SELECT} FROM oeuvres WHERE author_normalized = ?",
+                (U_String(author).normalize(),)
+            )
+            return self._hydrate(conn, cursor.fetchall())
 
-        return oeuvre
+    def get_by_series(self, series: str) -> List[Oeuvre]:
+        """Récupère toutes les œuvres d'une série, triées par numéro"""
+        with self._get_connection() as conn:
+            cursor = _tuples(
+                conn, f"SELECT {_OEUVRE_SELECT} FROM oeuvres WHERE series_normalized = ? ORDER BY series_number",
+                (U_String(series).normalize(),)
+            )
+            return self._hydrate(conn, cursor.fetchall())
+
+    def get_by_genre(self, genre: Genre) -> List[Oeuvre]:
+        """Récupère toutes les œuvres d'un genre (recherche d'index sur oeuvre_genres)"""
+        return self._get_by_list_value("oeuvre_genres", genre.value)
+
+    def get_by_theme(self, theme: str) -> List[Oeuvre]:
+        """Récupère toutes les œuvres abordant un thème (insensible aux accents et à la casse)"""
+        return self._get_by_list_value("oeuvre_themes", theme)
+
+    def get_by_award(self, award: str) -> List[Oeuvre]:
+        """Récupère toutes les œuvres ayant reçu un prix (insensible aux accents et à la casse)"""
+        return self._get_by_list_value("oeuvre_awards", award)
+
+    def get_by_co_author(self, co_author: str) -> List[Oeuvre]:
+        """Récupère toutes les œuvres d'un co-auteur (insensible aux accents et à la casse)"""
+        return self._get_by_list_value("oeuvre_co_authors", co_author)
+
+    def _get_by_list_value(self, table: str, value: str) -> List[Oeuvre]:
+        """Récupère les œuvres dont un champ multivalué contient la valeur"""
+        with self._get_connection() as conn:
+            cursor = _tuples(conn, f"""
+                SELECT {_prefixed(_OEUVRE_SELECT, "o")} FROM oeuvres o
+                WHERE o.work_id IN (SELECT work_id FROM {table} WHERE value_normalized = ?)
+                ORDER BY o.title
+            """, (U_String(value).normalize(),))
+            return self._hydrate(conn, cursor.fetchall())
+
+    def _write_lists(self, conn: sqlite3.Connection, oeuvres: List[Oeuvre]) -> None:
+        """Remplace le contenu des tables d'association pour les œuvres données"""
+        if not oeuvres:
+            return
+        work_ids = [(oeuvre.work_id,) for oeuvre in oeuvres]
+        for table, attribute in OEUVRE_LISTS.items():
+            conn.executemany(f"DELETE FROM {table} WHERE work_id = ?", work_ids)
+            conn.executemany(
+                f"INSERT INTO {table} (work_id, position, value, value_normalized) VALUES (?, ?, ?, ?)",
+                [
+                    (oeuvre.work_id, position, text, U_String(text).normalize())
+                    for oeuvre in oeuvres
+                    for position, text in enumerate(self._list_texts(oeuvre, attribute))
+                ]
+            )
+
+    def _hydrate(self, conn: sqlite3.Connection, rows: Iterable[tuple]) -> List[Oeuvre]:
+        """Convertit des lignes en œuvres complètes (champs multivalués compris)"""
+        return self._attach_lists(conn, [Oeuvre.from_row(*row) for row in rows])
+
+    def _defer(self, oeuvres: Iterable[Oeuvre], deferred: Tuple[str, ...]) -> List[Oeuvre]:
+        """Attache aux œuvres le chargeur de leurs champs différés (rien si aucun champ n'est différé)"""
+        oeuvres = list(oeuvres)
+        if deferred:
+            _DeferredLoader(self._pool, "oeuvres", "work_id", deferred, oeuvres)
+        return oeuvres
+
+    def _attach_lists(self, conn: sqlite3.Connection, oeuvres: List[Oeuvre]) -> List[Oeuvre]:
+        """Charge les champs multivalués: une requête par table d'association et par paquet d'œuvres"""
+        by_id = {oeuvre.work_id: oeuvre for oeuvre in oeuvres}
+        for chunk in _chunks(by_id, BULK_CHUNK_SIZE):
+            placeholders = ", ".join("?" * len(chunk))
+            for table, attribute in OEUVRE_LISTS.items():
+                cursor = conn.execute(f"""
+                    SELECT work_id, value FROM {table}
+                    WHERE work_id IN ({placeholders})
+                    ORDER BY work_id, position
+                """, chunk)
+                values: Dict[str, list] = {}
+                for work_id, text in cursor:
+                    values.setdefault(work_id, []).append(_GENRES[text] if attribute == "genres" else text)
+                # Les œuvres sans valeur gardent le tuple vide partagé
+                for work_id, texts in values.items():
+                    setattr(by_id[work_id], attribute, texts)
+        return oeuvres
+
+    @staticmethod
+    def _list_texts(oeuvre: Oeuvre, attribute: str) -> List[str]:
+        """Valeurs texte d'un champ multivalué (les genres sont stockés par leur valeur)"""
+        values = oeuvre.values_of(attribute)
+        if attribute == "genres":
+            return [genre.value for genre in values]
+        return values
+
+    @staticmethod
+    def _search_words(oeuvres: Iterable[Oeuvre]) -> Dict[str, Set[str]]:
+        """Mots de la recherche floue des œuvres, par work_id (voir SEARCH_TEXTS)"""
+        return {
+            oeuvre.work_id: search_words(oeuvre.title_normalized, oeuvre.author_normalized)
+            for oeuvre in oeuvres
+        }
+
+    @staticmethod
+    def _oeuvre_values(oeuvre: Oeuvre) -> tuple:
+        """Paramètres de l'INSERT, dans l'ordre des colonnes"""
+        return (
+            oeuvre.work_id,
+            oeuvre.title,
+            oeuvre.author,
+            oeuvre.original_language,
+            oeuvre.original_publication_year,
+            oeuvre.summary,
+            oeuvre.series,
+            oeuvre.series_number,
+            oeuvre.title_normalized,
+            oeuvre.author_normalized,
+            oeuvre.series_normalized
+        )
+
+    @classmethod
+    def _update_values(cls, oeuvre: Oeuvre) -> tuple:
+        """Paramètres de l'UPDATE: mêmes colonnes, work_id en dernier"""
+        values = cls._oeuvre_values(oeuvre)
+        return values[1:] + values[:1]
 
 
 class EditionSQLiteRepository(IRepository[Edition]):
     """Repository SQLite pour les Editions"""
 
-    def __init__(self, db_path: str = "catalogue.db") -> None:
+    def __init__(self, db_path: str = "catalogue.db", pool: Optional[SQLiteConnectionPool] = None) -> None:
         """
         Initialise le repository avec la base de données SQLite
 
         Args:
             db_path: Chemin vers le fichier de base de données
+            pool: Pool de connexions (par défaut, celui partagé par tous les repositories de cette base;
+                  voir get_pool pour choisir un profil ou la lecture seule)
         """
         self.db_path = db_path
-        self._create_table()
+        self._pool = pool if pool is not None else get_pool(db_path)
+        # En lecture seule, le schéma est tenu à jour par l'écrivain
+        if not self._pool.read_only:
+            with self._get_connection() as conn:
+                migrate(conn)
 
-    @contextmanager
     def _get_connection(self):
-        """Context manager pour gérer les connexions SQLite"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")  # Activer les clés étrangères
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
-
-    def _create_table(self) -> None:
-        """Crée la table editions si elle n'existe pas"""
-        with self._get_connection() as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS editions (
-                    isbn TEXT PRIMARY KEY,
-                    work_id TEXT,
-                    publisher TEXT,
-                    publication_year INTEGER,
-                    language TEXT,
-                    format TEXT,
-                    pages INTEGER,
-                    dimensions_height REAL,
-                    dimensions_width REAL,
-                    dimensions_thickness REAL,
-                    weight INTEGER,
-                    cover_front_url TEXT,
-                    cover_back_url TEXT,
-                    cover_spine_url TEXT,
-                    cover_color TEXT,
-                    price REAL,
-                    currency TEXT,
-                    ean TEXT,
-                    edition_number INTEGER,
-                    collection TEXT,
-                    translator TEXT,
-                    illustrator TEXT,
-                    preface_by TEXT,
-                    FOREIGN KEY (work_id) REFERENCES oeuvres(work_id) ON DELETE CASCADE
-                )
-            """)
+        """Context manager fournissant la connexion du thread courant (pool partagé)"""
+        return self._pool.connection()
 
-            # Créer un index sur work_id pour accélérer les recherches
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_editions_work_id
-                ON editions(work_id)
-            """)
+    def rebuild_search_index(self) -> None:
+        """Reconstruit les index de recherche à partir de la table (après une écriture qui les a contournés)"""
+        with self._get_connection() as conn:
+            conn.execute("INSERT INTO editions_fts(editions_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO editions_isbn(editions_isbn) VALUES ('rebuild')")
+            rebuild_search_index(conn, "editions", *SEARCH_TEXTS["editions"])
 
     def get_by_id(self, isbn: str) -> Optional[Edition]:
         """Récupère une édition par son ISBN"""
         with self._get_connection() as conn:
-            cursor = conn.execute("SELECT * FROM editions WHERE isbn = ?", (isbn,))
+            cursor = _tuples(conn, f"SELECT {_EDITION_SELECT} FROM editions WHERE isbn = ?", (isbn,))
             row = cursor.fetchone()
-            return self._row_to_edition(row) if row else None
+            return self._row_to_edition(row, datetime.now()) if row else None
+
+    def get_many(self, isbns: Iterable[str], defer: Iterable[str] = ()) -> Dict[str, Edition]:
+        """Récupère plusieurs éditions: une requête IN (...) par paquet, sous la limite de variables de SQLite"""
+        columns, deferred = _projection(_EDITION_SELECT, Edition, defer)
+        with self._get_connection() as conn:
+            found = {}
+            for chunk in _chunks(dict.fromkeys(isbns), BULK_CHUNK_SIZE):
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = _tuples(conn, f"SELECT {columns} FROM editions WHERE isbn IN ({placeholders})", chunk)
+                found.update((edition.isbn, edition) for edition in self._hydrate(cursor))
+            self._defer(found.values(), deferred)
+            return found
 
     def get_all(self) -> List[Edition]:
         """Récupère toutes les éditions"""
         with self._get_connection() as conn:
-            cursor = conn.execute("SELECT * FROM editions ORDER BY isbn")
-            return [self._row_to_edition(row) for row in cursor.fetchall()]
+            cursor = _tuples(conn, f"SELECT {_EDITION_SELECT} FROM editions ORDER BY isbn")
+            return self._hydrate(cursor)
+
+    def count(self) -> int:
+        """Compte les éditions (COUNT, sans hydratation)"""
+        with self._get_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM editions").fetchone()[0]
+
+    def count_by_format(self) -> Dict[Optional[BookFormat], int]:
+        """Compte les éditions par format (GROUP BY sur l'index idx_editions_format)"""
+        with self._get_connection() as conn:
+            cursor = conn.execute("SELECT format, COUNT(*) FROM editions GROUP BY format")
+            return {_BOOK_FORMATS[value] if value else None: count for value, count in cursor}
+
+    def count_works(self) -> int:
+        """Compte les œuvres ayant au moins une édition (COUNT DISTINCT sur l'index idx_editions_work_id_year)"""
+        with self._get_connection() as conn:
+            return conn.execute("SELECT COUNT(DISTINCT work_id) FROM editions").fetchone()[0]
+
+    def count_works_without_editions(self, work_ids: Iterable[str]) -> int:
+        """Compte, parmi les work_id donnés, ceux sans édition (IN (...) par paquet, sur l'index par work_id)"""
+        with self._get_connection() as conn:
+            missing = 0
+            for chunk in _chunks(dict.fromkeys(work_ids), BULK_CHUNK_SIZE):
+                placeholders = ", ".join("?" * len(chunk))
+                found = conn.execute(
+                    f"SELECT COUNT(DISTINCT work_id) FROM editions WHERE work_id IN ({placeholders})", chunk
+                ).fetchone()[0]
+                missing += len(chunk) - found
+            return missing
+
+    def page(self, after_key: Optional[str] = None, limit: int = 50, defer: Iterable[str] = ()) -> List[Edition]:
+        """Récupère une page d'éditions triées par isbn (pagination par clé: WHERE isbn > ? LIMIT ?)"""
+        columns, deferred = _projection(_EDITION_SELECT, Edition, defer)
+        with self._get_connection() as conn:
+            if after_key is None:
+                cursor = _tuples(conn, f"SELECT {columns} FROM editions ORDER BY isbn LIMIT ?", (limit,))
+            else:
+                cursor = _tuples(
+                    conn, f"SELECT {columns} FROM editions WHERE isbn > ? ORDER BY isbn LIMIT ?",
+                    (after_key, limit)
+                )
+            return self._defer(self._hydrate(cursor), deferred)
+
+    def iter_all(
+        self, batch_size: int = 500, after: Optional[str] = None, defer: Iterable[str] = ()
+    ) -> Iterator[Edition]:
+        """Parcourt toutes les éditions par paquets (une requête courte par paquet, mémoire constante)"""
+        return iter_pages(partial(self.page, defer=tuple(defer)), lambda edition: edition.isbn, batch_size, after)
 
     def add(self, edition: Edition) -> bool:
         """Ajoute une nouvelle édition"""
         try:
             with self._get_connection() as conn:
-                conn.execute("""
-                    INSERT INTO editions (
-                        isbn, work_id, publisher, publication_year, language,
-                        format, pages, dimensions_height, dimensions_width,
-                        dimensions_thickness, weight, cover_front_url,
-                        cover_back_url, cover_spine_url, cover_color,
-                        price, currency, ean, edition_number, collection,
-                        translator, illustrator, preface_by
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    edition.isbn,
-                    edition.work_id,
-                    edition.publisher,
-                    edition.publication_year,
-                    edition.language,
-                    edition.format.value if edition.format else None,
-                    edition.pages,
-                    edition.dimensions_height,
-                    edition.dimensions_width,
-                    edition.dimensions_thickness,
-                    edition.weight,
-                    edition.cover_front_url,
-                    edition.cover_back_url,
-                    edition.cover_spine_url,
-                    edition.cover_color,
-                    edition.price,
-                    edition.currency,
-                    edition.ean,
-                    edition.edition_number,
-                    edition.collection,
-                    edition.translator,
-                    edition.illustrator,
-                    edition.preface_by
-                ))
+                conn.execute(_EDITION_INSERT, self._edition_values(edition))
+                index_documents(conn, "editions", self._search_words([edition]))
+                edition.mark_created(datetime.now())
                 return True
         except sqlite3.IntegrityError:
             return False
@@ -292,41 +805,11 @@ class EditionSQLiteRepository(IRepository[Edition]):
     def update(self, edition: Edition) -> bool:
         """Met à jour une édition existante"""
         with self._get_connection() as conn:
-            cursor = conn.execute("""
-                UPDATE editions SET
-                    work_id = ?, publisher = ?, publication_year = ?, language = ?,
-                    format = ?, pages = ?, dimensions_height = ?, dimensions_width = ?,
-                    dimensions_thickness = ?, weight = ?, cover_front_url = ?,
-                    cover_back_url = ?, cover_spine_url = ?, cover_color = ?,
-                    price = ?, currency = ?, ean = ?, edition_number = ?,
-                    collection = ?, translator = ?, illustrator = ?, preface_by = ?
-                WHERE isbn = ?
-            """, (
-                edition.work_id,
-                edition.publisher,
-                edition.publication_year,
-                edition.language,
-                edition.format.value if edition.format else None,
-                edition.pages,
-                edition.dimensions_height,
-                edition.dimensions_width,
-                edition.dimensions_thickness,
-                edition.weight,
-                edition.cover_front_url,
-                edition.cover_back_url,
-                edition.cover_spine_url,
-                edition.cover_color,
-                edition.price,
-                edition.currency,
-                edition.ean,
-                edition.edition_number,
-                edition.collection,
-                edition.translator,
-                edition.illustrator,
-                edition.preface_by,
-                edition.isbn
-            ))
-            return cursor.rowcount > 0
+            cursor = conn.execute(_EDITION_UPDATE, self._update_values(edition))
+            if cursor.rowcount == 0:
+                return False
+            index_documents(conn, "editions", self._search_words([edition]))
+            return True
 
     def delete(self, isbn: str) -> bool:
         """Supprime une édition"""
@@ -334,52 +817,225 @@ class EditionSQLiteRepository(IRepository[Edition]):
             cursor = conn.execute("DELETE FROM editions WHERE isbn = ?", (isbn,))
             return cursor.rowcount > 0
 
+    def add_many(self, editions: Iterable[Edition], chunk_size: int = BULK_CHUNK_SIZE) -> List[str]:
+        """Ajoute des éditions en une transaction (executemany par paquets), retourne les ISBN refusés"""
+        return self._write_editions(
+            _EDITION_INSERT, self._edition_values, editions, chunk_size, created_at=datetime.now()
+        )
+
+    def update_many(self, editions: Iterable[Edition], chunk_size: int = BULK_CHUNK_SIZE) -> List[str]:
+        """Met à jour des éditions en une transaction, retourne les ISBN absents ou refusés"""
+        return self._write_editions(
+            _EDITION_UPDATE, self._update_values, editions, chunk_size, ("editions", "isbn")
+        )
+
+    def _write_editions(
+        self,
+        sql: str,
+        values: Callable[[Edition], tuple],
+        editions: Iterable[Edition],
+        chunk_size: int,
+        existing_in: Optional[Tuple[str, str]] = None,
+        created_at: Optional[datetime] = None
+    ) -> List[str]:
+        """Écrit des éditions par paquets, puis les mots de celles qui ont été écrites (horodatées si ajoutées)"""
+        if chunk_size < 1:
+            raise ValueError("chunk_size doit être positif")
+        failed: List[str] = []
+        with self._get_connection() as conn:
+            _begin(conn)
+            for chunk in _chunks(editions, chunk_size):
+                rows = [(edition.isbn, values(edition)) for edition in chunk]
+                chunk_failed = set(_write_chunk(conn, sql, rows, existing_in))
+                written = [e for i, e in enumerate(chunk) if i not in chunk_failed]
+                index_documents(conn, "editions", self._search_words(written))
+                if created_at is not None:
+                    for edition in written:
+                        edition.mark_created(created_at)
+                failed.extend(chunk[i].isbn for i in sorted(chunk_failed))
+        return failed
+
+    def delete_many(self, isbns: Iterable[str], chunk_size: int = BULK_CHUNK_SIZE) -> List[str]:
+        """Supprime des éditions en une transaction, retourne les ISBN absents"""
+        rows = ((isbn, (isbn,)) for isbn in isbns)
+        with self._get_connection() as conn:
+            return _write_many(
+                conn, "DELETE FROM editions WHERE isbn = ?", rows, chunk_size, ("editions", "isbn")
+            )
+
+    def transaction(self) -> ContextManager[sqlite3.Connection]:
+        """Unité de travail: les appels du bloc partagent la connexion et un seul commit"""
+        return self._pool.connection()
+
     def search(self, query: str) -> List[Edition]:
-        """Recherche des éditions par ISBN ou éditeur"""
+        """Recherche des éditions par ISBN ou éditeur (classement bm25, puis correspondances floues)"""
+        with self._get_connection() as conn:
+            return self._hydrate(self._search_rows(conn, query))
+
+    def search_ranked(self, query: str, limit: int = 20) -> List[Tuple[Edition, float]]:
+        """Recherche des éditions classées par pertinence (scores calculés au fil du curseur)"""
+        if not query.strip():
+            return []
+
         with self._get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT * FROM editions
-                WHERE isbn LIKE ? OR publisher LIKE ?
-                ORDER BY isbn
-            """, (f"%{query}%", f"%{query}%"))
-            return [self._row_to_edition(row) for row in cursor.fetchall()]
+            loaded_at = datetime.now()
+            editions = (self._row_to_edition(row, loaded_at) for row in self._search_rows(conn, query))
+            return top_k(((edition, score_edition(edition, query)) for edition in editions), limit)
+
+    def _search_rows(self, conn: sqlite3.Connection, query: str) -> Iterator[tuple]:
+        """
+        Parcourt les éditions correspondant à la requête, comme la recherche en mémoire
+
+        D'abord les débuts de mots de l'index plein texte, classés par bm25, puis les
+        autres correspondances (fragment d'ISBN, éditeur aux fautes près) par ISBN.
+        """
+        compiled = U_FuzzyQuery.compile(query)
+        if not compiled:
+            return
+        keys = matching_keys(conn, "editions", compiled.words) | self._isbns_containing(conn, compiled.text)
+        seen = set()
+        match = _fts_query(conn, "editions", query)
+        if match is not None:
+            cursor = _tuples(conn, f"""
+                SELECT {_prefixed(_EDITION_SELECT, "e")} FROM editions_fts f
+                JOIN editions e ON e.id = f.rowid
+                WHERE editions_fts MATCH ?
+                ORDER BY bm25(editions_fts, {ISBN_WEIGHT}, {PUBLISHER_WEIGHT})
+            """, (match,))
+            for row in cursor:
+                if row[0] in keys:
+                    seen.add(row[0])
+                    yield row
+
+        yield from _fuzzy_rows(conn, "editions", "isbn", _EDITION_SELECT, keys, seen)
 
     def get_by_work_id(self, work_id: str) -> List[Edition]:
         """Récupère toutes les éditions d'une œuvre"""
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM editions WHERE work_id = ? ORDER BY publication_year DESC",
+            cursor = _tuples(
+                conn, f"SELECT {_EDITION_SELECT} FROM editions WHERE work_id = ? ORDER BY publication_year DESC",
                 (work_id,)
             )
-            return [self._row_to_edition(row) for row in cursor.fetchall()]
-
-    def _row_to_edition(self, row: sqlite3.Row) -> Edition:
-        """Convertit une ligne SQL en objet Edition"""
-        edition = Edition(row['isbn'], row['work_id'])
-        edition.publisher = row['publisher'] or ''
-        edition.publication_year = row['publication_year']
-        edition.language = row['language'] or 'fr'
-
-        # Convertir le format texte vers enum
-        if row['format']:
-            edition.format = BookFormat(row['format'])
-
-        edition.pages = row['pages']
-        edition.dimensions_height = row['dimensions_height']
-        edition.dimensions_width = row['dimensions_width']
-        edition.dimensions_thickness = row['dimensions_thickness']
-        edition.weight = row['weight']
-        edition.cover_front_url = row['cover_front_url']
-        edition.cover_back_url = row['cover_back_url']
-        edition.cover_spine_url = row['cover_spine_url']
-        edition.cover_color = row['cover_color']
-        edition.price = row['price']
-        edition.currency = row['currency']
-        edition.ean = row['ean']
-        edition.edition_number = row['edition_number']
-        edition.collection = row['collection']
-        edition.translator = row['translator']
-        edition.illustrator = row['illustrator']
-        edition.preface_by = row['preface_by']
-
-        return edition
+            return self._hydrate(cursor)
+
+    def get_by_work_ids(self, work_ids: Iterable[str]) -> Dict[str, List[Edition]]:
+        """Récupère les éditions de plusieurs œuvres: une requête IN (...) par paquet, servie par l'index sur work_id"""
+        with self._get_connection() as conn:
+            found: Dict[str, List[Edition]] = {}
+            for chunk in _chunks(dict.fromkeys(work_ids), BULK_CHUNK_SIZE):
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = _tuples(conn, f"""
+                    SELECT {_EDITION_SELECT} FROM editions WHERE work_id IN ({placeholders})
+                    ORDER BY work_id, publication_year DESC
+                """, chunk)
+                for edition in self._hydrate(cursor):
+                    found.setdefault(edition.work_id, []).append(edition)
+            return found
+
+    def get_by_publisher(self, publisher: str) -> List[Edition]:
+        """Récupère toutes les éditions d'un éditeur (insensible aux accents et à la casse)"""
+        with self._get_connection() as conn:
+            cursor = _tuples(
+                conn, f"SELECT {_EDITION_SELECT} FROM editions WHERE publisher_normalized = ? AND publisher != ''",
+                (U_String(publisher).normalize(),)
+            )
+            return self._hydrate(cursor)
+
+    def get_by_collection(self, collection: str) -> List[Edition]:
+        """Récupère toutes les éditions d'une collection"""
+        with self._get_connection() as conn:
+            cursor = _tuples(
+                conn, f"SELECT {_EDITION_SELECT} FROM editions WHERE collection_normalized = ?",
+                (U_String(collection).normalize(),)
+            )
+            return self._hydrate(cursor)
+
+    def get_by_year(self, year: int) -> List[Edition]:
+        """Récupère toutes les éditions publiées une année donnée"""
+        with self._get_connection() as conn:
+            cursor = _tuples(conn, f"SELECT {_EDITION_SELECT} FROM editions WHERE publication_year = ?", (year,))
+            return self._hydrate(cursor)
+
+    def get_by_ean(self, ean: str) -> List[Edition]:
+        """Récupère les éditions portant un code-barres EAN"""
+        with self._get_connection() as conn:
+            cursor = _tuples(conn, f"SELECT {_EDITION_SELECT} FROM editions WHERE ean = ?", (ean,))
+            return self._hydrate(cursor)
+
+    @staticmethod
+    def _search_words(editions: Iterable[Edition]) -> Dict[str, Set[str]]:
+        """Mots de la recherche floue des éditions (éditeur seul), par ISBN (voir SEARCH_TEXTS)"""
+        return {edition.isbn: search_words(edition.publisher_normalized) for edition in editions}
+
+    @staticmethod
+    def _isbns_containing(conn: sqlite3.Connection, fragment: str) -> Set[str]:
+        """ISBN contenant le fragment (ISBN_FRAGMENT_MIN_LENGTH caractères au moins), par l'index trigram"""
+        if len(fragment) < ISBN_FRAGMENT_MIN_LENGTH:
+            return set()
+        cursor = conn.execute("""
+            SELECT e.isbn FROM editions_isbn f
+            JOIN editions e ON e.id = f.rowid
+            WHERE editions_isbn MATCH ?
+        """, (_fts_string(fragment),))
+        return {isbn for (isbn,) in cursor if fragment in isbn.lower()}
+
+    @staticmethod
+    def _edition_values(edition: Edition) -> tuple:
+        """Paramètres de l'INSERT, dans l'ordre des colonnes"""
+        return (
+            edition.isbn,
+            edition.work_id,
+            edition.publisher,
+            edition.publication_year,
+            edition.language,
+            edition.format.value if edition.format else None,
+            edition.pages,
+            edition.dimensions_height,
+            edition.dimensions_width,
+            edition.dimensions_thickness,
+            edition.weight,
+            edition.cover_front_url,
+            edition.cover_back_url,
+            edition.cover_spine_url,
+            edition.cover_color,
+            edition.price,
+            edition.currency,
+            edition.ean,
+            edition.edition_number,
+            edition.collection,
+            edition.translator,
+            edition.illustrator,
+            edition.preface_by,
+            edition.publisher_normalized,
+            edition.collection_normalized
+        )
+
+    @classmethod
+    def _update_values(cls, edition: Edition) -> tuple:
+        """Paramètres de l'UPDATE: mêmes colonnes, isbn en dernier"""
+        values = cls._edition_values(edition)
+        return values[1:] + values[:1]
+
+    def _defer(self, editions: Iterable[Edition], deferred: Tuple[str, ...]) -> List[Edition]:
+        """Attache aux éditions le chargeur de leurs champs différés (rien si aucun champ n'est différé)"""
+        editions = list(editions)
+        if deferred:
+            _DeferredLoader(self._pool, "editions", "isbn", deferred, editions)
+        return editions
+
+    @classmethod
+    def _hydrate(cls, rows: Iterable[tuple]) -> List[Edition]:
+        """Convertit des lignes en éditions (un seul horodatage de chargement pour le lot)"""
+        loaded_at = datetime.now()
+        return [cls._row_to_edition(row, loaded_at) for row in rows]
+
+    @staticmethod
+    def _row_to_edition(row: tuple, loaded_at: datetime) -> Edition:
+        """Convertit une ligne (colonnes de _EDITION_SELECT, lues par position) en objet Edition"""
+        value = row[_FORMAT_COLUMN]
+        return Edition.from_row(
+            *row[:_FORMAT_COLUMN],
+            _BOOK_FORMATS[value] if value else None,
+            *row[_FORMAT_COLUMN + 1:],
+            loaded_at=loaded_at
+        )
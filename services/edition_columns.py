@@ -0,0 +1,465 @@
+"""
+Instantané en colonnes des éditions, pour les requêtes analytiques (NumPy optionnel)
+
+Les champs numériques (année, pages, prix, poids, dimensions) sont rangés dans
+des tableaux NumPy float64 (NaN pour une valeur absente), les champs répétitifs
+(format, langue, éditeur, devise) sont encodés par dictionnaire (un code int32
+par édition, -1 pour une valeur absente). Filtres, regroupements et agrégats
+sont alors vectorisés au lieu de parcourir des objets Edition.
+
+NumPy n'est pas une dépendance du projet: ce module s'importe sans lui, mais
+construire un EditionColumns lève ImportError.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from models.deferred import deferred_fields
+from models.edition import Edition
+from services.repository import IRepository
+
+try:
+    import numpy as np
+except ImportError:  # Dépendance optionnelle
+    np = None
+
+
+# Colonnes numériques (tableaux float64, NaN si absente)
+NUMERIC_COLUMNS: Tuple[str, ...] = (
+    "publication_year", "pages", "price", "weight",
+    "dimensions_height", "dimensions_width", "dimensions_thickness",
+)
+
+# Colonnes encodées par dictionnaire (codes int32, -1 si absente)
+CATEGORICAL_COLUMNS: Tuple[str, ...] = ("format", "language", "publisher", "currency")
+
+# Fonctions d'agrégat; comme en SQL, les valeurs absentes sont ignorées
+AGGREGATES: Tuple[str, ...] = ("count", "sum", "mean", "min", "max")
+
+# Code d'une valeur catégorielle absente
+_NULL_CODE = -1
+
+# Les colonnes n'utilisent aucun champ différé: inutile de lire les URLs de couverture
+_DEFERRED = deferred_fields(Edition)
+
+
+class EditionColumns:
+    """
+    Instantané en colonnes des éditions, mis à jour par lots
+
+    L'instantané n'observe pas le repository: il est construit par
+    from_repository, puis tenu à jour par upsert / remove, ou resynchronisé
+    par refresh (pour quelques ISBN ou en entier, par paquets).
+
+    Les masques (between, isin, is_null) sont des tableaux de booléens dans
+    l'ordre des lignes de l'instantané; ils se combinent avec &, | et ~ et ne
+    valent que jusqu'à la prochaine modification de l'instantané.
+
+    Exemple:
+        columns = EditionColumns.from_repository(biblio.edition_repo)
+        columns.group_by("format", "pages", "mean")      # pages moyennes par format
+        columns.group_by("currency", "price", "sum")     # valeur du catalogue par devise
+        columns.isbns(columns.between("publication_year", 1950, 1970)
+                      & columns.between("pages", low=501))
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        """
+        Initialise un instantané vide
+
+        Args:
+            capacity: Nombre de lignes réservées (les tableaux s'agrandissent au besoin)
+
+        Raises:
+            ImportError: Si NumPy n'est pas installé
+        """
+        if np is None:
+            raise ImportError("EditionColumns nécessite NumPy (pip install numpy)")
+
+        self._lock = threading.RLock()
+        self._size = 0
+        self._capacity = max(capacity, 1)
+        self._isbns: List[str] = []
+        # Ligne de chaque ISBN
+        self._rows: Dict[str, int] = {}
+        self._numeric: Dict[str, Any] = {
+            column: np.full(self._capacity, np.nan) for column in NUMERIC_COLUMNS
+        }
+        self._codes: Dict[str, Any] = {
+            column: np.full(self._capacity, _NULL_CODE, dtype=np.int32) for column in CATEGORICAL_COLUMNS
+        }
+        # Dictionnaires: valeurs par code, et code de chaque valeur (les codes ne sont jamais réattribués)
+        self._values: Dict[str, List[Any]] = {column: [] for column in CATEGORICAL_COLUMNS}
+        self._code_of: Dict[str, Dict[Any, int]] = {column: {} for column in CATEGORICAL_COLUMNS}
+
+    @classmethod
+    def from_repository(cls, repository: IRepository[Edition], batch_size: int = 5000) -> "EditionColumns":
+        """
+        Construit l'instantané de toutes les éditions d'un repository, par paquets
+
+        Args:
+            repository: Repository des éditions (mémoire, SQLite, cache...)
+            batch_size: Nombre d'éditions lues et encodées à la fois
+
+        Returns:
+            L'instantané
+        """
+        columns = cls()
+        columns.refresh(repository, batch_size=batch_size)
+        return columns
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, isbn: object) -> bool:
+        return isbn in self._rows
+
+    ####################################################
+    # Mise à jour
+    ####################################################
+
+    def upsert(self, editions: Iterable[Edition]) -> int:
+        """
+        Ajoute des éditions ou remplace leurs lignes
+
+        Args:
+            editions: Éditions à ranger (la dernière l'emporte pour un même ISBN)
+
+        Returns:
+            Nombre d'éditions rangées
+        """
+        batch = {edition.isbn: edition for edition in editions}
+        if not batch:
+            return 0
+        editions = list(batch.values())
+
+        with self._lock:
+            new = [isbn for isbn in batch if isbn not in self._rows]
+            self._reserve(self._size + len(new))
+            for isbn in new:
+                self._rows[isbn] = self._size
+                self._isbns.append(isbn)
+                self._size += 1
+
+            rows = np.fromiter((self._rows[isbn] for isbn in batch), dtype=np.intp, count=len(batch))
+            for column in NUMERIC_COLUMNS:
+                self._numeric[column][rows] = np.array(
+                    [getattr(edition, column) for edition in editions], dtype=np.float64
+                )
+            for column in CATEGORICAL_COLUMNS:
+                self._codes[column][rows] = np.fromiter(
+                    (self._encode(column, getattr(edition, column)) for edition in editions),
+                    dtype=np.int32, count=len(editions)
+                )
+        return len(editions)
+
+    def remove(self, isbns: Iterable[str]) -> int:
+        """
+        Retire des éditions de l'instantané (les ISBN inconnus sont ignorés)
+
+        Les lignes restantes gardent leur ordre relatif.
+
+        Args:
+            isbns: ISBN des éditions à retirer
+
+        Returns:
+            Nombre d'éditions retirées
+        """
+        with self._lock:
+            rows = [self._rows[isbn] for isbn in set(isbns) if isbn in self._rows]
+            if not rows:
+                return 0
+
+            keep = np.ones(self._size, dtype=bool)
+            keep[rows] = False
+            size = self._size - len(rows)
+            for array in (*self._numeric.values(), *self._codes.values()):
+                array[:size] = array[:self._size][keep]
+                array[size:self._size] = np.nan if array.dtype == np.float64 else _NULL_CODE
+            self._isbns = [isbn for isbn, kept in zip(self._isbns, keep.tolist()) if kept]
+            self._rows = {isbn: row for row, isbn in enumerate(self._isbns)}
+            self._size = size
+        return len(rows)
+
+    def refresh(
+        self,
+        repository: IRepository[Edition],
+        isbns: Optional[Iterable[str]] = None,
+        batch_size: int = 5000
+    ) -> int:
+        """
+        Resynchronise l'instantané avec le repository
+
+        Avec isbns, seules ces éditions sont relues (en un appel à get_many):
+        celles qui n'existent plus sont retirées. Sans isbns, tout le repository
+        est reparcouru par paquets de batch_size, puis les éditions qui n'y sont
+        plus sont retirées.
+
+        Args:
+            repository: Repository des éditions
+            isbns: ISBN des éditions modifiées depuis la dernière mise à jour (None: toutes)
+            batch_size: Nombre d'éditions lues et encodées à la fois (parcours complet)
+
+        Returns:
+            Nombre d'éditions relues
+        """
+        with self._lock:
+            if isbns is not None:
+                isbns = list(dict.fromkeys(isbns))
+                found = repository.get_many(isbns, defer=_DEFERRED)
+                self.remove(isbn for isbn in isbns if isbn not in found)
+                return self.upsert(found.values())
+
+            seen = set()
+            batch: List[Edition] = []
+            for edition in repository.iter_all(batch_size, defer=_DEFERRED):
+                batch.append(edition)
+                if len(batch) >= batch_size:
+                    seen.update(edition.isbn for edition in batch)
+                    self.upsert(batch)
+                    batch = []
+            seen.update(edition.isbn for edition in batch)
+            self.upsert(batch)
+            self.remove(isbn for isbn in self._isbns if isbn not in seen)
+            return len(seen)
+
+    def _reserve(self, size: int) -> None:
+        """Agrandit les tableaux (en doublant leur capacité) pour contenir size lignes"""
+        if size <= self._capacity:
+            return
+        capacity = max(size, 2 * self._capacity)
+        for column, array in self._numeric.items():
+            grown = np.full(capacity, np.nan)
+            grown[:self._size] = array[:self._size]
+            self._numeric[column] = grown
+        for column, array in self._codes.items():
+            grown = np.full(capacity, _NULL_CODE, dtype=np.int32)
+            grown[:self._size] = array[:self._size]
+            self._codes[column] = grown
+        self._capacity = capacity
+
+    def _encode(self, column: str, value: Any) -> int:
+        """Code d'une valeur catégorielle, ajoutée au dictionnaire au besoin (valeur vide: absente)"""
+        if value is None or value == "":
+            return _NULL_CODE
+        code_of = self._code_of[column]
+        code = code_of.get(value)
+        if code is None:
+            code = code_of[value] = len(self._values[column])
+            self._values[column].append(value)
+        return code
+
+    ####################################################
+    # Colonnes et filtres
+    ####################################################
+
+    def column(self, column: str) -> Any:
+        """
+        Copie d'une colonne, dans l'ordre des lignes
+
+        Args:
+            column: Colonne numérique (valeurs float64, NaN si absente)
+                ou catégorielle (codes int32, -1 si absente, voir dictionary)
+
+        Returns:
+            Tableau NumPy de len(self) valeurs
+
+        Raises:
+            ValueError: Si la colonne est inconnue
+        """
+        with self._lock:
+            return self._array(column).copy()
+
+    def dictionary(self, column: str) -> List[Any]:
+        """
+        Valeurs d'une colonne catégorielle, indexées par leur code
+
+        Raises:
+            ValueError: Si la colonne n'est pas catégorielle
+        """
+        if column not in CATEGORICAL_COLUMNS:
+            raise ValueError(f"Colonne catégorielle inconnue: {column}")
+        with self._lock:
+            return list(self._values[column])
+
+    def between(self, column: str, low: Optional[float] = None, high: Optional[float] = None) -> Any:
+        """
+        Masque des éditions dont la valeur numérique est dans [low, high]
+
+        Args:
+            column: Colonne numérique
+            low: Borne basse incluse (None: pas de borne)
+            high: Borne haute incluse (None: pas de borne)
+
+        Returns:
+            Tableau de booléens (faux pour une valeur absente)
+        """
+        if column not in NUMERIC_COLUMNS:
+            raise ValueError(f"Colonne numérique inconnue: {column}")
+        with self._lock:
+            values = self._array(column)
+            mask = ~np.isnan(values)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+            return mask
+
+    def isin(self, column: str, values: Iterable[Any]) -> Any:
+        """
+        Masque des éditions dont la valeur catégorielle est l'une de values
+
+        Args:
+            column: Colonne catégorielle (format attend des BookFormat)
+            values: Valeurs acceptées (None accepte les valeurs absentes)
+
+        Returns:
+            Tableau de booléens
+        """
+        if column not in CATEGORICAL_COLUMNS:
+            raise ValueError(f"Colonne catégorielle inconnue: {column}")
+        with self._lock:
+            code_of = self._code_of[column]
+            codes = [_NULL_CODE if value is None else code_of[value] for value in values
+                     if value is None or value in code_of]
+            return np.isin(self._array(column), codes)
+
+    def is_null(self, column: str) -> Any:
+        """Masque des éditions dont la valeur est absente"""
+        with self._lock:
+            values = self._array(column)
+            return np.isnan(values) if column in NUMERIC_COLUMNS else values == _NULL_CODE
+
+    def isbns(self, mask: Optional[Any] = None) -> List[str]:
+        """
+        ISBN des éditions retenues par un masque, dans l'ordre des lignes
+
+        Args:
+            mask: Masque de booléens (None: toutes les éditions)
+
+        Returns:
+            Liste des ISBN
+        """
+        with self._lock:
+            if mask is None:
+                return list(self._isbns)
+            rows = np.flatnonzero(self._check(mask))
+            return [self._isbns[row] for row in rows.tolist()]
+
+    def _array(self, column: str) -> Any:
+        """Vue des lignes occupées d'une colonne"""
+        if column in self._numeric:
+            return self._numeric[column][:self._size]
+        if column in self._codes:
+            return self._codes[column][:self._size]
+        raise ValueError(f"Colonne inconnue: {column}")
+
+    def _check(self, mask: Any) -> Any:
+        """Vérifie qu'un masque correspond aux lignes actuelles"""
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (self._size,):
+            raise ValueError("Le masque ne correspond pas à l'instantané (modifié depuis ?)")
+        return mask
+
+    ####################################################
+    # Agrégats
+    ####################################################
+
+    def aggregate(self, column: Optional[str] = None, function: str = "count", mask: Optional[Any] = None) -> Any:
+        """
+        Agrège une colonne numérique sur les éditions retenues
+
+        Args:
+            column: Colonne numérique (None avec count: compte les éditions)
+            function: count, sum, mean, min ou max (les valeurs absentes sont ignorées)
+            mask: Masque des éditions retenues (None: toutes)
+
+        Returns:
+            Le résultat (count: int; sum: 0.0 et mean/min/max: None s'il n'y a aucune valeur)
+        """
+        with self._lock:
+            values = self._values_for(column, function)
+            selected = None if mask is None else self._check(mask)
+            if values is None:
+                return self._size if selected is None else int(np.count_nonzero(selected))
+            if selected is not None:
+                values = values[selected]
+            values = values[~np.isnan(values)]
+            if function == "count":
+                return int(values.size)
+            if function == "sum":
+                return float(values.sum())
+            if not values.size:
+                return None
+            return float({"mean": np.mean, "min": np.min, "max": np.max}[function](values))
+
+    def group_by(
+        self,
+        key: str,
+        column: Optional[str] = None,
+        function: str = "count",
+        mask: Optional[Any] = None
+    ) -> Dict[Any, Any]:
+        """
+        Agrège une colonne numérique par valeur d'une colonne catégorielle
+
+        Args:
+            key: Colonne catégorielle de regroupement (None regroupe les valeurs absentes)
+            column: Colonne numérique agrégée (None avec count: compte les éditions)
+            function: count, sum, mean, min ou max (les valeurs absentes sont ignorées)
+            mask: Masque des éditions retenues (None: toutes)
+
+        Returns:
+            {valeur de key: résultat}, pour les valeurs de key présentes parmi les éditions retenues
+        """
+        if key not in CATEGORICAL_COLUMNS:
+            raise ValueError(f"Colonne catégorielle inconnue: {key}")
+        with self._lock:
+            values = self._values_for(column, function)
+            # Décalage de 1: le groupe 0 reçoit les valeurs absentes (code -1)
+            groups = self._array(key) + 1
+            if mask is not None:
+                mask = self._check(mask)
+                groups = groups[mask]
+                if values is not None:
+                    values = values[mask]
+            buckets = len(self._values[key]) + 1
+            present = np.bincount(groups, minlength=buckets)
+
+            if values is None:
+                results = present
+            else:
+                valid = ~np.isnan(values)
+                groups, values = groups[valid], values[valid]
+                counts = np.bincount(groups, minlength=buckets)
+                if function == "count":
+                    results = counts
+                elif function in ("sum", "mean"):
+                    results = np.bincount(groups, weights=values, minlength=buckets)
+                    if function == "mean":
+                        with np.errstate(invalid="ignore", divide="ignore"):
+                            results = results / counts
+                else:
+                    fill = np.inf if function == "min" else -np.inf
+                    results = np.full(buckets, fill)
+                    (np.minimum if function == "min" else np.maximum).at(results, groups, values)
+                # Groupes sans aucune valeur: None pour mean, min, max
+                if function in ("mean", "min", "max"):
+                    results = [None if not count else result
+                               for count, result in zip(counts.tolist(), results.tolist())]
+
+            labels = [None] + self._values[key]
+            results = results.tolist() if hasattr(results, "tolist") else results
+            return {labels[group]: results[group] for group in np.flatnonzero(present).tolist()}
+
+    def _values_for(self, column: Optional[str], function: str) -> Optional[Any]:
+        """Vue de la colonne agrégée, None pour un simple comptage des éditions"""
+        if function not in AGGREGATES:
+            raise ValueError(f"Agrégat inconnu: {function} (attendu: {', '.join(AGGREGATES)})")
+        if column is None:
+            if function != "count":
+                raise ValueError(f"{function} nécessite une colonne numérique")
+            return None
+        if column not in NUMERIC_COLUMNS:
+            raise ValueError(f"Colonne numérique inconnue: {column}")
+        return self._array(column)
@@ -2,21 +2,41 @@
 Repository en mémoire pour les Editions
 """
 
-from typing import List, Optional, Dict
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import datetime
+from typing import ContextManager, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from models.edition import Edition
-from services.repository import IRepository
+from const.book_format import BookFormat
+from services.repository import IRepository, iter_pages
 from unicorn.u_string import U_String
+from unicorn.u_ngram_index import U_NgramIndex
+from unicorn.u_fuzzy_query import U_FuzzyQuery
+from services.ranking import score_edition, top_k
+from services.undo_journal import UndoJournal
+
+# Longueur minimale d'un fragment d'ISBN recherché: un ou deux caractères ne désignent aucune édition
+ISBN_FRAGMENT_MIN_LENGTH = 3
 
 
 class EditionMemoryRepository(IRepository[Edition]):
     """
     Repository en mémoire pour stocker les éditions de livres
     Utilise un dictionnaire {isbn: Edition}
+    et un index sur les mots de l'éditeur pour la recherche floue
     """
 
     def __init__(self) -> None:
         """Initialise le repository avec un dictionnaire vide"""
         self._editions: Dict[str, Edition] = {}
+        # Identifiants triés, pour la pagination par clé
+        self._ids: List[str] = []
+        # Index secondaire {work_id: {isbn: Edition}}, pour les éditions d'une œuvre
+        self._by_work: Dict[str, Dict[str, Edition]] = {}
+        # work_id sous lequel chaque édition est indexée: l'édition peut avoir été modifiée en place depuis
+        self._indexed_work: Dict[str, Optional[str]] = {}
+        self._index = U_NgramIndex()
+        self._journal: UndoJournal[Edition] = UndoJournal(self._restore)
 
     def get_by_id(self, isbn: str) -> Optional[Edition]:
         """
@@ -30,6 +50,24 @@ class EditionMemoryRepository(IRepository[Edition]):
         """
         return self._editions.get(isbn)
 
+    def get_many(self, isbns: Iterable[str], defer: Iterable[str] = ()) -> Dict[str, Edition]:
+        """
+        Récupère plusieurs éditions en une seule passe
+
+        Args:
+            isbns: Les identifiants des éditions
+            defer: Sans effet (les champs sont déjà en mémoire)
+
+        Returns:
+            Dictionnaire {isbn: Edition}, sans les identifiants introuvables
+        """
+        found = {}
+        for isbn in isbns:
+            edition = self._editions.get(isbn)
+            if edition is not None:
+                found[isbn] = edition
+        return found
+
     def get_all(self) -> List[Edition]:
         """
         Récupère toutes les éditions
@@ -39,6 +77,78 @@ class EditionMemoryRepository(IRepository[Edition]):
         """
         return list(self._editions.values())
 
+    def count(self) -> int:
+        """
+        Compte les éditions
+
+        Returns:
+            Nombre d'éditions
+        """
+        return len(self._editions)
+
+    def count_by_format(self) -> Dict[Optional[BookFormat], int]:
+        """
+        Compte les éditions par format
+
+        Returns:
+            Dictionnaire {format: nombre}, None pour les éditions sans format
+        """
+        return dict(Counter(edition.format for edition in self._editions.values()))
+
+    def count_works(self) -> int:
+        """
+        Compte les œuvres ayant au moins une édition (via l'index par work_id)
+
+        Returns:
+            Nombre de work_id distincts
+        """
+        return sum(1 for work_id in self._by_work if work_id)
+
+    def count_works_without_editions(self, work_ids: Iterable[str]) -> int:
+        """
+        Compte, parmi les œuvres du catalogue, celles qui n'ont aucune édition
+
+        Une édition orpheline (work_id sans œuvre) ne change pas le résultat.
+
+        Args:
+            work_ids: Identifiants des œuvres du catalogue
+
+        Returns:
+            Nombre d'œuvres absentes de l'index par work_id
+        """
+        return sum(1 for work_id in work_ids if work_id not in self._by_work)
+
+    def page(self, after_key: Optional[str] = None, limit: int = 50, defer: Iterable[str] = ()) -> List[Edition]:
+        """
+        Récupère une page d'éditions, triées par isbn
+
+        Args:
+            after_key: isbn de la dernière édition de la page précédente (None: première page)
+            limit: Nombre maximal d'éditions
+            defer: Sans effet (les champs sont déjà en mémoire)
+
+        Returns:
+            Liste des éditions suivant after_key
+        """
+        start = 0 if after_key is None else bisect_right(self._ids, after_key)
+        return [self._editions[isbn] for isbn in self._ids[start:start + limit]]
+
+    def iter_all(
+        self, batch_size: int = 500, after: Optional[str] = None, defer: Iterable[str] = ()
+    ) -> Iterator[Edition]:
+        """
+        Parcourt toutes les éditions par paquets, triées par isbn
+
+        Args:
+            batch_size: Nombre d'éditions par paquet
+            after: Reprendre le parcours après ce isbn
+            defer: Sans effet (les champs sont déjà en mémoire)
+
+        Returns:
+            Itérateur sur les éditions
+        """
+        return iter_pages(self.page, lambda edition: edition.isbn, batch_size, after)
+
     def add(self, edition: Edition) -> bool:
         """
         Ajoute une nouvelle édition
@@ -52,7 +162,12 @@ class EditionMemoryRepository(IRepository[Edition]):
         if edition.isbn in self._editions:
             return False
 
+        self._journal.remember(edition.isbn, None)
+        edition.mark_created(datetime.now())
         self._editions[edition.isbn] = edition
+        insort(self._ids, edition.isbn)
+        self._index_work(edition)
+        self._index.add(edition.isbn, self._searchable_text(edition))
         return True
 
     def update(self, edition: Edition) -> bool:
@@ -68,7 +183,11 @@ class EditionMemoryRepository(IRepository[Edition]):
         if edition.isbn not in self._editions:
             return False
 
+        self._journal.remember(edition.isbn, self._editions[edition.isbn])
+        self._unindex_work(edition.isbn)
         self._editions[edition.isbn] = edition
+        self._index_work(edition)
+        self._index.add(edition.isbn, self._searchable_text(edition))
         return True
 
     def delete(self, isbn: str) -> bool:
@@ -84,13 +203,100 @@ class EditionMemoryRepository(IRepository[Edition]):
         if isbn not in self._editions:
             return False
 
+        self._journal.remember(isbn, self._editions[isbn])
         del self._editions[isbn]
+        self._unindex_work(isbn)
+        del self._ids[bisect_left(self._ids, isbn)]
+        self._index.remove(isbn)
         return True
 
+    def add_many(self, editions: Iterable[Edition]) -> List[str]:
+        """
+        Ajoute plusieurs éditions
+
+        Args:
+            editions: Les éditions à ajouter
+
+        Returns:
+            Liste des isbn déjà existants (non ajoutés)
+        """
+        return [edition.isbn for edition in editions if not self.add(edition)]
+
+    def update_many(self, editions: Iterable[Edition]) -> List[str]:
+        """
+        Met à jour plusieurs éditions
+
+        Args:
+            editions: Les éditions avec les nouvelles données
+
+        Returns:
+            Liste des isbn inexistants (non mis à jour)
+        """
+        return [edition.isbn for edition in editions if not self.update(edition)]
+
+    def delete_many(self, isbns: Iterable[str]) -> List[str]:
+        """
+        Supprime plusieurs éditions
+
+        Args:
+            isbns: Les identifiants des éditions à supprimer
+
+        Returns:
+            Liste des isbn inexistants
+        """
+        return [isbn for isbn in isbns if not self.delete(isbn)]
+
+    def transaction(self) -> ContextManager[None]:
+        """
+        Unité de travail: les modifications du bloc sont annulées si une exception en sort
+
+        Returns:
+            Un context manager (with repository.transaction(): ...)
+        """
+        return self._journal.transaction()
+
+    def _restore(self, isbn: str, edition: Optional[Edition]) -> None:
+        """Remet une édition (ou son absence) et les index dans l'état d'avant la transaction"""
+        position = bisect_left(self._ids, isbn)
+        present = position < len(self._ids) and self._ids[position] == isbn
+        if present:
+            self._unindex_work(isbn)
+        if edition is None:
+            self._editions.pop(isbn, None)
+            self._index.remove(isbn)
+            if present:
+                del self._ids[position]
+        else:
+            self._editions[isbn] = edition
+            self._index_work(edition)
+            self._index.add(isbn, self._searchable_text(edition))
+            if not present:
+                self._ids.insert(position, isbn)
+
+    def _index_work(self, edition: Edition) -> None:
+        """Ajoute une édition à l'index par work_id"""
+        self._by_work.setdefault(edition.work_id, {})[edition.isbn] = edition
+        self._indexed_work[edition.isbn] = edition.work_id
+
+    def _unindex_work(self, isbn: str) -> None:
+        """Retire une édition de l'index, sous le work_id où elle a été indexée"""
+        if isbn not in self._indexed_work:
+            return
+        work_id = self._indexed_work.pop(isbn)
+        bucket = self._by_work.get(work_id)
+        if bucket is not None:
+            bucket.pop(isbn, None)
+            if not bucket:
+                del self._by_work[work_id]
+
     def search(self, query: str) -> List[Edition]:
         """
         Recherche des éditions par ISBN ou éditeur
 
+        Une édition correspond si la requête est un fragment de son ISBN (au moins
+        ISBN_FRAGMENT_MIN_LENGTH caractères), ou si chaque mot de la requête apparaît
+        dans l'éditeur, aux fautes de frappe près (recherche floue des œuvres).
+
         Args:
             query: La requête de recherche
 
@@ -100,21 +306,54 @@ class EditionMemoryRepository(IRepository[Edition]):
         if not query.strip():
             return []
 
-        query_normalized = U_String(query).remove_diacritics().lower()
+        return list(self._matches(query))
 
-        results = []
-        for edition in self._editions.values():
-            # Recherche par ISBN (partiel)
-            if query_normalized in edition.isbn.lower():
-                results.append(edition)
-                continue
+    def search_ranked(self, query: str, limit: int = 20) -> List[Tuple[Edition, float]]:
+        """
+        Recherche des éditions classées par pertinence
+
+        Le score favorise un ISBN exact ou commençant par la requête,
+        puis la qualité de correspondance avec l'éditeur.
 
-            # Recherche par éditeur
-            if edition.publisher and query_normalized in U_String(edition.publisher).remove_diacritics().lower():
-                results.append(edition)
-                continue
+        Args:
+            query: La requête de recherche
+            limit: Nombre maximal de résultats
+
+        Returns:
+            Liste de couples (édition, score), du plus au moins pertinent
+        """
+        if not query.strip():
+            return []
 
-        return results
+        scored = ((edition, score_edition(edition, query)) for edition in self._matches(query))
+        return top_k(scored, limit)
+
+    def _matches(self, query: str) -> Iterator[Edition]:
+        """Parcourt les éditions correspondant à la requête (fragment d'ISBN, éditeur aux fautes près)"""
+        # Requête compilée une fois: seuls les éditeurs des candidats restent à comparer
+        compiled = U_FuzzyQuery.compile(query)
+        fragment = compiled.text if len(compiled.text) >= ISBN_FRAGMENT_MIN_LENGTH else None
+        candidates = self._candidates(compiled.words)
+        for isbn, edition in self._editions.items():
+            if fragment is not None and fragment in isbn.lower():
+                yield edition
+            elif isbn in candidates and compiled.matches(edition.publisher_normalized or ""):
+                yield edition
+
+    def _candidates(self, query_words: List[str]) -> Set[str]:
+        """ISBN des éditions dont l'éditeur peut correspondre (index, avant tout calcul de Levenshtein)"""
+        candidates: Set[str] = set()
+        for position, word in enumerate(query_words):
+            word_candidates = self._index.candidates(word)
+            candidates = word_candidates if position == 0 else candidates & word_candidates
+            if not candidates:
+                break
+        return candidates
+
+    @staticmethod
+    def _searchable_text(edition: Edition) -> str:
+        """Texte sur lequel porte la recherche floue: l'éditeur (l'ISBN est cherché par fragment)"""
+        return edition.publisher or ""
 
     def get_by_work_id(self, work_id: str) -> List[Edition]:
         """
@@ -126,10 +365,24 @@ class EditionMemoryRepository(IRepository[Edition]):
         Returns:
             Liste des éditions de cette œuvre
         """
-        return [
-            edition for edition in self._editions.values()
-            if edition.work_id == work_id
-        ]
+        return list(self._by_work.get(work_id, {}).values())
+
+    def get_by_work_ids(self, work_ids: Iterable[str]) -> Dict[str, List[Edition]]:
+        """
+        Récupère les éditions de plusieurs œuvres en une seule passe
+
+        Args:
+            work_ids: Les identifiants des œuvres
+
+        Returns:
+            Dictionnaire {work_id: éditions}, sans les œuvres sans édition
+        """
+        found = {}
+        for work_id in work_ids:
+            bucket = self._by_work.get(work_id)
+            if bucket:
+                found[work_id] = list(bucket.values())
+        return found
 
     def get_by_publisher(self, publisher: str) -> List[Edition]:
         """
@@ -141,10 +394,26 @@ class EditionMemoryRepository(IRepository[Edition]):
         Returns:
             Liste des éditions de cet éditeur
         """
-        publisher_normalized = U_String(publisher).remove_diacritics().lower()
+        publisher_normalized = U_String(publisher).normalize()
         return [
             edition for edition in self._editions.values()
-            if edition.publisher and U_String(edition.publisher).remove_diacritics().lower() == publisher_normalized
+            if edition.publisher and edition.publisher_normalized == publisher_normalized
+        ]
+
+    def get_by_collection(self, collection: str) -> List[Edition]:
+        """
+        Récupère toutes les éditions d'une collection
+
+        Args:
+            collection: Le nom de la collection
+
+        Returns:
+            Liste des éditions de cette collection
+        """
+        collection_normalized = U_String(collection).normalize()
+        return [
+            edition for edition in self._editions.values()
+            if edition.collection_normalized == collection_normalized
         ]
 
     def get_by_year(self, year: int) -> List[Edition]:
@@ -162,6 +431,18 @@ class EditionMemoryRepository(IRepository[Edition]):
             if edition.publication_year == year
         ]
 
+    def get_by_ean(self, ean: str) -> List[Edition]:
+        """
+        Récupère les éditions portant un code-barres EAN
+
+        Args:
+            ean: Le code-barres EAN
+
+        Returns:
+            Liste des éditions portant ce code
+        """
+        return [edition for edition in self._editions.values() if edition.ean == ean]
+
     def get_digital_editions(self) -> List[Edition]:
         """
         Récupère toutes les éditions numériques
@@ -0,0 +1,517 @@
+"""
+Migrations du schéma SQLite, suivies par PRAGMA user_version
+
+Chaque migration fait passer la base de la version N-1 à la version N.
+Elles sont appliquées dans l'ordre, toutes dans la même transaction: une base
+n'est jamais laissée à moitié migrée. Les migrations sont idempotentes, car les
+bases créées avant le versionnage (user_version = 0) ont déjà une partie du schéma.
+
+Pour faire évoluer le schéma, ajouter une fonction à la fin de MIGRATIONS
+(ne jamais modifier ni réordonner les migrations existantes).
+"""
+
+import sqlite3
+from typing import Callable, Dict, List, Tuple
+
+from services.search_index import create_search_index
+from unicorn.u_string import U_String
+
+# Champs multivalués des œuvres: table d'association -> attribut du modèle
+# (autrefois des colonnes TEXT de la table oeuvres, aux valeurs séparées par des virgules)
+OEUVRE_LISTS: Dict[str, str] = {
+    "oeuvre_co_authors": "co_authors",
+    "oeuvre_genres": "genres",
+    "oeuvre_themes": "themes",
+    "oeuvre_awards": "awards",
+}
+
+# Textes normalisés de la recherche floue, par table indexée: (clé, colonnes),
+# ceux que les repositories en mémoire comparent à la requête (l'ISBN est
+# cherché à part, par sous-chaîne: voir _create_fuzzy_indexes)
+SEARCH_TEXTS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "oeuvres": ("work_id", ("title_normalized", "author_normalized")),
+    "editions": ("isbn", ("publisher_normalized",)),
+}
+
+# Cache de pages pendant une migration (en Kio): les index sont construits
+# par tri, beaucoup plus vite quand il tient en mémoire
+_MIGRATION_CACHE_SIZE = -262144
+
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> List[str]:
+    """
+    Ajoute à une table existante les colonnes qui lui manquent
+
+    Args:
+        conn: Connexion SQLite
+        table: Nom de la table
+        columns: Dictionnaire {nom de colonne: type SQL}
+
+    Returns:
+        Liste des colonnes ajoutées
+    """
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    added = []
+    for name, sql_type in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}")
+            added.append(name)
+    return added
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    """Vérifie si une table (ou table virtuelle) existe"""
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def _create_fts(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: Tuple[str, ...],
+    content_rowid: str = "rowid",
+    suffix: str = "fts",
+    tokenize: str = "unicode61 remove_diacritics 2"
+) -> None:
+    """
+    Crée l'index plein texte FTS5 d'une table, son vocabulaire et ses triggers
+
+    L'index est à contenu externe (content=table): seuls les termes sont stockés,
+    les triggers le tiennent à jour à chaque INSERT, UPDATE et DELETE.
+    Il est rempli à partir des lignes existantes lors de sa création.
+
+    Args:
+        conn: Connexion SQLite
+        table: Nom de la table indexée
+        columns: Colonnes indexées (dans l'ordre des poids bm25)
+        content_rowid: Colonne entière désignant les lignes dans l'index
+        suffix: Suffixe du nom de l'index ({table}_{suffix})
+        tokenize: Tokenizer FTS5 (le vocabulaire n'est créé que pour unicode61)
+    """
+    fts = f"{table}_{suffix}"
+    exists = _table_exists(conn, fts)
+
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {names},
+            content='{table}', content_rowid='{content_rowid}',
+            tokenize='{tokenize}'
+        )
+    """)
+    if tokenize.startswith("unicode61"):
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts}_vocab USING fts5vocab({fts}, 'row')")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {names}) VALUES (new.{content_rowid}, {new_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.{content_rowid}, {old_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {names} ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.{content_rowid}, {old_values});
+            INSERT INTO {fts}(rowid, {names}) VALUES (new.{content_rowid}, {new_values});
+        END
+    """)
+
+    if not exists:
+        conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+# Tables principales: (clé texte, colonnes, contraintes), après id INTEGER PRIMARY KEY
+# (clé entière désignant les lignes dans les index plein texte) et la clé texte UNIQUE
+_TABLES: Dict[str, Tuple[str, str, str]] = {
+    "oeuvres": ("work_id", """
+        title TEXT NOT NULL,
+        author TEXT NOT NULL,
+        original_language TEXT,
+        original_publication_year INTEGER,
+        summary TEXT,
+        series TEXT,
+        series_number INTEGER,
+        title_normalized TEXT,
+        author_normalized TEXT,
+        series_normalized TEXT
+    """, ""),
+    "editions": ("isbn", """
+        work_id TEXT,
+        publisher TEXT,
+        publication_year INTEGER,
+        language TEXT,
+        format TEXT,
+        pages INTEGER,
+        dimensions_height REAL,
+        dimensions_width REAL,
+        dimensions_thickness REAL,
+        weight INTEGER,
+        cover_front_url TEXT,
+        cover_back_url TEXT,
+        cover_spine_url TEXT,
+        cover_color TEXT,
+        price REAL,
+        currency TEXT,
+        ean TEXT,
+        edition_number INTEGER,
+        collection TEXT,
+        translator TEXT,
+        illustrator TEXT,
+        preface_by TEXT,
+        publisher_normalized TEXT,
+        collection_normalized TEXT
+    """, "FOREIGN KEY (work_id) REFERENCES oeuvres(work_id) ON DELETE CASCADE"),
+}
+
+
+def _create_table(conn: sqlite3.Connection, table: str, name: str = "") -> None:
+    """
+    Crée une table principale si elle n'existe pas (schéma de _TABLES)
+
+    Les index plein texte désignent les lignes par id (INTEGER PRIMARY KEY):
+    sans lui, ce serait le rowid implicite, qu'un VACUUM peut renuméroter.
+
+    Args:
+        conn: Connexion SQLite
+        table: Nom de la table dans _TABLES
+        name: Nom de la table créée (par défaut, table)
+    """
+    key, columns, constraints = _TABLES[table]
+    definitions = ["id INTEGER PRIMARY KEY", f"{key} TEXT NOT NULL UNIQUE", columns.strip()]
+    if constraints:
+        definitions.append(constraints)
+    body = ",\n".join(definitions)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {name or table} (\n{body}\n)")
+
+
+def _add_surrogate_key(conn: sqlite3.Connection, table: str) -> None:
+    """
+    Reconstruit avec la clé id une table créée avant le versionnage (clé texte seule)
+
+    L'ancien rowid devient id; les colonnes absentes du schéma (anciennes
+    colonnes texte des champs multivalués) sont conservées pour les migrations
+    suivantes, et les index recréés. Les clés étrangères doivent être
+    désactivées (voir migrate): supprimer l'ancienne table oeuvres supprimerait
+    sinon en cascade ses éditions.
+
+    Args:
+        conn: Connexion SQLite
+        table: Nom de la table dans _TABLES
+    """
+    existing = {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if "id" in existing:
+        return
+    indexes = [sql for (sql,) in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,)
+    )]
+    _create_table(conn, table, f"{table}_rebuilt")
+    _add_missing_columns(conn, f"{table}_rebuilt", existing)
+    names = ", ".join(existing)
+    conn.execute(f"INSERT INTO {table}_rebuilt (id, {names}) SELECT rowid, {names} FROM {table}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}_rebuilt RENAME TO {table}")
+    for sql in indexes:
+        conn.execute(sql)
+
+
+####################################################
+# Migrations (version = position dans MIGRATIONS)
+####################################################
+
+def _create_oeuvres(conn: sqlite3.Connection) -> None:
+    """Version 1: table oeuvres, colonnes normalisées et leurs index"""
+    _create_table(conn, "oeuvres")
+
+    # Bases existantes: ajouter puis remplir les colonnes normalisées,
+    # avant de créer les index (un seul tri au lieu d'une mise à jour par ligne)
+    added = _add_missing_columns(conn, "oeuvres", {
+        "title_normalized": "TEXT",
+        "author_normalized": "TEXT",
+        "series_normalized": "TEXT",
+    })
+    if added:
+        conn.execute("""
+            UPDATE oeuvres SET
+                title_normalized = normalize(title),
+                author_normalized = normalize(author),
+                series_normalized = normalize(series)
+        """)
+    _add_surrogate_key(conn, "oeuvres")
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_oeuvres_author_normalized
+        ON oeuvres(author_normalized)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_oeuvres_series_normalized
+        ON oeuvres(series_normalized, series_number)
+    """)
+
+
+def _create_editions(conn: sqlite3.Connection) -> None:
+    """Version 2: table editions, colonnes normalisées et leurs index"""
+    _create_table(conn, "editions")
+
+    added = _add_missing_columns(conn, "editions", {
+        "publisher_normalized": "TEXT",
+        "collection_normalized": "TEXT",
+    })
+    if added:
+        conn.execute("""
+            UPDATE editions SET
+                publisher_normalized = normalize(COALESCE(publisher, '')),
+                collection_normalized = normalize(collection)
+        """)
+    _add_surrogate_key(conn, "editions")
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_editions_work_id
+        ON editions(work_id)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_editions_publisher_normalized
+        ON editions(publisher_normalized)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_editions_collection_normalized
+        ON editions(collection_normalized)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_editions_format
+        ON editions(format)
+    """)
+
+
+def _create_search_indexes(conn: sqlite3.Connection) -> None:
+    """Version 3: index plein texte des œuvres (titre, auteur) et des éditions (ISBN, éditeur)"""
+    _create_fts(conn, "oeuvres", ("title_normalized", "author_normalized"), content_rowid="id")
+    _create_fts(conn, "editions", ("isbn", "publisher_normalized"), content_rowid="id")
+
+
+def _create_oeuvre_lists(conn: sqlite3.Connection) -> None:
+    """Version 4: tables d'association des champs multivalués, reprise des anciennes colonnes texte"""
+    for table in OEUVRE_LISTS:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                work_id TEXT NOT NULL REFERENCES oeuvres(work_id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                value TEXT NOT NULL,
+                value_normalized TEXT NOT NULL,
+                PRIMARY KEY (work_id, position)
+            ) WITHOUT ROWID
+        """)
+        conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_{table}_value
+            ON {table}(value_normalized, work_id)
+        """)
+
+    # Bases existantes: déplacer les valeurs des anciennes colonnes texte
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(oeuvres)")}
+    legacy = [attribute for attribute in OEUVRE_LISTS.values() if attribute in columns]
+    if not legacy:
+        return
+    condition = " OR ".join(f"{column} IS NOT NULL" for column in legacy)
+    rows = conn.execute(
+        f"SELECT work_id, {', '.join(legacy)} FROM oeuvres WHERE {condition}"
+    ).fetchall()
+    for table, attribute in OEUVRE_LISTS.items():
+        if attribute not in legacy:
+            continue
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {table} (work_id, position, value, value_normalized) VALUES (?, ?, ?, ?)",
+            [
+                (row["work_id"], position, text, U_String(text).normalize())
+                for row in rows if row[attribute]
+                for position, text in enumerate(row[attribute].split(","))
+            ]
+        )
+    conn.execute(f"UPDATE oeuvres SET {', '.join(f'{column} = NULL' for column in legacy)} WHERE {condition}")
+
+
+def _import_livres(conn: sqlite3.Connection) -> None:
+    """
+    Version 5: reprise de l'ancienne table livres (une ligne par ISBN)
+
+    Les livres de même titre et même auteur (aux accents et à la casse près)
+    deviennent une seule œuvre, rattachée si elle existe déjà, et chaque livre
+    une édition de cette œuvre. Les ISBN déjà présents sont ignorés. La table
+    livres est conservée telle quelle.
+    """
+    if not _table_exists(conn, "livres"):
+        return
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(livres)")}
+    optional = [column for column in ("publisher", "publication_year", "summary") if column in columns]
+    select = ", ".join(["isbn", "title", "author"] + optional)
+
+    works: Dict[Tuple[str, str], str] = {}
+    oeuvres, editions = [], []
+    number = 0
+    # Trié par ISBN: les éditions sont insérées dans l'ordre de la clé primaire
+    for row in conn.execute(f"SELECT {select} FROM livres ORDER BY isbn").fetchall():
+        title, author = row["title"] or "", row["author"] or ""
+        key = (U_String(title).normalize(), U_String(author).normalize())
+        if key not in works:
+            existing = conn.execute(
+                "SELECT work_id FROM oeuvres WHERE title_normalized = ? AND author_normalized = ? LIMIT 1",
+                key
+            ).fetchone()
+            if existing:
+                works[key] = existing[0]
+            else:
+                number = _free_work_number(conn, number + 1)
+                works[key] = f"WORK-{number:06d}"
+                summary = row["summary"] if "summary" in optional else None
+                oeuvres.append((works[key], title, author, summary, key[0], key[1]))
+
+        publisher = row["publisher"] if "publisher" in optional else None
+        year = row["publication_year"] if "publication_year" in optional else None
+        editions.append((
+            row["isbn"], works[key], publisher or "", year, U_String(publisher or "").normalize()
+        ))
+
+    conn.executemany("""
+        INSERT INTO oeuvres (work_id, title, author, summary, title_normalized, author_normalized)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, oeuvres)
+    conn.executemany("""
+        INSERT OR IGNORE INTO editions (isbn, work_id, publisher, publication_year, publisher_normalized)
+        VALUES (?, ?, ?, ?, ?)
+    """, editions)
+
+
+def _free_work_number(conn: sqlite3.Connection, number: int) -> int:
+    """Premier numéro à partir de number dont l'identifiant WORK-NNNNNN est libre"""
+    while conn.execute("SELECT 1 FROM oeuvres WHERE work_id = ?", (f"WORK-{number:06d}",)).fetchone():
+        number += 1
+    return number
+
+
+def _create_access_path_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Version 6: index des chemins d'accès restants (tri par titre, éditions d'une
+    œuvre par année, recherche par année et par EAN)
+
+    idx_editions_work_id est remplacé par (work_id, publication_year DESC), qui
+    sert aussi les recherches sur work_id seul et évite le tri de get_by_work_id.
+    """
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_oeuvres_title ON oeuvres(title)")
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_editions_work_id_year
+        ON editions(work_id, publication_year DESC)
+    """)
+    conn.execute("DROP INDEX IF EXISTS idx_editions_work_id")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_editions_publication_year ON editions(publication_year)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_editions_ean ON editions(ean)")
+
+
+def _create_fuzzy_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Version 7: index de la recherche floue (sous-chaînes et fautes de frappe)
+
+    L'index unicode61 ne trouve que des débuts de mots: "rables" ne trouvait pas
+    "Les Misérables". Le vocabulaire des textes, ses n-grammes et ses variantes
+    par suppression (voir services.search_index) donnent à SQLite les mêmes
+    correspondances que la recherche en mémoire; un index trigram de l'ISBN seul
+    retrouve les fragments d'ISBN.
+    """
+    _create_fts(conn, "editions", ("isbn",), "id", "isbn", "trigram")
+    for table, (key, columns) in SEARCH_TEXTS.items():
+        create_search_index(conn, table, key, columns)
+
+
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _create_oeuvres,
+    _create_editions,
+    _create_search_indexes,
+    _create_oeuvre_lists,
+    _import_livres,
+    _create_access_path_indexes,
+    _create_fuzzy_indexes,
+]
+
+# Version du schéma attendue par le code
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """
+    Lit la version du schéma d'une base
+
+    Args:
+        conn: Connexion SQLite
+
+    Returns:
+        La valeur de PRAGMA user_version (0 pour une base jamais migrée)
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> List[int]:
+    """
+    Applique les migrations en attente, dans une seule transaction
+
+    Une base déjà à jour ne coûte qu'une lecture de user_version: aucun DDL
+    n'est exécuté. Sinon, la transaction est ouverte en écriture (BEGIN
+    IMMEDIATE) puis la version relue, pour que deux processus démarrant
+    ensemble n'appliquent pas deux fois la même migration. Les lecteurs
+    (mode WAL) continuent de voir l'ancien schéma jusqu'au commit.
+
+    migrate ouvre lui-même la transaction, clés étrangères désactivées
+    (reconstruction des tables créées avant le versionnage), puis la valide ou
+    l'annule et les réactive: il doit être appelé hors transaction.
+
+    Args:
+        conn: Connexion SQLite (avec la fonction SQL normalize)
+
+    Returns:
+        Numéros des migrations appliquées
+
+    Raises:
+        RuntimeError: Si la base a été créée par une version plus récente du code,
+            ou si une transaction est déjà ouverte sur la connexion
+    """
+    if schema_version(conn) == SCHEMA_VERSION:
+        return []
+
+    if conn.in_transaction:
+        raise RuntimeError("migrate doit être appelé hors transaction (valider ou annuler la transaction en cours)")
+
+    # Le pragma est sans effet dans une transaction: désactivé avant, rétabli après
+    foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    conn.execute("PRAGMA foreign_keys = OFF")
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        applied = _apply_migrations(conn)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute(f"PRAGMA foreign_keys = {foreign_keys}")
+    return applied
+
+
+def _apply_migrations(conn: sqlite3.Connection) -> List[int]:
+    """Relit la version dans la transaction ouverte, puis applique les migrations en attente"""
+    current = schema_version(conn)
+    if current > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Base en version {current}, plus récente que le code (version {SCHEMA_VERSION})"
+        )
+
+    cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+    conn.execute(f"PRAGMA cache_size = {min(cache_size, _MIGRATION_CACHE_SIZE)}")
+    try:
+        applied = []
+        for version in range(current + 1, SCHEMA_VERSION + 1):
+            MIGRATIONS[version - 1](conn)
+            applied.append(version)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    finally:
+        conn.execute(f"PRAGMA cache_size = {cache_size}")
+    return applied
@@ -2,21 +2,36 @@
 Repository en mémoire pour les Oeuvres
 """
 
-from typing import List, Optional, Dict
+from bisect import bisect_left, bisect_right, insort
+from typing import ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
 from models.oeuvre import Oeuvre
-from services.repository import IRepository
+from const.genre import Genre
+from services.repository import IRepository, iter_pages
 from unicorn.u_string import U_String
+from unicorn.u_ngram_index import U_NgramIndex
+from unicorn.u_fuzzy_query import U_FuzzyQuery
+from services.ranking import score_oeuvre, top_k
+from services.undo_journal import UndoJournal
 
 
 class OeuvreMemoryRepository(IRepository[Oeuvre]):
     """
     Repository en mémoire pour stocker les œuvres littéraires
     Utilise un dictionnaire {work_id: Oeuvre}
+    et un index de n-grammes sur le titre et l'auteur pour la recherche
+
+    Note:
+        L'index est mis à jour par add/update/delete: une œuvre modifiée
+        doit être repassée à update() pour que la recherche en tienne compte
     """
 
     def __init__(self) -> None:
         """Initialise le repository avec un dictionnaire vide"""
         self._oeuvres: Dict[str, Oeuvre] = {}
+        # Identifiants triés, pour la pagination par clé
+        self._ids: List[str] = []
+        self._index = U_NgramIndex()
+        self._journal: UndoJournal[Oeuvre] = UndoJournal(self._restore)
 
     def get_by_id(self, work_id: str) -> Optional[Oeuvre]:
         """
@@ -30,6 +45,24 @@ class OeuvreMemoryRepository(IRepository[Oeuvre]):
         """
         return self._oeuvres.get(work_id)
 
+    def get_many(self, work_ids: Iterable[str], defer: Iterable[str] = ()) -> Dict[str, Oeuvre]:
+        """
+        Récupère plusieurs œuvres en une seule passe
+
+        Args:
+            work_ids: Les identifiants des œuvres
+            defer: Sans effet (les champs sont déjà en mémoire)
+
+        Returns:
+            Dictionnaire {work_id: Oeuvre}, sans les identifiants introuvables
+        """
+        found = {}
+        for work_id in work_ids:
+            oeuvre = self._oeuvres.get(work_id)
+            if oeuvre is not None:
+                found[work_id] = oeuvre
+        return found
+
     def get_all(self) -> List[Oeuvre]:
         """
         Récupère toutes les œuvres
@@ -39,6 +72,46 @@ class OeuvreMemoryRepository(IRepository[Oeuvre]):
         """
         return list(self._oeuvres.values())
 
+    def count(self) -> int:
+        """
+        Compte les œuvres
+
+        Returns:
+            Nombre d'œuvres
+        """
+        return len(self._oeuvres)
+
+    def page(self, after_key: Optional[str] = None, limit: int = 50, defer: Iterable[str] = ()) -> List[Oeuvre]:
+        """
+        Récupère une page d'œuvres, triées par work_id
+
+        Args:
+            after_key: work_id de la dernière œuvre de la page précédente (None: première page)
+            limit: Nombre maximal d'œuvres
+            defer: Sans effet (les champs sont déjà en mémoire)
+
+        Returns:
+            Liste des œuvres suivant after_key
+        """
+        start = 0 if after_key is None else bisect_right(self._ids, after_key)
+        return [self._oeuvres[work_id] for work_id in self._ids[start:start + limit]]
+
+    def iter_all(
+        self, batch_size: int = 500, after: Optional[str] = None, defer: Iterable[str] = ()
+    ) -> Iterator[Oeuvre]:
+        """
+        Parcourt toutes les œuvres par paquets, triées par work_id
+
+        Args:
+            batch_size: Nombre d'œuvres par paquet
+            after: Reprendre le parcours après ce work_id
+            defer: Sans effet (les champs sont déjà en mémoire)
+
+        Returns:
+            Itérateur sur les œuvres
+        """
+        return iter_pages(self.page, lambda oeuvre: oeuvre.work_id, batch_size, after)
+
     def add(self, oeuvre: Oeuvre) -> bool:
         """
         Ajoute une nouvelle œuvre
@@ -52,7 +125,10 @@ class OeuvreMemoryRepository(IRepository[Oeuvre]):
         if oeuvre.work_id in self._oeuvres:
             return False
 
+        self._journal.remember(oeuvre.work_id, None)
         self._oeuvres[oeuvre.work_id] = oeuvre
+        insort(self._ids, oeuvre.work_id)
+        self._index.add(oeuvre.work_id, self._searchable_text(oeuvre))
         return True
 
     def update(self, oeuvre: Oeuvre) -> bool:
@@ -68,7 +144,9 @@ class OeuvreMemoryRepository(IRepository[Oeuvre]):
         if oeuvre.work_id not in self._oeuvres:
             return False
 
+        self._journal.remember(oeuvre.work_id, self._oeuvres[oeuvre.work_id])
         self._oeuvres[oeuvre.work_id] = oeuvre
+        self._index.add(oeuvre.work_id, self._searchable_text(oeuvre))
         return True
 
     def delete(self, work_id: str) -> bool:
@@ -84,9 +162,72 @@ class OeuvreMemoryRepository(IRepository[Oeuvre]):
         if work_id not in self._oeuvres:
             return False
 
+        self._journal.remember(work_id, self._oeuvres[work_id])
         del self._oeuvres[work_id]
+        del self._ids[bisect_left(self._ids, work_id)]
+        self._index.remove(work_id)
         return True
 
+    def add_many(self, oeuvres: Iterable[Oeuvre]) -> List[str]:
+        """
+        Ajoute plusieurs œuvres
+
+        Args:
+            oeuvres: Les œuvres à ajouter
+
+        Returns:
+            Liste des work_id déjà existants (non ajoutés)
+        """
+        return [oeuvre.work_id for oeuvre in oeuvres if not self.add(oeuvre)]
+
+    def update_many(self, oeuvres: Iterable[Oeuvre]) -> List[str]:
+        """
+        Met à jour plusieurs œuvres
+
+        Args:
+            oeuvres: Les œuvres avec les nouvelles données
+
+        Returns:
+            Liste des work_id inexistants (non mis à jour)
+        """
+        return [oeuvre.work_id for oeuvre in oeuvres if not self.update(oeuvre)]
+
+    def delete_many(self, work_ids: Iterable[str]) -> List[str]:
+        """
+        Supprime plusieurs œuvres
+
+        Args:
+            work_ids: Les identifiants des œuvres à supprimer
+
+        Returns:
+            Liste des work_id inexistants
+        """
+        return [work_id for work_id in work_ids if not self.delete(work_id)]
+
+    def transaction(self) -> ContextManager[None]:
+        """
+        Unité de travail: les modifications du bloc sont annulées si une exception en sort
+
+        Returns:
+            Un context manager (with repository.transaction(): ...)
+        """
+        return self._journal.transaction()
+
+    def _restore(self, work_id: str, oeuvre: Optional[Oeuvre]) -> None:
+        """Remet une œuvre (ou son absence) et les index dans l'état d'avant la transaction"""
+        position = bisect_left(self._ids, work_id)
+        present = position < len(self._ids) and self._ids[position] == work_id
+        if oeuvre is None:
+            self._oeuvres.pop(work_id, None)
+            self._index.remove(work_id)
+            if present:
+                del self._ids[position]
+        else:
+            self._oeuvres[work_id] = oeuvre
+            self._index.add(work_id, self._searchable_text(oeuvre))
+            if not present:
+                self._ids.insert(position, work_id)
+
     def search(self, query: str) -> List[Oeuvre]:
         """
         Recherche des œuvres par titre ou auteur (recherche floue)
@@ -100,15 +241,56 @@ class OeuvreMemoryRepository(IRepository[Oeuvre]):
         if not query.strip():
             return []
 
-        # Normaliser et diviser la requête en mots
-        query_words = [word for word in U_String(query).remove_diacritics().lower().split() if word]
+        # Requête compilée une fois: seuls les textes des candidats restent à comparer
+        compiled = U_FuzzyQuery.compile(query)
+        return [
+            oeuvre for oeuvre in self._candidates(compiled.words)
+            if compiled.matches(self._normalized_text(oeuvre))
+        ]
+
+    def search_ranked(self, query: str, limit: int = 20) -> List[Tuple[Oeuvre, float]]:
+        """
+        Recherche des œuvres classées par pertinence
+
+        Le score combine la qualité de correspondance (mot exact, début de mot,
+        sous-chaîne, floue) et le poids du champ (titre > auteur).
+
+        Args:
+            query: La requête de recherche
+            limit: Nombre maximal de résultats
 
-        def oeuvre_matches(oeuvre: Oeuvre) -> bool:
-            combined_text = U_String(f"{oeuvre.title} {oeuvre.author}")
-            # Une œuvre correspond si tous les mots de la requête correspondent (avec tolérance)
-            return all(combined_text.fuzzy_match(word) for word in query_words)
+        Returns:
+            Liste de couples (œuvre, score), du plus au moins pertinent
+        """
+        if not query.strip():
+            return []
 
-        return [oeuvre for oeuvre in self._oeuvres.values() if oeuvre_matches(oeuvre)]
+        query_words = U_FuzzyQuery.compile(query).words
+        scored = ((oeuvre, score_oeuvre(oeuvre, query_words)) for oeuvre in self._candidates(query_words))
+        return top_k(scored, limit)
+
+    def _candidates(self, query_words: List[str]) -> Iterator[Oeuvre]:
+        """Restreint aux candidats de l'index avant tout calcul de Levenshtein"""
+        candidates = None
+        for word in query_words:
+            word_candidates = self._index.candidates(word)
+            candidates = word_candidates if candidates is None else candidates & word_candidates
+            if not candidates:
+                return iter(())
+
+        if candidates is None:
+            return iter(self._oeuvres.values())
+        return (oeuvre for work_id, oeuvre in self._oeuvres.items() if work_id in candidates)
+
+    @staticmethod
+    def _searchable_text(oeuvre: Oeuvre) -> str:
+        """Texte sur lequel porte la recherche floue (titre + auteur)"""
+        return f"{oeuvre.title} {oeuvre.author}"
+
+    @staticmethod
+    def _normalized_text(oeuvre: Oeuvre) -> str:
+        """Texte de recherche déjà normalisé, à partir des champs calculés à l'écriture"""
+        return f"{oeuvre.title_normalized} {oeuvre.author_normalized}"
 
     def get_by_author(self, author: str) -> List[Oeuvre]:
         """
@@ -120,10 +302,10 @@ class OeuvreMemoryRepository(IRepository[Oeuvre]):
         Returns:
             Liste des œuvres de cet auteur
         """
-        author_normalized = U_String(author).remove_diacritics().lower()
+        author_normalized = U_String(author).normalize()
         return [
             oeuvre for oeuvre in self._oeuvres.values()
-            if U_String(oeuvre.author).remove_diacritics().lower() == author_normalized
+            if oeuvre.author_normalized == author_normalized
         ]
 
     def get_by_series(self, series: str) -> List[Oeuvre]:
@@ -136,9 +318,65 @@ class OeuvreMemoryRepository(IRepository[Oeuvre]):
         Returns:
             Liste des œuvres de cette série, triées par numéro
         """
-        series_normalized = U_String(series).remove_diacritics().lower()
+        series_normalized = U_String(series).normalize()
         oeuvres = [
             oeuvre for oeuvre in self._oeuvres.values()
-            if oeuvre.series and U_String(oeuvre.series).remove_diacritics().lower() == series_normalized
+            if oeuvre.series_normalized == series_normalized
         ]
         return sorted(oeuvres, key=lambda o: o.series_number or 0)
+
+    def get_by_genre(self, genre: Genre) -> List[Oeuvre]:
+        """
+        Récupère toutes les œuvres d'un genre
+
+        Args:
+            genre: Le genre littéraire
+
+        Returns:
+            Liste des œuvres de ce genre
+        """
+        return [oeuvre for oeuvre in self._oeuvres.values() if genre in oeuvre.values_of("genres")]
+
+    def get_by_theme(self, theme: str) -> List[Oeuvre]:
+        """
+        Récupère toutes les œuvres abordant un thème
+
+        Args:
+            theme: Le thème (insensible aux accents et à la casse)
+
+        Returns:
+            Liste des œuvres abordant ce thème
+        """
+        return self._get_by_list_value("themes", theme)
+
+    def get_by_award(self, award: str) -> List[Oeuvre]:
+        """
+        Récupère toutes les œuvres ayant reçu un prix
+
+        Args:
+            award: Le prix littéraire (insensible aux accents et à la casse)
+
+        Returns:
+            Liste des œuvres ayant reçu ce prix
+        """
+        return self._get_by_list_value("awards", award)
+
+    def get_by_co_author(self, co_author: str) -> List[Oeuvre]:
+        """
+        Récupère toutes les œuvres d'un co-auteur
+
+        Args:
+            co_author: Le nom du co-auteur (insensible aux accents et à la casse)
+
+        Returns:
+            Liste des œuvres de ce co-auteur
+        """
+        return self._get_by_list_value("co_authors", co_author)
+
+    def _get_by_list_value(self, attribute: str, value: str) -> List[Oeuvre]:
+        """Récupère les œuvres dont un champ multivalué contient la valeur (forme normalisée)"""
+        value_normalized = U_String(value).normalize()
+        return [
+            oeuvre for oeuvre in self._oeuvres.values()
+            if any(U_String(item).normalize() == value_normalized for item in oeuvre.values_of(attribute))
+        ]
@@ -0,0 +1,77 @@
+"""
+Classement des résultats de recherche par pertinence
+"""
+
+import heapq
+from operator import itemgetter
+from typing import Iterable, List, Sequence, Tuple, TypeVar
+
+from unicorn.u_string import U_String
+
+T = TypeVar('T')
+
+
+def score_fields(words: Sequence[str], fields: Iterable[Tuple[str, float]]) -> float:
+    """
+    Calcule le score de pertinence d'une entité pour une requête
+
+    Pour chaque mot de la requête, on retient la meilleure correspondance
+    (U_String.match_score) pondérée par le poids du champ, puis on additionne.
+
+    Args:
+        words: Les mots de la requête
+        fields: Couples (texte du champ, poids du champ)
+
+    Returns:
+        Le score total, ou 0.0 si un mot ne correspond à aucun champ
+    """
+    fields = [(U_String(text), weight) for text, weight in fields if text]
+    total = 0.0
+    for word in words:
+        best = max((text.match_score(word) * weight for text, weight in fields), default=0.0)
+        if best <= 0.0:
+            return 0.0
+        total += best
+    return total
+
+
+def top_k(scored: Iterable[Tuple[T, float]], limit: int) -> List[Tuple[T, float]]:
+    """
+    Retourne les meilleurs résultats, du plus au moins pertinent
+
+    Utilise un tas borné à limit éléments: l'ensemble des correspondances
+    n'est jamais matérialisé ni trié en entier. À score égal, l'ordre
+    d'arrivée est conservé.
+
+    Args:
+        scored: Couples (entité, score) produits au fil de l'eau
+        limit: Nombre maximal de résultats
+
+    Returns:
+        Liste de couples (entité, score) triée par score décroissant
+    """
+    if limit <= 0:
+        return []
+    return heapq.nlargest(limit, (pair for pair in scored if pair[1] > 0.0), key=itemgetter(1))
+
+
+# Poids des champs dans le score de pertinence
+TITLE_WEIGHT = 2.0
+AUTHOR_WEIGHT = 1.0
+ISBN_WEIGHT = 2.0
+PUBLISHER_WEIGHT = 1.0
+
+
+def score_oeuvre(oeuvre, words: Sequence[str]) -> float:
+    """Score de pertinence d'une œuvre: titre et auteur pondérés"""
+    return score_fields(words, [(oeuvre.title, TITLE_WEIGHT), (oeuvre.author, AUTHOR_WEIGHT)])
+
+
+def score_edition(edition, query: str) -> float:
+    """Score de pertinence d'une édition: ISBN (s'il contient la requête) ou éditeur"""
+    query_normalized = U_String(query).normalize()
+    isbn_score = 0.0
+    if query_normalized and query_normalized in edition.isbn.lower():
+        isbn_score = U_String(edition.isbn).match_score(query_normalized) * ISBN_WEIGHT
+    publisher_score = score_fields(query_normalized.split(), [(edition.publisher, PUBLISHER_WEIGHT)])
+    return max(isbn_score, publisher_score)
@@ -4,7 +4,7 @@ Permet d'abstraire la couche de persistance des données
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, TypeVar, Generic
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Generic
 
 T = TypeVar('T')
 
@@ -28,6 +28,21 @@ class IRepository(ABC, Generic[T]):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, entity_ids: Iterable[str], defer: Iterable[str] = ()) -> Dict[str, T]:
+        """
+        Récupère plusieurs entités en une seule opération
+
+        Args:
+            entity_ids: Les identifiants des entités (les doublons sont ignorés)
+            defer: Champs volumineux à ne charger qu'à leur première lecture
+                (voir models.deferred; sans effet pour un repository en mémoire)
+
+        Returns:
+            Dictionnaire {identifiant: entité}, sans les identifiants introuvables
+        """
+        pass
+
     @abstractmethod
     def get_all(self) -> List[T]:
         """
@@ -38,6 +53,47 @@ class IRepository(ABC, Generic[T]):
         """
         pass
 
+    @abstractmethod
+    def count(self) -> int:
+        """
+        Compte les entités sans les charger
+
+        Returns:
+            Nombre d'entités
+        """
+        pass
+
+    @abstractmethod
+    def page(self, after_key: Optional[str] = None, limit: int = 50, defer: Iterable[str] = ()) -> List[T]:
+        """
+        Récupère une page d'entités, triées par identifiant (pagination par clé)
+
+        Args:
+            after_key: Identifiant de la dernière entité de la page précédente
+                (None pour la première page)
+            limit: Nombre maximal d'entités
+            defer: Champs volumineux à ne charger qu'à leur première lecture
+
+        Returns:
+            Liste des entités dont l'identifiant suit after_key
+        """
+        pass
+
+    @abstractmethod
+    def iter_all(self, batch_size: int = 500, after: Optional[str] = None, defer: Iterable[str] = ()) -> Iterator[T]:
+        """
+        Parcourt toutes les entités par paquets, en mémoire constante
+
+        Args:
+            batch_size: Nombre d'entités chargées à la fois
+            after: Reprendre le parcours après cet identifiant
+            defer: Champs volumineux à ne charger qu'à leur première lecture
+
+        Returns:
+            Itérateur sur les entités, triées par identifiant
+        """
+        pass
+
     @abstractmethod
     def add(self, entity: T) -> bool:
         """
@@ -77,6 +133,48 @@ class IRepository(ABC, Generic[T]):
         """
         pass
 
+    @abstractmethod
+    def add_many(self, entities: Iterable[T]) -> List[str]:
+        """
+        Ajoute plusieurs entités en une seule opération
+
+        Une entité refusée (ID déjà existant, contrainte d'intégrité)
+        n'empêche pas l'ajout des autres.
+
+        Args:
+            entities: Les entités à ajouter
+
+        Returns:
+            Identifiants des entités qui n'ont pas pu être ajoutées
+        """
+        pass
+
+    @abstractmethod
+    def update_many(self, entities: Iterable[T]) -> List[str]:
+        """
+        Met à jour plusieurs entités en une seule opération
+
+        Args:
+            entities: Les entités avec les nouvelles données
+
+        Returns:
+            Identifiants des entités absentes ou refusées
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, entity_ids: Iterable[str]) -> List[str]:
+        """
+        Supprime plusieurs entités en une seule opération
+
+        Args:
+            entity_ids: Les identifiants des entités à supprimer
+
+        Returns:
+            Identifiants des entités absentes
+        """
+        pass
+
     @abstractmethod
     def search(self, query: str) -> List[T]:
         """
@@ -89,3 +187,62 @@ class IRepository(ABC, Generic[T]):
             Liste des entités correspondantes
         """
         pass
+
+    @abstractmethod
+    def search_ranked(self, query: str, limit: int = 20) -> List[Tuple[T, float]]:
+        """
+        Recherche des entités classées par pertinence
+
+        Args:
+            query: La requête de recherche
+            limit: Nombre maximal de résultats
+
+        Returns:
+            Liste de couples (entité, score), du plus au moins pertinent
+        """
+        pass
+
+    @abstractmethod
+    def transaction(self) -> ContextManager[None]:
+        """
+        Regroupe plusieurs opérations en une unité de travail atomique
+
+        Toutes les écritures faites dans le bloc sont validées ensemble à la
+        sortie, ou annulées ensemble si une exception s'en échappe. Les blocs
+        imbriqués font partie de la transaction la plus externe.
+
+        Returns:
+            Un context manager (with repository.transaction(): ...)
+        """
+        pass
+
+
+def iter_pages(
+    page: Callable[[Optional[str], int], List[T]],
+    key: Callable[[T], str],
+    batch_size: int,
+    after: Optional[str] = None
+) -> Iterator[T]:
+    """
+    Parcourt un repository page par page (implémentation commune de iter_all)
+
+    Chaque page reprend après la clé de la dernière entité lue: le parcours
+    reste correct si des entités sont ajoutées ou supprimées entre deux pages.
+
+    Args:
+        page: Méthode page(after_key, limit) du repository
+        key: Fonction donnant l'identifiant d'une entité
+        batch_size: Nombre d'entités par page
+        after: Identifiant après lequel commencer
+
+    Returns:
+        Itérateur sur les entités
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size doit être positif")
+    while True:
+        batch = page(after, batch_size)
+        yield from batch
+        if len(batch) < batch_size:
+            return
+        after = key(batch[-1])
@@ -0,0 +1,268 @@
+"""
+Index de la recherche floue SQLite: vocabulaire, n-grammes et variantes par suppression
+
+Les repositories en mémoire tolèrent les fautes de frappe grâce à U_NgramIndex.
+Côté SQLite, les mêmes trois niveaux sont persistants, par table indexée:
+- {table}_postings (word, key): mot normalisé -> clés des lignes qui le contiennent
+- {table}_grams (gram, word): n-gramme (1 à 3 caractères) -> mots du vocabulaire
+- {table}_typos (variant, word): variante (le mot privé de 0 à 2 caractères) -> mots
+  du vocabulaire contenant une lettre (les nombres et ISBN n'y entrent pas)
+
+Une requête ne lit que le vocabulaire: les mots candidats (sous-chaîne, fautes
+de frappe, moitiés du mot) sont vérifiés un à un par U_FuzzyTerm, puis les
+lignes sont retrouvées par les postings. Aucun mot de requête, même court,
+ne parcourt la table.
+
+Les postings sont tenus à jour à l'écriture par les repositories (index_documents)
+et à la suppression par trigger. Quand plus aucune ligne ne contient un mot,
+un trigger retire ses n-grammes et ses variantes: les tables suivent le vocabulaire
+vivant, pas l'historique des écritures.
+"""
+
+import re
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from unicorn.u_fuzzy_term import U_FuzzyTerm
+from unicorn.u_string import U_String
+from unicorn.u_symspell import U_SymSpell
+
+# Mots d'une saisie libre, découpés comme le tokenizer unicode61
+FTS_WORD = re.compile(r"[^\W_]+")
+
+# Nombre de suppressions précalculées (distance tolérée au-delà de 4 lettres)
+MAX_DISTANCE = 2
+
+# Longueur maximale des n-grammes indexés (trigrammes)
+_MAX_GRAM_LENGTH = 3
+
+# Nombre de valeurs par requête IN (sous la limite historique de 999 paramètres)
+_CHUNK_SIZE = 500
+
+
+def search_words(*texts: Optional[str]) -> Set[str]:
+    """Mots (séparés par des espaces) des textes normalisés d'une ligne"""
+    words: Set[str] = set()
+    for text in texts:
+        if text:
+            words.update(text.split())
+    return words
+
+
+def create_search_index(conn: sqlite3.Connection, table: str, key: str, columns: Tuple[str, ...]) -> None:
+    """
+    Crée les tables de la recherche floue d'une table, leurs triggers, et les remplit
+
+    Args:
+        conn: Connexion SQLite
+        table: Nom de la table indexée
+        key: Clé texte de la table
+        columns: Colonnes des textes normalisés indexés
+    """
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table}_postings (
+            word TEXT NOT NULL,
+            key TEXT NOT NULL,
+            PRIMARY KEY (word, key)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_postings_key ON {table}_postings(key)")
+    for name, column in (("grams", "gram"), ("typos", "variant")):
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table}_{name} (
+                {column} TEXT NOT NULL,
+                word TEXT NOT NULL,
+                PRIMARY KEY ({column}, word)
+            ) WITHOUT ROWID
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{name}_word ON {table}_{name}(word)")
+
+    # Suppressions en cascade comprises: les triggers s'exécutent aussi pour elles
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_postings_delete AFTER DELETE ON {table} BEGIN
+            DELETE FROM {table}_postings WHERE key = old.{key};
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_postings_purge AFTER DELETE ON {table}_postings
+        WHEN NOT EXISTS (SELECT 1 FROM {table}_postings WHERE word = old.word) BEGIN
+            DELETE FROM {table}_grams WHERE word = old.word;
+            DELETE FROM {table}_typos WHERE word = old.word;
+        END
+    """)
+    rebuild_search_index(conn, table, key, columns)
+
+
+def rebuild_search_index(conn: sqlite3.Connection, table: str, key: str, columns: Tuple[str, ...]) -> None:
+    """Reconstruit les tables de la recherche floue à partir des lignes"""
+    conn.execute(f"DELETE FROM {table}_grams")
+    conn.execute(f"DELETE FROM {table}_typos")
+    conn.execute(f"DELETE FROM {table}_postings")
+    cursor = conn.execute(f"SELECT {key}, {', '.join(columns)} FROM {table}")
+    while True:
+        rows = cursor.fetchmany(_CHUNK_SIZE)
+        if not rows:
+            break
+        index_documents(conn, table, {row[0]: search_words(*row[1:]) for row in rows})
+
+
+def index_documents(conn: sqlite3.Connection, table: str, documents: Dict[str, Set[str]]) -> None:
+    """
+    Met à jour les postings des lignes écrites, et le vocabulaire de leurs mots
+
+    Seuls les mots qui changent sont écrits: les mots retirés d'une ligne perdent
+    leur posting (le trigger de purge fait le reste), les mots nouveaux dans la
+    table reçoivent leurs n-grammes et leurs variantes.
+
+    Args:
+        conn: Connexion SQLite (dans la transaction de l'écriture)
+        table: Nom de la table indexée
+        documents: Clé de chaque ligne écrite -> ses mots (search_words)
+    """
+    keys = list(documents)
+    for start in range(0, len(keys), _CHUNK_SIZE):
+        chunk = keys[start:start + _CHUNK_SIZE]
+        placeholders = ", ".join("?" * len(chunk))
+        previous: Dict[str, Set[str]] = {}
+        for word, key in conn.execute(
+            f"SELECT word, key FROM {table}_postings WHERE key IN ({placeholders})", chunk
+        ):
+            previous.setdefault(key, set()).add(word)
+
+        conn.executemany(
+            f"DELETE FROM {table}_postings WHERE word = ? AND key = ?",
+            [(word, key) for key in chunk for word in previous.get(key, set()) - documents[key]]
+        )
+        added = [(word, key) for key in chunk for word in documents[key] - previous.get(key, set())]
+        new_words = _unknown_words(conn, table, {word for word, _ in added})
+        conn.executemany(f"INSERT INTO {table}_postings (word, key) VALUES (?, ?)", added)
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {table}_grams (gram, word) VALUES (?, ?)",
+            ((gram, word) for word in new_words for gram in _grams_of(word))
+        )
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {table}_typos (variant, word) VALUES (?, ?)",
+            (
+                (variant, word)
+                for word in new_words if U_FuzzyTerm.typo_tolerant(word)
+                for variant in U_SymSpell.variants(word, MAX_DISTANCE)
+            )
+        )
+
+
+def matching_keys(conn: sqlite3.Connection, table: str, words: List[str]) -> Set[str]:
+    """
+    Retourne les clés des lignes dont les mots correspondent à tous les mots de requête
+
+    Le résultat est exact (U_FuzzyTerm sur chaque mot du document): mêmes
+    correspondances que U_FuzzyQuery.matches sur le texte de la ligne.
+
+    Args:
+        conn: Connexion SQLite
+        table: Nom de la table indexée
+        words: Mots de la requête compilée
+
+    Returns:
+        Les clés des lignes correspondantes
+    """
+    keys: Optional[Set[str]] = None
+    for word in sorted(words, key=len, reverse=True):
+        if len(word) == 1:
+            # Une fenêtre d'un caractère est à une substitution de tout caractère
+            continue
+        found = _keys_of(conn, table, _matching_words(conn, table, word))
+        keys = found if keys is None else keys & found
+        if not keys:
+            return set()
+    if keys is None:
+        # Mots d'un caractère seulement: toute ligne ayant un mot correspond
+        keys = {key for (key,) in conn.execute(f"SELECT DISTINCT key FROM {table}_postings")}
+    return keys
+
+
+def typo_words(conn: sqlite3.Connection, table: str, word: str) -> List[str]:
+    """
+    Retourne les mots indexés à distance de Levenshtein tolérée d'un mot de requête
+
+    La distance tolérée est celle de la recherche floue: 1 jusqu'à 4 lettres, 2 au-delà.
+
+    Args:
+        conn: Connexion SQLite
+        table: Nom de la table indexée
+        word: Mot de requête normalisé (éventuellement mal orthographié)
+
+    Returns:
+        Les mots proches, triés
+    """
+    threshold = 1 if len(word) <= 4 else 2
+    candidates = _select_words(conn, table, "typos", "variant", U_SymSpell.variants(word, threshold))
+    query = U_String(word)
+    return sorted(candidate for candidate in candidates if query.levenshtein_within(candidate, threshold))
+
+
+def _matching_words(conn: sqlite3.Connection, table: str, word: str) -> Set[str]:
+    """
+    Retourne les mots du vocabulaire auxquels correspond un mot de requête
+
+    Candidats, comme U_NgramIndex.candidates: mots contenant le motif (ou son
+    préfixe), mots proches (variantes), mots contenant l'une des deux moitiés
+    (fenêtre à une substitution près); puis vérification exacte.
+    """
+    term = U_FuzzyTerm(word)
+    candidates = _words_containing(conn, table, term.prefix or word)
+    candidates.update(typo_words(conn, table, word))
+    middle = len(word) // 2
+    for piece in (word[:middle], word[middle:]):
+        candidates |= {
+            candidate for candidate in _words_containing(conn, table, piece)
+            if len(candidate) >= len(word)
+        }
+    return {candidate for candidate in candidates if term.matches(candidate)}
+
+
+def _words_containing(conn: sqlite3.Connection, table: str, piece: str) -> Set[str]:
+    """Retourne les mots du vocabulaire contenant le morceau (intersection des trigrammes au-delà de 3 caractères)"""
+    if len(piece) <= _MAX_GRAM_LENGTH:
+        return {word for (word,) in conn.execute(f"SELECT word FROM {table}_grams WHERE gram = ?", (piece,))}
+    grams = sorted({piece[i:i + _MAX_GRAM_LENGTH] for i in range(len(piece) - _MAX_GRAM_LENGTH + 1)})
+    query = " INTERSECT ".join([f"SELECT word FROM {table}_grams WHERE gram = ?"] * len(grams))
+    return {word for (word,) in conn.execute(query, grams) if piece in word}
+
+
+def _keys_of(conn: sqlite3.Connection, table: str, words: Iterable[str]) -> Set[str]:
+    """Retourne les clés des lignes contenant l'un des mots"""
+    return _select_words(conn, table, "postings", "word", words, "key")
+
+
+def _unknown_words(conn: sqlite3.Connection, table: str, words: Iterable[str]) -> Set[str]:
+    """Retourne les mots qu'aucune ligne ne contient encore (un seul posting lu par mot)"""
+    return {
+        word for word in words
+        if conn.execute(f"SELECT 1 FROM {table}_postings WHERE word = ? LIMIT 1", (word,)).fetchone() is None
+    }
+
+
+def _select_words(
+    conn: sqlite3.Connection, table: str, name: str, column: str, values: Iterable[str], selected: str = "word"
+) -> Set[str]:
+    """Lit une colonne de {table}_{name} pour les lignes dont column est dans values (par paquets IN)"""
+    values = list(values)
+    found: Set[str] = set()
+    for start in range(0, len(values), _CHUNK_SIZE):
+        chunk = values[start:start + _CHUNK_SIZE]
+        placeholders = ", ".join("?" * len(chunk))
+        found.update(
+            value for (value,) in conn.execute(
+                f"SELECT {selected} FROM {table}_{name} WHERE {column} IN ({placeholders})", chunk
+            )
+        )
+    return found
+
+
+def _grams_of(word: str) -> Set[str]:
+    """Retourne tous les n-grammes (1 à 3 caractères) d'un mot"""
+    return {
+        word[i:i + size]
+        for size in range(1, _MAX_GRAM_LENGTH + 1)
+        for i in range(len(word) - size + 1)
+    }
@@ -0,0 +1,480 @@
+"""
+Repository à deux niveaux: ensemble de travail en mémoire devant un repository durable (SQLite)
+
+Les lectures sont servies par un repository en mémoire chargé au démarrage.
+Les écritures y sont appliquées, ajoutées au journal d'écriture différée
+(WriteBehindJournal), puis acquittées; un thread reporte le journal dans le
+repository durable par lots.
+"""
+
+import os
+import pickle
+import struct
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from services.cached_repository import _entity_key
+from services.repository import IRepository
+
+T = TypeVar('T')
+
+
+# Niveaux de durabilité: ce qui est garanti quand une écriture est acquittée
+DURABILITY_LEVELS: Dict[str, str] = {
+    # Journal gardé en mémoire: un arrêt brutal perd les écritures pas encore reportées
+    "memory": "perdue si le processus s'arrête avant le report",
+    # Journal écrit dans le fichier (cache du système): survit à l'arrêt du processus
+    "journal": "survit à l'arrêt du processus",
+    # Journal écrit puis fsync: survit à une coupure de courant
+    "fsync": "survit à une coupure de courant",
+}
+
+DEFAULT_DURABILITY = "fsync"
+
+# En-tête d'un enregistrement du fichier journal: longueur (octets) de l'enregistrement picklé
+_RECORD_HEADER = struct.Struct("<I")
+
+
+class WriteBehindJournal:
+    """
+    Journal d'écriture différée partagé par les repositories à deux niveaux
+
+    Chaque écriture acquittée est un enregistrement (repository, opération,
+    entités ou identifiants), picklé au moment de l'écriture: c'est un
+    instantané, indépendant des modifications ultérieures de l'entité.
+    Les enregistrements sont reportés dans les repositories durables dans leur
+    ordre d'écriture (une édition n'arrive pas avant son œuvre), les suites
+    d'opérations identiques étant regroupées en un add_many / update_many /
+    delete_many, le tout dans une seule transaction par report.
+
+    Le report est idempotent: un ajout déjà présent devient une mise à jour,
+    et inversement. Au démarrage, le fichier journal laissé par un arrêt
+    brutal est donc simplement rejoué. Un enregistrement tronqué en fin de
+    fichier (écriture interrompue) n'avait pas été acquitté et est ignoré.
+
+    Exemple:
+        journal = WriteBehindJournal(
+            {"oeuvres": OeuvreSQLiteRepository(db_path), "editions": EditionSQLiteRepository(db_path)},
+            "catalogue.journal", durability="fsync", flush_interval=1.0
+        )
+        biblio = Bibliotheque(
+            TieredRepository(OeuvreMemoryRepository(), journal, "oeuvres"),
+            TieredRepository(EditionMemoryRepository(), journal, "editions")
+        )
+        ...
+        journal.close()
+    """
+
+    def __init__(
+        self,
+        durables: Dict[str, IRepository],
+        path: Optional[str] = None,
+        durability: str = DEFAULT_DURABILITY,
+        flush_interval: Optional[float] = 1.0
+    ) -> None:
+        """
+        Ouvre le journal, rejoue les enregistrements en attente puis démarre le thread de report
+
+        Args:
+            durables: Repositories durables, par nom ({"oeuvres": ..., "editions": ...})
+            path: Fichier journal (obligatoire sauf en durabilité "memory")
+            durability: Niveau de durabilité des écritures acquittées (voir DURABILITY_LEVELS)
+            flush_interval: Secondes entre deux reports (None: pas de thread, appeler flush())
+
+        Raises:
+            ValueError: Si le niveau de durabilité est inconnu, le fichier manquant
+                ou l'intervalle non positif
+        """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(
+                f"Durabilité inconnue: {durability} (disponibles: {', '.join(DURABILITY_LEVELS)})"
+            )
+        if durability != "memory" and path is None:
+            raise ValueError(f"La durabilité {durability} demande un fichier journal")
+        if flush_interval is not None and flush_interval <= 0:
+            raise ValueError("flush_interval doit être positif")
+
+        self._durables = dict(durables)
+        self._path = path if durability != "memory" else None
+        self._durability = durability
+        self._lock = threading.Lock()
+        # Un seul report à la fois (thread de report, flush() explicite, fermeture)
+        self._flush_lock = threading.Lock()
+        self._local = threading.local()
+        self._pending: List[bytes] = []
+        # Enregistrements en cours de report (retirés de _pending, pas encore validés)
+        self._in_flight = 0
+        self._rejected: List[Tuple[str, str]] = []
+        self._last_error: Optional[BaseException] = None
+        self._file = None
+
+        if self._path is not None:
+            self._pending = self._read_records(self._path)
+            self._file = open(self._path, "ab")
+        # Rejouer ce que le dernier arrêt a laissé, avant que les repositories chargent leur état
+        self.flush()
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if flush_interval is not None:
+            self._thread = threading.Thread(
+                target=self._run, args=(flush_interval,), name="write-behind-flush", daemon=True
+            )
+            self._thread.start()
+
+    def durable(self, name: str) -> IRepository:
+        """Retourne le repository durable enregistré sous ce nom"""
+        return self._durables[name]
+
+    @property
+    def durability(self) -> str:
+        """Niveau de durabilité des écritures acquittées"""
+        return self._durability
+
+    @property
+    def pending(self) -> int:
+        """Nombre d'enregistrements acquittés pas encore reportés"""
+        with self._lock:
+            return len(self._pending) + self._in_flight
+
+    @property
+    def rejected(self) -> List[Tuple[str, str]]:
+        """Couples (repository, identifiant) refusés par le repository durable (contrainte d'intégrité)"""
+        with self._lock:
+            return list(self._rejected)
+
+    @property
+    def last_error(self) -> Optional[BaseException]:
+        """Dernière erreur du thread de report (les enregistrements sont gardés et réessayés)"""
+        return self._last_error
+
+    ####################################################
+    # Écriture
+    ####################################################
+
+    def append(self, name: str, operation: str, payload: list) -> None:
+        """
+        Ajoute un enregistrement au journal (acquitté au retour, selon le niveau de durabilité)
+
+        Dans une transaction, l'enregistrement n'est écrit qu'à la sortie du bloc le plus externe.
+
+        Args:
+            name: Nom du repository durable
+            operation: "add", "update" ou "delete"
+            payload: Entités (add, update) ou identifiants (delete)
+        """
+        if name not in self._durables:
+            raise KeyError(f"Aucun repository durable nommé {name}")
+        record = pickle.dumps((name, operation, payload), protocol=pickle.HIGHEST_PROTOCOL)
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is not None:
+            buffer.append(record)
+        else:
+            self._write([record])
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Regroupe les enregistrements du bloc: écrits ensemble à la sortie, oubliés en cas d'exception
+
+        Les blocs imbriqués (y compris ceux d'autres repositories du même
+        journal) font partie du plus externe.
+        """
+        outermost = getattr(self._local, "buffer", None) is None
+        if outermost:
+            self._local.buffer = []
+        try:
+            yield
+            if outermost and self._local.buffer:
+                self._write(self._local.buffer)
+        finally:
+            if outermost:
+                self._local.buffer = None
+
+    def _write(self, records: List[bytes]) -> None:
+        """Écrit des enregistrements dans le fichier (fsync selon la durabilité) puis les met en attente"""
+        with self._lock:
+            if self._file is not None:
+                self._file.write(b"".join(_RECORD_HEADER.pack(len(record)) + record for record in records))
+                self._file.flush()
+                if self._durability == "fsync":
+                    os.fsync(self._file.fileno())
+            self._pending.extend(records)
+
+    ####################################################
+    # Report dans les repositories durables
+    ####################################################
+
+    def flush(self) -> int:
+        """
+        Reporte tous les enregistrements en attente dans les repositories durables
+
+        Returns:
+            Nombre d'enregistrements reportés
+
+        Raises:
+            Exception: L'erreur du repository durable (les enregistrements restent en attente)
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending
+                self._pending = []
+                self._in_flight = len(batch)
+            if not batch:
+                return 0
+
+            try:
+                rejected = self._apply([pickle.loads(record) for record in batch])
+            except BaseException:
+                with self._lock:
+                    self._pending[:0] = batch
+                    self._in_flight = 0
+                raise
+
+            with self._lock:
+                self._in_flight = 0
+                self._rejected.extend(rejected)
+                self._compact()
+            return len(batch)
+
+    def close(self) -> None:
+        """Arrête le thread de report, reporte ce qui reste et ferme le fichier journal"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "WriteBehindJournal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _run(self, flush_interval: float) -> None:
+        """Boucle du thread de report"""
+        while not self._stop.wait(flush_interval):
+            try:
+                self.flush()
+                self._last_error = None
+            except Exception as error:
+                self._last_error = error
+
+    def _apply(self, records: List[Tuple[str, str, list]]) -> List[Tuple[str, str]]:
+        """Applique les enregistrements dans l'ordre, par suites de même opération, en une transaction"""
+        rejected: List[Tuple[str, str]] = []
+        with ExitStack() as stack:
+            for durable in self._durables.values():
+                stack.enter_context(durable.transaction())
+
+            start = 0
+            while start < len(records):
+                name, operation, _ = records[start]
+                end = start
+                payload: list = []
+                while end < len(records) and records[end][:2] == (name, operation):
+                    payload.extend(records[end][2])
+                    end += 1
+                rejected.extend((name, entity_id) for entity_id in self._apply_run(name, operation, payload))
+                start = end
+        return rejected
+
+    def _apply_run(self, name: str, operation: str, payload: list) -> List[str]:
+        """Applique une suite d'opérations identiques (ajout et mise à jour se replient l'un sur l'autre)"""
+        durable = self._durables[name]
+        if operation == "delete":
+            durable.delete_many(payload)
+            return []
+
+        if operation == "add":
+            first, second = durable.add_many, durable.update_many
+        else:
+            first, second = durable.update_many, durable.add_many
+        failed = set(first(payload))
+        if not failed:
+            return []
+        retry = [entity for entity in payload if _entity_key(entity) in failed]
+        return second(retry)
+
+    def _compact(self) -> None:
+        """Réduit le fichier journal aux enregistrements encore en attente (sous self._lock)"""
+        if self._file is None:
+            return
+        if not self._pending:
+            self._file.truncate(0)
+            return
+
+        temporary = f"{self._path}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(b"".join(_RECORD_HEADER.pack(len(record)) + record for record in self._pending))
+            file.flush()
+            os.fsync(file.fileno())
+        self._file.close()
+        os.replace(temporary, self._path)
+        self._file = open(self._path, "ab")
+
+    @staticmethod
+    def _read_records(path: str) -> List[bytes]:
+        """Lit les enregistrements complets d'un fichier journal (absent: aucun)"""
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return []
+
+        records = []
+        offset = 0
+        while offset + _RECORD_HEADER.size <= len(data):
+            (length,) = _RECORD_HEADER.unpack_from(data, offset)
+            end = offset + _RECORD_HEADER.size + length
+            if end > len(data):
+                break  # Enregistrement tronqué: jamais acquitté
+            records.append(data[offset + _RECORD_HEADER.size:end])
+            offset = end
+        return records
+
+
+class TieredRepository(IRepository[T]):
+    """
+    Repository à deux niveaux: lectures en mémoire, écritures différées vers un repository durable
+
+    Au démarrage, toutes les entités du repository durable sont chargées dans
+    le repository en mémoire: la recherche, la pagination et les comptages ont
+    besoin de l'ensemble complet. Chaque écriture est appliquée en mémoire,
+    ajoutée au journal puis acquittée; le report vers le repository durable se
+    fait en arrière-plan (voir WriteBehindJournal pour la durabilité).
+
+    Les méthodes propres au repository en mémoire (get_by_work_id,
+    count_by_format...) lui sont déléguées.
+
+    Note:
+        Seules les écritures passées par ce repository sont vues: le
+        repository durable ne doit pas être modifié par ailleurs.
+    """
+
+    def __init__(
+        self,
+        memory: IRepository[T],
+        journal: WriteBehindJournal,
+        name: str,
+        key: Callable[[T], str] = _entity_key
+    ) -> None:
+        """
+        Charge l'ensemble de travail depuis le repository durable
+
+        Args:
+            memory: Repository en mémoire vide (OeuvreMemoryRepository, EditionMemoryRepository)
+            journal: Journal d'écriture différée, déjà rejoué
+            name: Nom du repository durable dans le journal
+            key: Fonction donnant l'identifiant d'une entité
+        """
+        self._memory = memory
+        self._journal = journal
+        self._name = name
+        self._key = key
+        memory.add_many(journal.durable(name).iter_all())
+
+    def __getattr__(self, name: str) -> Any:
+        """Délègue les méthodes propres au repository en mémoire"""
+        if name == "_memory":
+            raise AttributeError(name)
+        return getattr(self._memory, name)
+
+    ####################################################
+    # Lectures (repository en mémoire)
+    ####################################################
+
+    def get_by_id(self, entity_id: str) -> Optional[T]:
+        """Récupère une entité (en mémoire)"""
+        return self._memory.get_by_id(entity_id)
+
+    def get_many(self, entity_ids: Iterable[str], defer: Iterable[str] = ()) -> Dict[str, T]:
+        """Récupère plusieurs entités (en mémoire, defer sans effet)"""
+        return self._memory.get_many(entity_ids, defer)
+
+    def get_all(self) -> List[T]:
+        """Récupère toutes les entités (en mémoire)"""
+        return self._memory.get_all()
+
+    def count(self) -> int:
+        """Compte les entités (en mémoire)"""
+        return self._memory.count()
+
+    def page(self, after_key: Optional[str] = None, limit: int = 50, defer: Iterable[str] = ()) -> List[T]:
+        """Récupère une page d'entités (en mémoire)"""
+        return self._memory.page(after_key, limit, defer)
+
+    def iter_all(self, batch_size: int = 500, after: Optional[str] = None, defer: Iterable[str] = ()) -> Iterator[T]:
+        """Parcourt toutes les entités (en mémoire)"""
+        return self._memory.iter_all(batch_size, after, defer)
+
+    def search(self, query: str) -> List[T]:
+        """Recherche des entités (index en mémoire)"""
+        return self._memory.search(query)
+
+    def search_ranked(self, query: str, limit: int = 20) -> List[Tuple[T, float]]:
+        """Recherche classée (index en mémoire)"""
+        return self._memory.search_ranked(query, limit)
+
+    ####################################################
+    # Écritures (mémoire puis journal)
+    ####################################################
+
+    def add(self, entity: T) -> bool:
+        """Ajoute une entité en mémoire et au journal"""
+        return not self.add_many([entity])
+
+    def update(self, entity: T) -> bool:
+        """Met à jour une entité en mémoire et au journal"""
+        return not self.update_many([entity])
+
+    def delete(self, entity_id: str) -> bool:
+        """Supprime une entité en mémoire et au journal"""
+        return not self.delete_many([entity_id])
+
+    def add_many(self, entities: Iterable[T]) -> List[str]:
+        """Ajoute des entités en mémoire, puis journalise celles qui ont été ajoutées"""
+        return self._write("add", self._memory.add_many, list(entities))
+
+    def update_many(self, entities: Iterable[T]) -> List[str]:
+        """Met à jour des entités en mémoire, puis journalise celles qui ont été mises à jour"""
+        return self._write("update", self._memory.update_many, list(entities))
+
+    def delete_many(self, entity_ids: Iterable[str]) -> List[str]:
+        """Supprime des entités en mémoire, puis journalise les suppressions"""
+        entity_ids = list(dict.fromkeys(entity_ids))
+        with self.transaction():
+            failed = self._memory.delete_many(entity_ids)
+            if len(failed) < len(entity_ids):
+                missing = set(failed)
+                self._journal.append(self._name, "delete", [i for i in entity_ids if i not in missing])
+        return failed
+
+    def _write(self, operation: str, write: Callable[[List[T]], List[str]], entities: List[T]) -> List[str]:
+        """Écrit en mémoire puis journalise les entités effectivement rangées (annulé si le journal échoue)"""
+        with self.transaction():
+            failed = write(entities)
+            # Une entité écrite est celle que le repository en mémoire contient désormais
+            written = list({
+                id(entity): entity for entity in entities
+                if self._memory.get_by_id(self._key(entity)) is entity
+            }.values())
+            if written:
+                self._journal.append(self._name, operation, written)
+        return failed
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Unité de travail: annulation en mémoire et enregistrements du journal écrits ensemble
+
+        Le journal est fermé avant la transaction en mémoire: si son écriture
+        échoue, les écritures en mémoire du bloc sont annulées.
+        """
+        with self._memory.transaction(), self._journal.transaction():
+            yield
@@ -0,0 +1,73 @@
+"""
+Journal d'annulation pour les transactions des repositories en mémoire
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Generic, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class UndoJournal(Generic[T]):
+    """
+    Journal d'annulation d'un repository en mémoire
+
+    Pendant une transaction, le repository signale chaque identifiant qu'il va
+    modifier avec l'entité qui s'y trouvait (ou None). Seule la première valeur
+    est gardée: c'est l'état d'avant la transaction. En cas d'exception, ces
+    états sont restaurés dans l'ordre inverse par la fonction restore du
+    repository, qui remet aussi ses index à jour.
+
+    La profondeur et les états notés sont propres à chaque thread (threading.local),
+    comme dans CachedRepository et ConnectionPool: la transaction d'un thread ne
+    journalise ni n'annule les écritures d'un autre.
+
+    Note:
+        Les entités sont gardées par référence: une entité modifiée en place
+        avant d'être passée à update() ne retrouve pas ses anciennes valeurs.
+        Il n'y a pas d'isolation: l'annulation restaure les identifiants notés
+        même si un autre thread les a modifiés entre-temps.
+    """
+
+    def __init__(self, restore: Callable[[str, Optional[T]], None]) -> None:
+        """
+        Initialise un journal vide
+
+        Args:
+            restore: Fonction remettant une entité (ou son absence si None) sous un identifiant
+        """
+        self._restore = restore
+        self._local = threading.local()
+
+    def remember(self, entity_id: str, previous: Optional[T]) -> None:
+        """
+        Note l'état d'un identifiant avant sa première modification dans la transaction
+
+        Args:
+            entity_id: L'identifiant modifié
+            previous: L'entité présente avant la modification (None si absente)
+        """
+        if getattr(self._local, "depth", 0):
+            before: Dict[str, Optional[T]] = self._local.before
+            if entity_id not in before:
+                before[entity_id] = previous
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Ouvre une transaction; les blocs imbriqués appartiennent au plus externe"""
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            self._local.before = {}
+        self._local.depth = depth + 1
+        try:
+            yield
+        except BaseException:
+            if depth == 0:
+                for entity_id, previous in reversed(list(self._local.before.items())):
+                    self._restore(entity_id, previous)
+            raise
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                self._local.before = {}
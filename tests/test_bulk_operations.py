@@ -0,0 +1,136 @@
+"""
+Tests pour les opérations en masse (add_many, update_many, delete_many)
+"""
+import pytest
+from models.oeuvre import Oeuvre
+from models.edition import Edition
+from services.oeuvre_repository import OeuvreMemoryRepository
+from services.edition_repository import EditionMemoryRepository
+from services.bibliotheque import Bibliotheque
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+
+
+def make_oeuvre(work_id, title="Titre"):
+    """Crée une œuvre de test"""
+    oeuvre = Oeuvre(work_id)
+    oeuvre.title = title
+    oeuvre.author = "Auteur"
+    return oeuvre
+
+
+def make_edition(isbn, work_id):
+    """Crée une édition de test"""
+    edition = Edition(isbn, work_id)
+    edition.publisher = "Gallimard"
+    return edition
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repositories(request, tmp_path):
+    """Fixture fournissant les repositories d'œuvres et d'éditions (mémoire et SQLite)"""
+    if request.param == "memory":
+        return OeuvreMemoryRepository(), EditionMemoryRepository()
+    db_path = str(tmp_path / "catalogue.db")
+    return OeuvreSQLiteRepository(db_path), EditionSQLiteRepository(db_path)
+
+
+class TestAddMany:
+    """Tests pour add_many"""
+
+    def test_reports_duplicates(self, repositories):
+        """Les doublons sont signalés sans empêcher les autres ajouts"""
+        oeuvres, _ = repositories
+        oeuvres.add(make_oeuvre("W2"))
+        batch = [make_oeuvre(f"W{i}") for i in range(1, 6)] + [make_oeuvre("W1")]
+        assert oeuvres.add_many(batch) == ["W2", "W1"]
+        assert sorted(o.work_id for o in oeuvres.get_all()) == ["W1", "W2", "W3", "W4", "W5"]
+
+    def test_small_chunks(self, tmp_path):
+        """Un paquet en erreur est rejoué ligne par ligne, les autres paquets sont intacts"""
+        oeuvres = OeuvreSQLiteRepository(str(tmp_path / "catalogue.db"))
+        oeuvres.add(make_oeuvre("W4"))
+        batch = [make_oeuvre(f"W{i}") for i in range(1, 10)]
+        assert oeuvres.add_many(batch, chunk_size=2) == ["W4"]
+        assert len(oeuvres.get_all()) == 9
+
+    def test_foreign_key_failures(self, tmp_path):
+        """Une édition sans œuvre est refusée par la clé étrangère"""
+        db_path = str(tmp_path / "catalogue.db")
+        oeuvres, editions = OeuvreSQLiteRepository(db_path), EditionSQLiteRepository(db_path)
+        oeuvres.add(make_oeuvre("W1"))
+        batch = [make_edition("111", "W1"), make_edition("222", "W9"), make_edition("333", "W1")]
+        assert editions.add_many(batch) == ["222"]
+        assert [e.isbn for e in editions.get_all()] == ["111", "333"]
+
+    def test_single_transaction(self, tmp_path):
+        """Une erreur en cours d'import annule tout le lot"""
+        oeuvres = OeuvreSQLiteRepository(str(tmp_path / "catalogue.db"))
+
+        def batch():
+            for i in range(10):
+                yield make_oeuvre(f"W{i}")
+            raise RuntimeError("scan interrompu")
+
+        with pytest.raises(RuntimeError):
+            oeuvres.add_many(batch(), chunk_size=3)
+        assert oeuvres.get_all() == []
+
+    def test_invalid_chunk_size(self, tmp_path):
+        """Une taille de paquet nulle est refusée"""
+        oeuvres = OeuvreSQLiteRepository(str(tmp_path / "catalogue.db"))
+        with pytest.raises(ValueError):
+            oeuvres.add_many([make_oeuvre("W1")], chunk_size=0)
+
+
+class TestUpdateAndDeleteMany:
+    """Tests pour update_many et delete_many"""
+
+    def test_update_many(self, repositories):
+        """Les œuvres existantes sont mises à jour, les absentes signalées"""
+        oeuvres, _ = repositories
+        oeuvres.add_many([make_oeuvre("W1"), make_oeuvre("W2")])
+        updated = [make_oeuvre("W1", "Germinal"), make_oeuvre("W9", "Nana"), make_oeuvre("W2", "La Curée")]
+        assert oeuvres.update_many(updated) == ["W9"]
+        assert oeuvres.get_by_id("W1").title == "Germinal"
+        assert [o.work_id for o in oeuvres.search("curee")] == ["W2"]
+
+    def test_delete_many(self, repositories):
+        """Les éditions existantes sont supprimées, les absentes signalées"""
+        oeuvres, editions = repositories
+        oeuvres.add(make_oeuvre("W1"))
+        editions.add_many([make_edition(isbn, "W1") for isbn in ("111", "222", "333")])
+        assert editions.delete_many(["111", "999", "333"]) == ["999"]
+        assert [e.isbn for e in editions.get_all()] == ["222"]
+
+
+class TestGetMany:
+    """Tests pour get_many"""
+
+    def test_get_many(self, repositories):
+        """Les entités trouvées sont indexées par identifiant, les absentes omises"""
+        oeuvres, editions = repositories
+        oeuvres.add_many([make_oeuvre("W1", "Germinal"), make_oeuvre("W2")])
+        editions.add(make_edition("111", "W1"))
+        assert oeuvres.get_many(["W1", "W9", "W1"])["W1"].title == "Germinal"
+        assert sorted(oeuvres.get_many(["W2", "W9", "W1"])) == ["W1", "W2"]
+        assert list(editions.get_many(iter(["111", "222"]))) == ["111"]
+        assert oeuvres.get_many([]) == {}
+
+    def test_more_ids_than_sqlite_variables(self, tmp_path):
+        """Les listes plus longues que la limite de variables sont découpées en paquets"""
+        oeuvres = OeuvreSQLiteRepository(str(tmp_path / "catalogue.db"))
+        oeuvres.add_many(make_oeuvre(f"W{i}") for i in range(1200))
+        found = oeuvres.get_many(f"W{i}" for i in range(0, 40000, 2))
+        assert len(found) == 600
+
+    def test_oeuvres_for_editions(self, repositories):
+        """La bibliothèque résout les œuvres d'une page d'éditions d'un coup"""
+        oeuvres, editions = repositories
+        biblio = Bibliotheque(oeuvres, editions)
+        biblio.add_oeuvre(make_oeuvre("W1", "Germinal"))
+        biblio.add_edition(make_edition("111", "W1"))
+        biblio.add_edition(make_edition("222", "W1"))
+        orphan = make_edition("333", None)
+        result = biblio.get_oeuvres_for_editions(editions.get_all() + [orphan])
+        assert sorted(result) == ["111", "222"]
+        assert result["222"].title == "Germinal"
@@ -0,0 +1,165 @@
+"""
+Tests pour le cache de lecture devant un repository (CachedRepository)
+"""
+import pytest
+from models.oeuvre import Oeuvre
+from models.edition import Edition
+from services.bibliotheque import Bibliotheque
+from services.cached_repository import CachedRepository
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+import services.cached_repository as cached_repository
+
+
+def make_oeuvre(work_id, title="Germinal"):
+    """Crée une œuvre de test"""
+    oeuvre = Oeuvre(work_id)
+    oeuvre.title = title
+    oeuvre.author = "Émile Zola"
+    return oeuvre
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Fixture fournissant le chemin d'une base temporaire"""
+    return str(tmp_path / "catalogue.db")
+
+
+@pytest.fixture
+def repo(db_path):
+    """Fixture fournissant un cache devant un repository SQLite de trois œuvres"""
+    inner = OeuvreSQLiteRepository(db_path)
+    inner.add_many(make_oeuvre(f"W{i}", f"Titre {i}") for i in range(3))
+    return CachedRepository(inner, max_entries=2)
+
+
+def selects(repo, action):
+    """Compte les requêtes SELECT envoyées à SQLite pendant action()"""
+    statements = []
+    with repo.transaction() as conn:
+        conn.set_trace_callback(statements.append)
+    try:
+        action()
+    finally:
+        with repo.transaction() as conn:
+            conn.set_trace_callback(None)
+    return sum(1 for statement in statements if statement.lstrip().upper().startswith("SELECT"))
+
+
+class TestReads:
+    """Tests pour les lectures servies par le cache"""
+
+    def test_get_by_id(self, repo):
+        """La seconde lecture ne touche pas la base"""
+        first = repo.get_by_id("W0")
+        assert selects(repo, lambda: repo.get_by_id("W0")) == 0
+        assert repo.get_by_id("W0") is first
+        assert (repo.hits, repo.misses) == (2, 1)
+
+    def test_missing_entity_is_not_cached(self, repo):
+        """Une entité absente n'est pas mémorisée: elle peut être ajoutée par un autre chemin"""
+        assert repo.get_by_id("W9") is None
+        repo._inner.add(make_oeuvre("W9"))
+        assert repo.get_by_id("W9").work_id == "W9"
+
+    def test_lru_eviction(self, repo):
+        """Au-delà de max_entries, l'entité la moins récemment lue est évincée"""
+        repo.get_by_id("W0")
+        repo.get_by_id("W1")
+        repo.get_by_id("W0")
+        repo.get_by_id("W2")
+        assert repo.evictions == 1
+        assert selects(repo, lambda: repo.get_by_id("W0")) == 0
+        assert selects(repo, lambda: repo.get_by_id("W1")) > 0
+
+    def test_ttl(self, db_path, monkeypatch):
+        """Une entrée expirée est relue"""
+        now = [1000.0]
+        monkeypatch.setattr(cached_repository.time, "monotonic", lambda: now[0])
+        repo = CachedRepository(OeuvreSQLiteRepository(db_path), ttl=10)
+        repo.add(make_oeuvre("W1"))
+        repo.get_by_id("W1")
+        now[0] += 5
+        repo.get_by_id("W1")
+        now[0] += 10
+        repo.get_by_id("W1")
+        assert (repo.hits, repo.misses) == (1, 2)
+
+    def test_get_many(self, repo):
+        """Seuls les identifiants absents du cache sont demandés au repository"""
+        repo.get_by_id("W0")
+        assert sorted(repo.get_many(["W0", "W1", "W9"])) == ["W0", "W1"]
+        assert repo.stats()["hits"] == 1
+        assert selects(repo, lambda: repo.get_many(["W1", "W0"])) == 0
+
+    def test_get_many_deferred(self, repo):
+        """Une demande avec defer est servie par le cache, sans y ranger d'entité incomplète"""
+        cached = repo.get_by_id("W0")
+        found = repo.get_many(["W0", "W1"], defer=("summary",))
+        assert found["W0"] is cached
+        assert repo.stats()["entities"] == 1
+        assert selects(repo, lambda: repo.get_many(["W0"], defer=("summary",))) == 0
+
+    def test_bibliotheque_oeuvres_for_editions(self, db_path):
+        """Les œuvres des éditions sont lues depuis le cache malgré le résumé différé"""
+        oeuvres = CachedRepository(OeuvreSQLiteRepository(db_path))
+        biblio = Bibliotheque(oeuvres, EditionSQLiteRepository(db_path))
+        biblio.add_oeuvre(make_oeuvre("W1"))
+        edition = Edition("111", "W1")
+        biblio.add_edition(edition)
+
+        oeuvre = biblio.get_oeuvre("W1")
+        assert selects(oeuvres, lambda: biblio.get_oeuvres_for_editions([edition])) == 0
+        assert biblio.get_oeuvres_for_editions([edition]) == {"111": oeuvre}
+
+    def test_search(self, repo):
+        """Les recherches sont mémorisées, la liste rendue est une copie"""
+        results = repo.search("titre")
+        results.clear()
+        assert selects(repo, lambda: repo.search("titre")) == 0
+        assert len(repo.search("titre")) == 3
+        assert repo.search_ranked("titre 1", 1)[0][0].work_id == "W1"
+
+    def test_delegation(self, repo):
+        """Les méthodes propres au repository enveloppé restent accessibles"""
+        assert [o.work_id for o in repo.get_by_author("emile zola")] == ["W0", "W1", "W2"]
+
+
+class TestInvalidation:
+    """Tests pour l'invalidation par les écritures"""
+
+    def test_update(self, repo):
+        """Une mise à jour invalide l'entité et les recherches"""
+        repo.get_by_id("W0")
+        assert repo.search("nana") == []
+        repo.update(make_oeuvre("W0", "Nana"))
+        assert repo.get_by_id("W0").title == "Nana"
+        assert [o.work_id for o in repo.search("nana")] == ["W0"]
+
+    def test_delete_many(self, repo):
+        """Les entités supprimées ne sont plus servies"""
+        repo.get_many(["W0", "W1"])
+        repo.delete_many(["W0", "W1"])
+        assert repo.get_many(["W0", "W1"]) == {}
+
+    def test_rollback(self, repo):
+        """Une lecture faite dans une transaction annulée n'est pas gardée en cache"""
+        with pytest.raises(RuntimeError):
+            with repo.transaction():
+                repo.update(make_oeuvre("W0", "Nana"))
+                assert repo.get_by_id("W0").title == "Nana"
+                raise RuntimeError()
+        assert repo.get_by_id("W0").title == "Titre 0"
+
+    def test_bibliotheque(self, db_path):
+        """La bibliothèque utilise le cache sans changement, suppression en cascade comprise"""
+        oeuvres = CachedRepository(OeuvreSQLiteRepository(db_path))
+        editions = CachedRepository(EditionSQLiteRepository(db_path))
+        biblio = Bibliotheque(oeuvres, editions)
+        biblio.add_oeuvre(make_oeuvre("W1"))
+        biblio.add_edition(Edition("111", "W1"))
+
+        assert biblio.get_edition("111").work_id == "W1"
+        assert [e.isbn for e in biblio.get_editions_of_oeuvre("W1")] == ["111"]
+        biblio.remove_oeuvre("W1")
+        assert biblio.get_edition("111") is None
+        assert biblio.get_oeuvre("W1") is None
@@ -0,0 +1,165 @@
+"""
+Tests pour le pool de connexions SQLite (SQLiteConnectionPool)
+"""
+import sqlite3
+import threading
+import pytest
+from models.oeuvre import Oeuvre
+from services.connection_pool import PRAGMA_PROFILES, SQLiteConnectionPool, get_pool
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """Fixture fournissant un pool sur une base temporaire"""
+    pool = SQLiteConnectionPool(str(tmp_path / "pool.db"))
+    yield pool
+    pool.close()
+
+
+def make_oeuvre(work_id):
+    """Crée une œuvre de test"""
+    oeuvre = Oeuvre(work_id)
+    oeuvre.title = f"Titre {work_id}"
+    oeuvre.author = "Auteur"
+    return oeuvre
+
+
+def run_in_thread(function):
+    """Exécute une fonction dans un autre thread et retourne son résultat"""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(function()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+class TestConnectionReuse:
+    """Tests pour la réutilisation des connexions"""
+
+    def test_same_thread_same_connection(self, pool):
+        """Un thread réutilise toujours la même connexion"""
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        assert first is second
+        assert len(pool) == 1
+
+    def test_one_connection_per_thread(self, pool):
+        """Chaque thread reçoit sa propre connexion"""
+        with pool.connection() as main_conn:
+            pass
+
+        def other_connection():
+            with pool.connection() as conn:
+                return conn
+
+        assert run_in_thread(other_connection) is not main_conn
+
+    def test_dead_thread_connections_closed(self, pool):
+        """Les connexions des threads terminés sont fermées"""
+        def open_connection():
+            with pool.connection():
+                pass
+
+        for _ in range(3):
+            run_in_thread(open_connection)
+        with pool.connection():
+            pass
+        assert len(pool) <= 2
+
+    def test_pragmas_applied(self, pool):
+        """La configuration est appliquée à l'ouverture de la connexion"""
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert conn.execute("SELECT normalize('Élan')").fetchone()[0] == "elan"
+
+    def test_repositories_share_pool(self, tmp_path):
+        """Les repositories d'une même base partagent le même pool"""
+        db_path = str(tmp_path / "catalogue.db")
+        oeuvres = OeuvreSQLiteRepository(db_path)
+        editions = EditionSQLiteRepository(db_path)
+        assert oeuvres._pool is editions._pool is get_pool(db_path)
+
+
+class TestTransactions:
+    """Tests pour la gestion des transactions"""
+
+    def test_nested_blocks_share_transaction(self, pool):
+        """Une erreur dans le bloc externe annule aussi les blocs imbriqués"""
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+        with pytest.raises(RuntimeError):
+            with pool.connection() as conn:
+                with pool.connection() as inner:
+                    inner.execute("INSERT INTO t VALUES (1)")
+                raise RuntimeError()
+
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+    def test_concurrent_threads(self, tmp_path):
+        """Plusieurs threads lisent et écrivent en parallèle sans erreur"""
+        repo = OeuvreSQLiteRepository(str(tmp_path / "catalogue.db"))
+        errors = []
+
+        def worker(worker_id):
+            try:
+                for i in range(20):
+                    oeuvre = make_oeuvre(f"W{worker_id}-{i}")
+                    repo.add(oeuvre)
+                    assert repo.get_by_id(oeuvre.work_id) is not None
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(repo.get_all()) == 80
+
+
+class TestProfiles:
+    """Tests pour les profils de pragmas et la lecture seule"""
+
+    @pytest.mark.parametrize("profile", sorted(PRAGMA_PROFILES))
+    def test_profile_applied(self, tmp_path, profile):
+        """Les pragmas du profil sont appliqués à chaque connexion"""
+        pool = SQLiteConnectionPool(str(tmp_path / "pool.db"), profile)
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            cache_size = PRAGMA_PROFILES[profile]["cache_size"]
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == cache_size
+        pool.close()
+
+    def test_unknown_profile(self, tmp_path):
+        """Un profil inconnu est refusé"""
+        with pytest.raises(ValueError):
+            SQLiteConnectionPool(str(tmp_path / "pool.db"), "turbo")
+
+    def test_read_while_writing(self, tmp_path):
+        """En WAL, un lecteur n'est pas bloqué par une écriture en cours"""
+        db_path = str(tmp_path / "catalogue.db")
+        writer = SQLiteConnectionPool(db_path, "bulk-ingest")
+        repo = OeuvreSQLiteRepository(db_path, writer)
+        reader = OeuvreSQLiteRepository(db_path, SQLiteConnectionPool(db_path, "read-heavy", read_only=True))
+
+        with writer.connection():
+            repo.add(make_oeuvre("W1"))
+            # Transaction d'écriture encore ouverte: le lecteur voit l'état validé
+            assert run_in_thread(lambda: reader.get_all()) == []
+        assert [o.work_id for o in run_in_thread(lambda: reader.get_all())] == ["W1"]
+        writer.close()
+
+    def test_read_only_rejects_writes(self, tmp_path):
+        """Une base ouverte en lecture seule refuse les écritures"""
+        db_path = str(tmp_path / "catalogue.db")
+        OeuvreSQLiteRepository(db_path)
+        reader = OeuvreSQLiteRepository(db_path, SQLiteConnectionPool(db_path, read_only=True))
+        with pytest.raises(sqlite3.OperationalError):
+            reader.add(make_oeuvre("W1"))
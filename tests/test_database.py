@@ -0,0 +1,256 @@
+"""
+Tests pour les repositories SQLite (OeuvreSQLiteRepository, EditionSQLiteRepository)
+"""
+import sqlite3
+import pytest
+from models.oeuvre import Oeuvre
+from models.edition import Edition
+from const.genre import Genre
+from const.book_format import BookFormat
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+
+
+def make_oeuvre(work_id, title, author, series=None, series_number=None):
+    """Crée une œuvre de test"""
+    oeuvre = Oeuvre(work_id)
+    oeuvre.title = title
+    oeuvre.author = author
+    oeuvre.series = series
+    oeuvre.series_number = series_number
+    return oeuvre
+
+
+def make_edition(isbn, work_id, publisher, collection=None):
+    """Crée une édition de test"""
+    edition = Edition(isbn, work_id)
+    edition.publisher = publisher
+    edition.collection = collection
+    return edition
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Fixture fournissant le chemin d'une base temporaire"""
+    return str(tmp_path / "catalogue.db")
+
+
+@pytest.fixture
+def oeuvre_repo(db_path):
+    """Fixture fournissant un repository d'œuvres peuplé"""
+    repo = OeuvreSQLiteRepository(db_path)
+    repo.add(make_oeuvre("W1", "Les Misérables", "Victor Hugo"))
+    repo.add(make_oeuvre("W2", "Notre-Dame de Paris", "victor HUGO"))
+    repo.add(make_oeuvre("W3", "Fondation et Empire", "Isaac Asimov", "Fondation", 2))
+    repo.add(make_oeuvre("W4", "Fondation", "Isaac Asimov", "Fondation", 1))
+    return repo
+
+
+@pytest.fixture
+def edition_repo(db_path, oeuvre_repo):
+    """Fixture fournissant un repository d'éditions peuplé"""
+    repo = EditionSQLiteRepository(db_path)
+    repo.add(make_edition("111", "W1", "Gallimard", "Folio"))
+    repo.add(make_edition("222", "W2", "GALLIMARD", "Folio classique"))
+    repo.add(make_edition("333", "W3", "Denoël", "Présence du futur"))
+    return repo
+
+
+class TestNormalizedColumns:
+    """Tests pour les colonnes normalisées"""
+
+    def test_model_shadow_fields(self):
+        """Les formes normalisées sont calculées à l'écriture"""
+        oeuvre = make_oeuvre("W1", "Les Misérables", "Émile Zola", "Les Rougon-Macquart")
+        assert oeuvre.title_normalized == "les miserables"
+        assert oeuvre.author_normalized == "emile zola"
+        assert oeuvre.series_normalized == "les rougon-macquart"
+        oeuvre.author = "Victor Hugo"
+        assert oeuvre.author_normalized == "victor hugo"
+
+        edition = make_edition("111", "W1", "Éditions du Seuil")
+        assert edition.publisher_normalized == "editions du seuil"
+        assert edition.collection_normalized is None
+
+    def test_get_by_author(self, oeuvre_repo):
+        """La recherche par auteur ignore accents et casse"""
+        assert {o.work_id for o in oeuvre_repo.get_by_author("VICTOR hugo")} == {"W1", "W2"}
+
+    def test_get_by_series(self, oeuvre_repo):
+        """La recherche par série trie par numéro"""
+        assert [o.work_id for o in oeuvre_repo.get_by_series("fondation")] == ["W4", "W3"]
+
+    def test_get_by_publisher(self, edition_repo):
+        """La recherche par éditeur ignore accents et casse"""
+        assert {e.isbn for e in edition_repo.get_by_publisher("gallimard")} == {"111", "222"}
+        assert [e.isbn for e in edition_repo.get_by_publisher("denoel")] == ["333"]
+
+    def test_get_by_collection(self, edition_repo):
+        """La recherche par collection ignore accents et casse"""
+        assert [e.isbn for e in edition_repo.get_by_collection("presence du futur")] == ["333"]
+
+    def test_existing_database_is_migrated(self, db_path):
+        """Une base créée sans colonnes normalisées est complétée et remplie"""
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE oeuvres (
+                work_id TEXT PRIMARY KEY, title TEXT NOT NULL, author TEXT NOT NULL,
+                co_authors TEXT, original_language TEXT, original_publication_year INTEGER,
+                summary TEXT, genres TEXT, themes TEXT, awards TEXT,
+                series TEXT, series_number INTEGER
+            )
+        """)
+        conn.execute("INSERT INTO oeuvres (work_id, title, author) VALUES ('W1', 'Germinal', 'Émile Zola')")
+        conn.commit()
+        conn.close()
+
+        repo = OeuvreSQLiteRepository(db_path)
+        assert [o.work_id for o in repo.get_by_author("emile zola")] == ["W1"]
+
+
+class TestFullTextSearch:
+    """Tests pour la recherche plein texte (FTS5)"""
+
+    def test_accents_and_case(self, oeuvre_repo):
+        """La recherche ignore accents et casse"""
+        assert [o.work_id for o in oeuvre_repo.search("MISERABLES")] == ["W1"]
+        assert [o.work_id for o in oeuvre_repo.search("misérables")] == ["W1"]
+
+    def test_prefix_and_all_words(self, oeuvre_repo):
+        """Chaque mot est un préfixe et tous les mots sont requis"""
+        assert {o.work_id for o in oeuvre_repo.search("vict hug")} == {"W1", "W2"}
+        assert [o.work_id for o in oeuvre_repo.search("hugo notre")] == ["W2"]
+
+    def test_typo_tolerance(self, oeuvre_repo):
+        """Un mot sans correspondance est corrigé par le vocabulaire de l'index"""
+        assert [o.work_id for o in oeuvre_repo.search("asimof fondation")][0] in ("W3", "W4")
+        assert oeuvre_repo.search("zzzzzz") == []
+
+    def test_bm25_order(self, oeuvre_repo):
+        """Le titre pèse plus lourd que l'auteur dans le classement"""
+        oeuvre_repo.add(make_oeuvre("W5", "Hugo Cabret", "Brian Selznick"))
+        assert oeuvre_repo.search("hugo")[0].work_id == "W5"
+
+    def test_index_follows_writes(self, oeuvre_repo):
+        """Les triggers tiennent l'index à jour"""
+        oeuvre = oeuvre_repo.get_by_id("W1")
+        oeuvre.title = "Quatrevingt-treize"
+        oeuvre_repo.update(oeuvre)
+        assert oeuvre_repo.search("miserables") == []
+        assert [o.work_id for o in oeuvre_repo.search("quatrevingt")] == ["W1"]
+
+        oeuvre_repo.delete("W1")
+        assert oeuvre_repo.search("quatrevingt") == []
+
+    def test_editions(self, edition_repo):
+        """Recherche des éditions par éditeur ou fragment d'ISBN"""
+        assert [e.isbn for e in edition_repo.search("denoel")] == ["333"]
+        assert {e.isbn for e in edition_repo.search("galimard")} == {"111", "222"}
+        assert [e.isbn for e in edition_repo.search("222")] == ["222"]
+        assert edition_repo.search("22") == []
+
+
+class TestJunctionTables:
+    """Tests pour les champs multivalués stockés en tables d'association"""
+
+    @pytest.fixture
+    def repo(self, db_path):
+        """Fixture fournissant un repository avec des champs multivalués"""
+        repo = OeuvreSQLiteRepository(db_path)
+        oeuvre = make_oeuvre("W1", "Good Omens", "Terry Pratchett")
+        oeuvre.co_authors = ["Neil Gaiman"]
+        oeuvre.genres = [Genre.FANTASY, Genre.ROMAN]
+        oeuvre.themes = ["Apocalypse", "Anges, démons et humains"]
+        oeuvre.awards = ["Locus"]
+        repo.add(oeuvre)
+
+        oeuvre = make_oeuvre("W2", "American Gods", "Neil Gaiman")
+        oeuvre.genres = [Genre.FANTASY]
+        oeuvre.awards = ["Hugo", "Locus"]
+        repo.add(oeuvre)
+        return repo
+
+    def test_round_trip(self, repo):
+        """Les listes sont relues dans l'ordre, virgules comprises"""
+        oeuvre = repo.get_by_id("W1")
+        assert oeuvre.genres == [Genre.FANTASY, Genre.ROMAN]
+        assert oeuvre.themes == ["Apocalypse", "Anges, démons et humains"]
+        assert oeuvre.co_authors == ["Neil Gaiman"]
+
+    def test_filters(self, repo):
+        """Les filtres passent par les index des tables d'association"""
+        assert [o.work_id for o in repo.get_by_genre(Genre.FANTASY)] == ["W2", "W1"]
+        assert [o.work_id for o in repo.get_by_theme("anges, demons et humains")] == ["W1"]
+        assert [o.work_id for o in repo.get_by_award("LOCUS")] == ["W2", "W1"]
+        assert [o.work_id for o in repo.get_by_co_author("neil gaiman")] == ["W1"]
+        assert repo.get_by_genre(Genre.POLICIER) == []
+
+    def test_update_and_delete(self, repo):
+        """Les tables d'association suivent les mises à jour et suppressions"""
+        oeuvre = repo.get_by_id("W2")
+        oeuvre.awards = ["Nebula"]
+        repo.update(oeuvre)
+        assert [o.work_id for o in repo.get_by_award("nebula")] == ["W2"]
+        assert [o.work_id for o in repo.get_by_award("hugo")] == []
+
+        repo.delete("W1")
+        assert [o.work_id for o in repo.get_by_award("locus")] == []
+
+    def test_legacy_text_columns_are_migrated(self, db_path):
+        """Les anciennes colonnes texte sont reprises dans les tables d'association"""
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE oeuvres (
+                work_id TEXT PRIMARY KEY, title TEXT NOT NULL, author TEXT NOT NULL,
+                co_authors TEXT, original_language TEXT, original_publication_year INTEGER,
+                summary TEXT, genres TEXT, themes TEXT, awards TEXT,
+                series TEXT, series_number INTEGER
+            )
+        """)
+        conn.execute("""
+            INSERT INTO oeuvres (work_id, title, author, genres, themes)
+            VALUES ('W1', 'Dune', 'Frank Herbert', 'Science-fiction,Roman', 'Écologie,Pouvoir')
+        """)
+        conn.commit()
+        conn.close()
+
+        repo = OeuvreSQLiteRepository(db_path)
+        assert repo.get_by_id("W1").genres == [Genre.SCIENCE_FICTION, Genre.ROMAN]
+        assert [o.work_id for o in repo.get_by_theme("ecologie")] == ["W1"]
+
+
+class TestHydration:
+    """Tests pour la reconstruction des entités depuis des tuples (from_row)"""
+
+    def test_edition_round_trip(self, edition_repo):
+        """Une édition relue a les mêmes champs, formes normalisées comprises"""
+        edition = make_edition("444", "W1", "Éditions du Seuil", "Points")
+        edition.format = BookFormat.POCHE
+        edition.publication_year = 1972
+        edition.price = 7.5
+        edition_repo.add(edition)
+
+        loaded = edition_repo.get_by_id("444")
+        assert loaded.format is BookFormat.POCHE
+        assert (loaded.publisher, loaded.publisher_normalized) == (edition.publisher, edition.publisher_normalized)
+        assert (loaded.collection, loaded.collection_normalized) == ("Points", "points")
+        assert (loaded.publication_year, loaded.price, loaded.language) == (1972, 7.5, "fr")
+
+    def test_oeuvre_round_trip(self, oeuvre_repo):
+        """Une œuvre relue a les mêmes champs, setters toujours actifs ensuite"""
+        oeuvre = oeuvre_repo.get_by_id("W3")
+        assert (oeuvre.title, oeuvre.series, oeuvre.series_number) == ("Fondation et Empire", "Fondation", 2)
+        assert oeuvre.author_normalized == "isaac asimov"
+        oeuvre.title = "Seconde Fondation"
+        assert oeuvre.title_normalized == "seconde fondation"
+
+    def test_one_timestamp_per_batch(self, edition_repo):
+        """Les éditions d'une même lecture partagent leur horodatage de chargement"""
+        editions = edition_repo.get_all()
+        assert len({e.created_at for e in editions}) == 1
+        assert all(e.updated_at == e.created_at for e in editions)
+
+    def test_missing_normalized_columns(self):
+        """Les formes normalisées absentes (anciennes lignes) sont recalculées"""
+        oeuvre = Oeuvre.from_row("W1", "Les Misérables", "Victor Hugo", None, None, None,
+                                 "Les Rougon", None, None, None, None)
+        assert (oeuvre.title_normalized, oeuvre.series_normalized) == ("les miserables", "les rougon")
@@ -0,0 +1,121 @@
+"""
+Tests pour les champs différés (résumé, URLs de couverture chargés à la première lecture)
+"""
+import pytest
+from models.oeuvre import Oeuvre
+from models.edition import Edition
+from models.deferred import NOT_LOADED, deferred_fields
+from services.bibliotheque import Bibliotheque
+from services.oeuvre_repository import OeuvreMemoryRepository
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+
+
+def make_oeuvre(work_id):
+    """Crée une œuvre de test avec un résumé"""
+    oeuvre = Oeuvre(work_id)
+    oeuvre.title = f"Titre {work_id}"
+    oeuvre.author = "Auteur"
+    oeuvre.summary = f"Résumé {work_id}"
+    return oeuvre
+
+
+def make_edition(isbn, work_id):
+    """Crée une édition de test avec ses couvertures"""
+    edition = Edition(isbn, work_id)
+    edition.cover_front_url = f"covers/{isbn}-front.jpg"
+    edition.cover_back_url = f"covers/{isbn}-back.jpg"
+    return edition
+
+
+@pytest.fixture
+def repositories(tmp_path):
+    """Fixture fournissant les deux repositories SQLite: trois œuvres, une édition chacune"""
+    db_path = str(tmp_path / "catalogue.db")
+    oeuvres, editions = OeuvreSQLiteRepository(db_path), EditionSQLiteRepository(db_path)
+    oeuvres.add_many(make_oeuvre(f"W{i}") for i in range(3))
+    editions.add_many(make_edition(f"{i}{i}{i}", f"W{i}") for i in range(3))
+    return oeuvres, editions
+
+
+def queries(repo, action):
+    """Exécute action() et retourne les requêtes SELECT qu'elle a envoyées"""
+    statements = []
+    with repo.transaction() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            action()
+        finally:
+            conn.set_trace_callback(None)
+    return [statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]
+
+
+class TestDeferredFields:
+    """Tests pour le chargement différé depuis SQLite"""
+
+    def test_declared_fields(self):
+        """Les modèles déclarent leurs champs différables"""
+        assert deferred_fields(Oeuvre) == ("summary",)
+        assert deferred_fields(Edition) == ("cover_front_url", "cover_back_url", "cover_spine_url")
+
+    def test_one_query_for_the_whole_page(self, repositories):
+        """La première lecture charge les champs de tout le lot, en une requête"""
+        oeuvres, _ = repositories
+        page = oeuvres.page(limit=10, defer=["summary"])
+        assert all(oeuvre._summary is NOT_LOADED for oeuvre in page)
+
+        summaries = []
+        assert len(queries(oeuvres, lambda: summaries.extend(o.summary for o in page))) == 1
+        assert summaries == ["Résumé W0", "Résumé W1", "Résumé W2"]
+
+    def test_editions(self, repositories):
+        """Les URLs de couverture sont différées ensemble"""
+        _, editions = repositories
+        edition = editions.get_many(["111"], defer=("cover_front_url", "cover_back_url"))["111"]
+        assert edition._cover_back_url is NOT_LOADED
+        assert edition.has_cover_images
+        assert (edition.cover_front_url, edition.cover_back_url) == ("covers/111-front.jpg", "covers/111-back.jpg")
+
+    def test_update_keeps_deferred_values(self, repositories):
+        """Une entité différée puis enregistrée ne perd pas ses champs non lus"""
+        oeuvres, _ = repositories
+        oeuvre = next(oeuvres.iter_all(batch_size=2, defer=["summary"]))
+        oeuvre.title = "Nouveau titre"
+        assert oeuvres.update(oeuvre)
+        assert oeuvres.get_by_id("W0").summary == "Résumé W0"
+
+    def test_assignment_before_load(self, repositories):
+        """Une valeur affectée avant le chargement n'est pas écrasée"""
+        oeuvres, _ = repositories
+        first, second = oeuvres.page(limit=2, defer=["summary"])
+        first.summary = "Modifié"
+        assert second.summary == "Résumé W1"
+        assert first.summary == "Modifié"
+
+    def test_deleted_before_load(self, repositories):
+        """Une entité supprimée entre la lecture et le chargement a des champs vides"""
+        oeuvres, _ = repositories
+        oeuvre = oeuvres.get_many(["W2"], defer=["summary"])["W2"]
+        oeuvres.delete("W2")
+        assert oeuvre.summary is None
+
+    def test_unknown_field(self, repositories):
+        """Seuls les champs déclarés différables peuvent être différés"""
+        oeuvres, _ = repositories
+        with pytest.raises(ValueError):
+            oeuvres.page(defer=["title"])
+
+    def test_memory_repository_ignores_defer(self):
+        """En mémoire, les entités sont rendues complètes"""
+        repo = OeuvreMemoryRepository()
+        repo.add(make_oeuvre("W1"))
+        assert repo.page(defer=["summary"])[0]._summary == "Résumé W1"
+
+    def test_oeuvres_for_editions(self, tmp_path):
+        """La bibliothèque diffère le résumé des œuvres d'une liste d'éditions"""
+        db_path = str(tmp_path / "catalogue.db")
+        biblio = Bibliotheque(OeuvreSQLiteRepository(db_path), EditionSQLiteRepository(db_path))
+        biblio.add_oeuvre(make_oeuvre("W1"))
+        biblio.add_edition(make_edition("111", "W1"))
+        oeuvre = biblio.get_oeuvres_for_editions(biblio.page_editions())["111"]
+        assert oeuvre._summary is NOT_LOADED
+        assert oeuvre.summary == "Résumé W1"
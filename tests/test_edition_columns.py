@@ -0,0 +1,138 @@
+"""
+Tests pour l'instantané en colonnes des éditions (nécessite NumPy)
+"""
+import pytest
+from const.book_format import BookFormat
+from models.oeuvre import Oeuvre
+from models.edition import Edition
+from services.edition_repository import EditionMemoryRepository
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+
+np = pytest.importorskip("numpy")
+from services.edition_columns import EditionColumns  # noqa: E402
+
+FORMATS = [BookFormat.POCHE, BookFormat.BROCHE, None]
+PUBLISHERS = ["Gallimard", "Flammarion", ""]
+
+
+def make_edition(i, work_id="W1"):
+    """Crée une édition de test (quelques champs absents)"""
+    edition = Edition(f"{i:03d}", work_id)
+    edition.publisher = PUBLISHERS[i % 3]
+    edition.format = FORMATS[i % 3]
+    edition.publication_year = 1940 + 3 * (i % 100)
+    edition.pages = None if i % 4 == 0 else 100 * i
+    edition.price = 5.0 + i
+    edition.currency = "EUR" if i % 2 else "USD"
+    return edition
+
+
+@pytest.fixture
+def repo():
+    """Fixture fournissant un repository en mémoire de douze éditions"""
+    repo = EditionMemoryRepository()
+    repo.add_many(make_edition(i) for i in range(12))
+    return repo
+
+
+@pytest.fixture
+def columns(repo):
+    """Fixture fournissant l'instantané du repository"""
+    return EditionColumns.from_repository(repo, batch_size=5)
+
+
+class TestQueries:
+    """Tests pour les filtres et agrégats, comparés à un parcours des objets"""
+
+    def test_filter(self, repo, columns):
+        """Éditions parues entre 1950 et 1970 de plus de 500 pages"""
+        mask = columns.between("publication_year", 1950, 1970) & columns.between("pages", low=501)
+        expected = [e.isbn for e in repo.get_all()
+                    if 1950 <= e.publication_year <= 1970 and e.pages and e.pages > 500]
+        assert columns.isbns(mask) == expected
+        assert columns.aggregate(mask=mask) == len(expected)
+
+    def test_group_by(self, repo, columns):
+        """Pages moyennes par format, valeur du catalogue par devise"""
+        editions = repo.get_all()
+        pocket = [e.pages for e in editions if e.format == BookFormat.POCHE and e.pages is not None]
+        means = columns.group_by("format", "pages", "mean")
+        assert set(means) == set(FORMATS)
+        assert means[BookFormat.POCHE] == pytest.approx(sum(pocket) / len(pocket))
+
+        totals = columns.group_by("currency", "price", "sum")
+        assert totals["EUR"] == pytest.approx(sum(e.price for e in editions if e.currency == "EUR"))
+        assert columns.group_by("publisher") == {"Gallimard": 4, "Flammarion": 4, None: 4}
+
+    def test_aggregate(self, repo, columns):
+        """Les valeurs absentes sont ignorées, comme en SQL"""
+        pages = [e.pages for e in repo.get_all() if e.pages is not None]
+        assert columns.aggregate("pages", "count") == len(pages)
+        assert columns.aggregate("pages", "max") == max(pages)
+        assert columns.aggregate("weight", "mean") is None
+        assert columns.aggregate("weight", "sum") == 0.0
+        assert columns.group_by("format", "weight", "min") == {fmt: None for fmt in FORMATS}
+
+    def test_isin_and_is_null(self, columns):
+        """Masques sur les colonnes catégorielles"""
+        assert len(columns.isbns(columns.isin("format", [BookFormat.POCHE, BookFormat.EBOOK]))) == 4
+        assert columns.isbns(columns.isin("publisher", [None])) == columns.isbns(columns.is_null("publisher"))
+        assert columns.dictionary("publisher") == ["Gallimard", "Flammarion"]
+
+    def test_invalid_arguments(self, columns):
+        """Colonne ou agrégat inconnus, masque périmé"""
+        with pytest.raises(ValueError):
+            columns.group_by("pages")
+        with pytest.raises(ValueError):
+            columns.aggregate("pages", "median")
+        mask = columns.between("pages", low=0)
+        columns.remove(["000"])
+        with pytest.raises(ValueError):
+            columns.isbns(mask)
+
+
+class TestIncrementalRebuild:
+    """Tests pour la mise à jour de l'instantané"""
+
+    def test_upsert_and_remove(self, columns):
+        """Remplacement d'une ligne, retrait dans l'ordre, agrandissement des tableaux"""
+        edition = make_edition(1)
+        edition.pages = 9999
+        columns.upsert([edition])
+        assert columns.aggregate("pages", "max") == 9999
+        assert columns.remove(["001", "inconnu"]) == 1
+        assert "001" not in columns
+        assert columns.isbns()[:2] == ["000", "002"]
+
+        columns.upsert(make_edition(i) for i in range(100, 2200))
+        assert len(columns) == 11 + 2100
+        assert columns.column("publication_year")[-1] == 1940 + 3 * 99
+
+    def test_refresh_some(self, repo, columns):
+        """Seules les éditions indiquées sont relues, les éditions supprimées retirées"""
+        edition = repo.get_by_id("003")
+        edition.price = 100.0
+        repo.update(edition)
+        repo.delete("004")
+        assert columns.refresh(repo, ["003", "004"]) == 1
+        assert columns.aggregate("price", "max") == 100.0
+        assert "004" not in columns
+
+    def test_refresh_all_from_sqlite(self, tmp_path):
+        """Le parcours complet par paquets reflète ajouts et suppressions"""
+        db_path = str(tmp_path / "catalogue.db")
+        oeuvre = Oeuvre("W1")
+        oeuvre.title = "Germinal"
+        oeuvre.author = "Émile Zola"
+        OeuvreSQLiteRepository(db_path).add(oeuvre)
+        repo = EditionSQLiteRepository(db_path)
+        repo.add_many(make_edition(i) for i in range(12))
+
+        columns = EditionColumns.from_repository(repo, batch_size=5)
+        repo.delete_many(["000", "005"])
+        repo.add(make_edition(20))
+        assert columns.refresh(repo, batch_size=5) == 11
+        assert columns.isbns() == [e.isbn for e in repo.get_all()]
+        assert columns.group_by("format") == {
+            fmt: sum(1 for e in repo.get_all() if e.format == fmt) for fmt in FORMATS
+        }
@@ -0,0 +1,197 @@
+"""
+Tests pour les migrations du schéma SQLite (PRAGMA user_version)
+"""
+import sqlite3
+import pytest
+from services.connection_pool import SQLiteConnectionPool
+from services.migrations import MIGRATIONS, SCHEMA_VERSION, migrate, schema_version
+from models.oeuvre import Oeuvre
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Fixture fournissant le chemin d'une base temporaire"""
+    return str(tmp_path / "catalogue.db")
+
+
+def create_livres(db_path, rows):
+    """Crée une base à l'ancien schéma (table livres)"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE livres (
+            isbn TEXT PRIMARY KEY, title TEXT NOT NULL, author TEXT NOT NULL,
+            publisher TEXT, publication_year INTEGER, summary TEXT
+        )
+    """)
+    conn.executemany("INSERT INTO livres VALUES (?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+class TestMigrate:
+    """Tests pour le lanceur de migrations"""
+
+    def test_new_database(self, db_path):
+        """Une base neuve reçoit toutes les migrations"""
+        pool = SQLiteConnectionPool(db_path)
+        with pool.connection() as conn:
+            assert migrate(conn) == list(range(1, len(MIGRATIONS) + 1))
+            assert schema_version(conn) == SCHEMA_VERSION
+        pool.close()
+
+    def test_current_database_runs_no_ddl(self, db_path):
+        """Une base à jour ne relance aucune instruction de schéma"""
+        OeuvreSQLiteRepository(db_path)
+        pool = SQLiteConnectionPool(db_path)
+        statements = []
+        with pool.connection() as conn:
+            conn.set_trace_callback(statements.append)
+            assert migrate(conn) == []
+            conn.set_trace_callback(None)
+        assert statements == ["PRAGMA user_version"]
+        pool.close()
+
+    def test_failed_migration_rolls_back(self, db_path, monkeypatch):
+        """Une migration en erreur annule toutes celles de la transaction"""
+        def broken(conn):
+            raise sqlite3.OperationalError("migration invalide")
+
+        monkeypatch.setattr("services.migrations.MIGRATIONS", MIGRATIONS[:2] + [broken])
+        monkeypatch.setattr("services.migrations.SCHEMA_VERSION", 3)
+        pool = SQLiteConnectionPool(db_path)
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.connection() as conn:
+                migrate(conn)
+        with pool.connection() as conn:
+            assert schema_version(conn) == 0
+            assert conn.execute("SELECT name FROM sqlite_master").fetchall() == []
+        pool.close()
+
+    def test_newer_database_is_refused(self, db_path):
+        """Une base créée par une version plus récente du code est refusée"""
+        conn = sqlite3.connect(db_path)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+        conn.close()
+        with pytest.raises(RuntimeError):
+            OeuvreSQLiteRepository(db_path)
+
+
+class TestImportLivres:
+    """Tests pour la reprise de l'ancienne table livres"""
+
+    def test_livres_become_oeuvres_and_editions(self, db_path):
+        """Les livres de même titre et auteur deviennent les éditions d'une même œuvre"""
+        create_livres(db_path, [
+            ("111", "Les Misérables", "Victor Hugo", "Gallimard", 1995, "Jean Valjean..."),
+            ("222", "Les miserables", "VICTOR HUGO", "Pléiade", 1951, None),
+            ("333", "Germinal", "Émile Zola", None, None, None),
+        ])
+        oeuvres = OeuvreSQLiteRepository(db_path)
+        editions = EditionSQLiteRepository(db_path)
+
+        assert [(o.work_id, o.title) for o in oeuvres.page()] == [
+            ("WORK-000001", "Les Misérables"),
+            ("WORK-000002", "Germinal"),
+        ]
+        assert oeuvres.get_by_id("WORK-000001").summary == "Jean Valjean..."
+        assert {e.isbn for e in editions.get_by_work_id("WORK-000001")} == {"111", "222"}
+        assert [e.isbn for e in editions.get_by_publisher("pleiade")] == ["222"]
+        assert [o.work_id for o in oeuvres.search("miserables")] == ["WORK-000001"]
+
+    def test_existing_oeuvre_is_reused(self, db_path):
+        """Un livre dont l'œuvre existe déjà y est rattaché"""
+        create_livres(db_path, [("111", "Germinal", "Emile Zola", "Folio", 2000, None)])
+        # Base en version 4, avec une œuvre saisie avant la reprise des livres
+        pool = SQLiteConnectionPool(db_path)
+        with pool.connection() as conn:
+            for migration in MIGRATIONS[:4]:
+                migration(conn)
+            conn.execute("""
+                INSERT INTO oeuvres (work_id, title, author, title_normalized, author_normalized)
+                VALUES ('W1', 'Germinal', 'Émile Zola', 'germinal', 'emile zola')
+            """)
+            conn.execute("PRAGMA user_version = 4")
+        pool.close()
+
+        editions = EditionSQLiteRepository(db_path)
+        assert editions.get_by_id("111").work_id == "W1"
+        assert OeuvreSQLiteRepository(db_path).count() == 1
+
+
+class TestSurrogateKeys:
+    """Tests pour la clé entière des index plein texte (id INTEGER PRIMARY KEY)"""
+
+    def test_search_survives_vacuum(self, db_path):
+        """Un VACUUM ne désynchronise pas l'index plein texte"""
+        oeuvres = OeuvreSQLiteRepository(db_path)
+        for work_id, title in [("W3", "Nana"), ("W1", "Germinal"), ("W2", "L'Assommoir")]:
+            oeuvre = Oeuvre(work_id)
+            oeuvre.title = title
+            oeuvre.author = "Émile Zola"
+            oeuvres.add(oeuvre)
+        oeuvres.delete("W3")
+
+        conn = sqlite3.connect(db_path)
+        for table in ("oeuvres", "editions"):
+            # id est l'INTEGER PRIMARY KEY (alias du rowid, conservé par VACUUM) désigné par l'index
+            assert [row[1] for row in conn.execute(f"PRAGMA table_info({table})") if row[5]] == ["id"]
+            sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = ?", (f"{table}_fts",)).fetchone()[0]
+            assert "content_rowid='id'" in sql
+        conn.execute("VACUUM")
+        conn.close()
+        assert [o.work_id for o in oeuvres.search("germinal")] == ["W1"]
+        assert [o.work_id for o in oeuvres.search("assommoir")] == ["W2"]
+
+    def test_legacy_tables_are_rebuilt(self, db_path):
+        """Les tables créées avant le versionnage reçoivent id, sans perdre lignes, éditions ni listes"""
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE oeuvres (
+                work_id TEXT PRIMARY KEY, title TEXT NOT NULL, author TEXT NOT NULL,
+                co_authors TEXT, original_language TEXT, original_publication_year INTEGER,
+                summary TEXT, genres TEXT, themes TEXT, awards TEXT, series TEXT, series_number INTEGER
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE editions (
+                isbn TEXT PRIMARY KEY, work_id TEXT, publisher TEXT, collection TEXT,
+                FOREIGN KEY (work_id) REFERENCES oeuvres(work_id) ON DELETE CASCADE
+            )
+        """)
+        conn.execute("CREATE INDEX idx_editions_work_id ON editions(work_id)")
+        conn.execute("""
+            INSERT INTO oeuvres (work_id, title, author, genres)
+            VALUES ('W1', 'Germinal', 'Émile Zola', 'Roman')
+        """)
+        conn.execute("INSERT INTO editions VALUES ('111', 'W1', 'Folio', NULL)")
+        conn.commit()
+        conn.close()
+
+        oeuvres, editions = OeuvreSQLiteRepository(db_path), EditionSQLiteRepository(db_path)
+        assert [g.value for g in oeuvres.get_by_id("W1").genres] == ["Roman"]
+        assert [e.isbn for e in editions.search("folio")] == ["111"]
+        assert [o.work_id for o in oeuvres.search("germ")] == ["W1"]
+        # Index de la recherche floue remplis à partir des lignes existantes
+        assert [o.work_id for o in oeuvres.search("erminal")] == ["W1"]
+        assert [o.work_id for o in oeuvres.search("gerimnal")] == ["W1"]
+
+        pool = SQLiteConnectionPool(db_path)
+        with pool.connection() as conn:
+            assert [row[1] for row in conn.execute("PRAGMA table_info(editions)") if row[5]] == ["id"]
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+        pool.close()
+        oeuvres.delete("W1")
+        assert editions.get_by_id("111") is None
+
+    def test_refused_in_open_transaction(self, db_path):
+        """migrate refuse de s'exécuter dans une transaction ouverte par l'appelant"""
+        pool = SQLiteConnectionPool(db_path)
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE notes (text TEXT)")
+            conn.execute("INSERT INTO notes VALUES ('en cours')")
+            with pytest.raises(RuntimeError):
+                migrate(conn)
+            assert schema_version(conn) == 0
+        pool.close()
@@ -0,0 +1,170 @@
+"""
+Tests pour la disposition compacte des modèles (__slots__, valeurs vides partagées, horodatages)
+"""
+import pickle
+from datetime import datetime
+import pytest
+from const.genre import Genre
+from models.oeuvre import Oeuvre, _NO_VALUES
+from models.edition import Edition
+from services.oeuvre_repository import OeuvreMemoryRepository
+from services.edition_repository import EditionMemoryRepository
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+
+
+def make_oeuvre(work_id, title="Germinal"):
+    """Crée une œuvre de test"""
+    oeuvre = Oeuvre(work_id)
+    oeuvre.title = title
+    oeuvre.author = "Émile Zola"
+    return oeuvre
+
+
+class TestSlots:
+    """Tests pour les attributs en __slots__"""
+
+    def test_no_instance_dict(self):
+        """Ni œuvre ni édition n'ont de __dict__, un attribut inconnu est refusé"""
+        for entity in (make_oeuvre("W1"), Edition("111", "W1")):
+            assert not hasattr(entity, "__dict__")
+            with pytest.raises(AttributeError):
+                entity.unknown = 1
+
+    def test_setters_still_validate(self):
+        """Les propriétés gardent leur validation et leurs formes normalisées"""
+        oeuvre = make_oeuvre("W1", "L'Éducation sentimentale")
+        assert oeuvre.title_normalized == "l'education sentimentale"
+        with pytest.raises(ValueError):
+            oeuvre.original_publication_year = 5000
+
+        edition = Edition("111", "W1")
+        edition.publisher = "Éditions du Seuil"
+        assert edition.publisher_normalized == "editions du seuil"
+        with pytest.raises(ValueError):
+            edition.publication_year = 999
+
+    def test_pickle_round_trip(self):
+        """Les entités restent sérialisables (journal d'écriture différée)"""
+        oeuvre = make_oeuvre("W1")
+        oeuvre.add_genre(Genre.ROMAN)
+        edition = Edition("111", "W1")
+        edition.collection = "Folio"
+        edition.update_timestamp()
+
+        oeuvre_copy, edition_copy = pickle.loads(pickle.dumps((oeuvre, edition)))
+        assert oeuvre_copy.genres == [Genre.ROMAN]
+        assert oeuvre_copy.themes == []
+        assert edition_copy.collection_normalized == "folio"
+        assert edition_copy.updated_at == edition.updated_at
+
+
+class TestSharedEmptyValues:
+    """Tests pour les champs multivalués vides partagés"""
+
+    def test_empty_values_are_shared(self):
+        """Les œuvres sans valeur partagent le même tuple vide tant que le champ n'est pas lu"""
+        first, second = Oeuvre("W1"), Oeuvre("W2")
+        assert first._genres is second._genres is _NO_VALUES
+        assert first.values_of("genres") == ()
+        assert first.authors_list == []
+        assert first._co_authors is _NO_VALUES
+
+    def test_read_returns_own_list(self):
+        """Un champ vide lu est une liste propre à l'œuvre, modifiable en place"""
+        first, second = Oeuvre("W1"), Oeuvre("W2")
+        assert first.genres == []
+        assert first.genres is first.genres
+        first.genres.append(Genre.ROMAN)
+        first.awards.append("Prix Goncourt")
+        assert first.genres == [Genre.ROMAN]
+        assert first.awards == ["Prix Goncourt"]
+        assert second.genres == []
+        assert second._awards is _NO_VALUES
+
+    def test_add_allocates_own_list(self):
+        """Le premier ajout alloue une liste propre à l'œuvre"""
+        first, second = Oeuvre("W1"), Oeuvre("W2")
+        first.add_genre(Genre.ROMAN)
+        first.add_theme("mine")
+        first.add_co_author("Paul Alexis")
+        assert first.genres == [Genre.ROMAN]
+        assert second.genres == []
+        first.remove_genre(Genre.ROMAN)
+        assert first.genres == []
+
+    def test_assignment(self):
+        """Affecter une liste en garde une copie, une liste vide remet le tuple partagé"""
+        oeuvre = Oeuvre("W1")
+        awards = ["Prix Goncourt"]
+        oeuvre.awards = awards
+        awards.append("Prix Femina")
+        assert oeuvre.awards == ["Prix Goncourt"]
+        oeuvre.themes = ("mine", "grève")
+        assert oeuvre.themes == ["mine", "grève"]
+        oeuvre.awards = []
+        assert oeuvre._awards is _NO_VALUES
+        assert oeuvre.awards == []
+
+    @pytest.mark.parametrize("repository", [OeuvreMemoryRepository, OeuvreSQLiteRepository])
+    def test_repository_round_trip(self, repository, tmp_path):
+        """Les repositories rendent des champs vides partagés et des champs remplis"""
+        repo = repository() if repository is OeuvreMemoryRepository else repository(str(tmp_path / "c.db"))
+        oeuvre = make_oeuvre("W1")
+        oeuvre.add_genre(Genre.ROMAN)
+        repo.add(oeuvre)
+        repo.add(make_oeuvre("W2", "Nana"))
+
+        assert repo.get_by_id("W1").genres == [Genre.ROMAN]
+        empty = repo.get_by_id("W2")
+        assert [o.work_id for o in repo.get_by_genre(Genre.ROMAN)] == ["W1"]
+        assert empty._genres is _NO_VALUES
+        assert empty.genres == []
+
+
+class TestTimestamps:
+    """Tests pour les horodatages fixés à l'enregistrement ou au chargement"""
+
+    def test_not_stamped_on_read(self):
+        """Une édition non enregistrée n'a pas de date de création, même lue"""
+        edition = Edition("111", "W1")
+        assert edition.created_at is None
+        assert edition.updated_at is None
+
+    @pytest.mark.parametrize("bulk", [False, True])
+    def test_created_when_added(self, bulk, tmp_path):
+        """created_at est fixé au premier enregistrement (add/add_many), pas à la lecture"""
+        db_path = str(tmp_path / "c.db")
+        OeuvreSQLiteRepository(db_path).add(make_oeuvre("W1"))
+        for repo in (EditionMemoryRepository(), EditionSQLiteRepository(db_path)):
+            edition = Edition("111", "W1")
+            before = datetime.now()
+            if bulk:
+                repo.add_many([edition])
+            else:
+                repo.add(edition)
+            created_at = edition.created_at
+            assert before <= created_at <= datetime.now()
+            assert edition.updated_at is created_at
+
+            rejected = Edition("111", "W1")
+            assert repo.add_many([rejected]) == ["111"]
+            assert rejected.created_at is None
+
+    def test_update_timestamp(self):
+        """update_timestamp ne change que updated_at"""
+        edition = Edition("111", "W1")
+        edition.created_at = datetime(2020, 1, 1)
+        edition.update_timestamp()
+        assert edition.created_at == datetime(2020, 1, 1)
+        assert edition.updated_at > edition.created_at
+
+    def test_hydration_shares_batch_timestamp(self, tmp_path):
+        """Les éditions d'un même paquet partagent un seul horodatage de chargement"""
+        db_path = str(tmp_path / "c.db")
+        OeuvreSQLiteRepository(db_path).add(make_oeuvre("W1"))
+        repo = EditionSQLiteRepository(db_path)
+        repo.add_many([Edition("111", "W1"), Edition("222", "W1")])
+
+        first, second = repo.get_by_work_id("W1")
+        assert first.created_at is second.created_at
+        assert Edition.from_row("333", *[None] * 24).created_at is None
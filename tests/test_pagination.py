@@ -0,0 +1,201 @@
+"""
+Tests pour le parcours par paquets et la pagination par clé (iter_all, page)
+"""
+import pytest
+from models.oeuvre import Oeuvre
+from models.edition import Edition
+from const.book_format import BookFormat
+from services.bibliotheque import Bibliotheque
+from services.oeuvre_repository import OeuvreMemoryRepository
+from services.edition_repository import EditionMemoryRepository
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+
+
+WORK_IDS = [f"W{i:02d}" for i in range(25)]
+
+
+def make_oeuvre(work_id):
+    """Crée une œuvre de test"""
+    oeuvre = Oeuvre(work_id)
+    oeuvre.title = f"Titre {work_id}"
+    oeuvre.author = "Auteur"
+    return oeuvre
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repo(request, tmp_path):
+    """Fixture fournissant un repository d'œuvres peuplé dans le désordre (mémoire et SQLite)"""
+    if request.param == "memory":
+        repo = OeuvreMemoryRepository()
+    else:
+        repo = OeuvreSQLiteRepository(str(tmp_path / "catalogue.db"))
+    repo.add_many(make_oeuvre(work_id) for work_id in reversed(WORK_IDS))
+    return repo
+
+
+class TestPage:
+    """Tests pour la méthode page"""
+
+    def test_pages_follow_keys(self, repo):
+        """Chaque page reprend après la dernière clé de la précédente"""
+        first = repo.page(limit=10)
+        assert [o.work_id for o in first] == WORK_IDS[:10]
+        second = repo.page(first[-1].work_id, 10)
+        assert [o.work_id for o in second] == WORK_IDS[10:20]
+        assert [o.work_id for o in repo.page("W19", 10)] == WORK_IDS[20:]
+
+    def test_key_not_in_repository(self, repo):
+        """La clé de reprise n'a pas besoin d'exister (entité supprimée entre deux pages)"""
+        repo.delete("W05")
+        assert [o.work_id for o in repo.page("W05", 2)] == ["W06", "W07"]
+
+
+class TestIterAll:
+    """Tests pour la méthode iter_all"""
+
+    @pytest.mark.parametrize("batch_size", [1, 7, 25, 100])
+    def test_all_entities_in_order(self, repo, batch_size):
+        """Toutes les entités sont parcourues une fois, triées par clé"""
+        assert [o.work_id for o in repo.iter_all(batch_size)] == WORK_IDS
+
+    def test_resume_after(self, repo):
+        """Le parcours peut reprendre après une clé"""
+        assert [o.work_id for o in repo.iter_all(4, after="W20")] == WORK_IDS[21:]
+
+    def test_invalid_batch_size(self, repo):
+        """Une taille de paquet nulle est refusée"""
+        with pytest.raises(ValueError):
+            list(repo.iter_all(0))
+
+    def test_rolled_back_add_leaves_no_key(self, repo):
+        """Une transaction annulée ne laisse pas de clé dans l'ordre de pagination"""
+        with pytest.raises(RuntimeError):
+            with repo.transaction():
+                repo.add(make_oeuvre("W99"))
+                repo.delete("W00")
+                raise RuntimeError()
+        assert [o.work_id for o in repo.iter_all()] == WORK_IDS
+
+
+class TestBibliotheque:
+    """Tests pour le parcours depuis la bibliothèque"""
+
+    def test_stats_and_pages(self, tmp_path):
+        """Statistiques et pages depuis la bibliothèque"""
+        db_path = str(tmp_path / "catalogue.db")
+        biblio = Bibliotheque(OeuvreSQLiteRepository(db_path), EditionSQLiteRepository(db_path))
+        for work_id in WORK_IDS[:3]:
+            biblio.add_oeuvre(make_oeuvre(work_id))
+        assert biblio.get_stats()["oeuvres_sans_editions"] == 3
+        assert [o.work_id for o in biblio.page_oeuvres("W00", 1)] == ["W01"]
+
+    def test_stats_with_orphan_edition(self):
+        """Une édition rattachée à une œuvre inexistante ne fausse pas le décompte des œuvres"""
+        biblio = Bibliotheque()
+        for work_id in WORK_IDS[:2]:
+            biblio.add_oeuvre(make_oeuvre(work_id))
+        biblio.add_edition(Edition("111", "W00"))
+        biblio.add_edition(Edition("222", "W00"))
+        biblio.update_edition(Edition("222", "W99"))
+        stats = biblio.get_stats()
+        assert stats["oeuvres_avec_editions"] == 1
+        assert stats["oeuvres_sans_editions"] == 1
+
+    @pytest.mark.parametrize("oeuvre_backend", ["memory", "sqlite"])
+    def test_stats_with_separate_catalogues(self, tmp_path, oeuvre_backend):
+        """Repositories sur des stockages distincts: les œuvres comptées sont celles du repository d'œuvres"""
+        editions_db = str(tmp_path / "editions.db")
+        local = OeuvreSQLiteRepository(editions_db)
+        local.add_many(make_oeuvre(work_id) for work_id in WORK_IDS[:6])
+        if oeuvre_backend == "memory":
+            oeuvres = OeuvreMemoryRepository()
+        else:
+            oeuvres = OeuvreSQLiteRepository(str(tmp_path / "oeuvres.db"))
+        oeuvres.add_many(make_oeuvre(work_id) for work_id in WORK_IDS[:3])
+        editions = EditionSQLiteRepository(editions_db)
+        editions.add_many(Edition(*pair) for pair in [("111", "W00"), ("222", "W04"), ("333", "W05")])
+        stats = Bibliotheque(oeuvres, editions).get_stats()
+        assert stats["total_oeuvres"] == 3
+        assert stats["oeuvres_avec_editions"] == 1
+        assert stats["oeuvres_sans_editions"] == 2
+
+    def test_stats_with_sqlite_oeuvres_and_memory_editions(self, tmp_path):
+        """Œuvres SQLite, éditions en mémoire: même décompte"""
+        oeuvres = OeuvreSQLiteRepository(str(tmp_path / "catalogue.db"))
+        oeuvres.add_many(make_oeuvre(work_id) for work_id in WORK_IDS[:3])
+        editions = EditionMemoryRepository()
+        editions.add_many(Edition(*pair) for pair in [("111", "W00"), ("222", "W00"), ("333", "W09")])
+        stats = Bibliotheque(oeuvres, editions).get_stats()
+        assert stats["oeuvres_avec_editions"] == 1
+        assert stats["oeuvres_sans_editions"] == 2
+
+
+class TestOeuvresWithEditions:
+    """Tests pour le parcours des œuvres avec leurs éditions"""
+
+    @pytest.fixture(params=["memory", "sqlite"])
+    def biblio(self, request, tmp_path):
+        """Fixture fournissant une bibliothèque: W00 a deux éditions, W01 une, W02 aucune"""
+        if request.param == "memory":
+            biblio = Bibliotheque()
+        else:
+            db_path = str(tmp_path / "catalogue.db")
+            biblio = Bibliotheque(OeuvreSQLiteRepository(db_path), EditionSQLiteRepository(db_path))
+        for work_id in WORK_IDS[:3]:
+            biblio.add_oeuvre(make_oeuvre(work_id))
+        for isbn, work_id in [("111", "W00"), ("222", "W01"), ("333", "W00")]:
+            biblio.add_edition(Edition(isbn, work_id))
+        return biblio
+
+    @staticmethod
+    def isbns_by_work(pairs):
+        """Résume des couples (œuvre, éditions) en {work_id: isbn triés}"""
+        return {oeuvre.work_id: sorted(e.isbn for e in editions) for oeuvre, editions in pairs}
+
+    def test_iter_with_editions(self, biblio):
+        """Chaque œuvre est accompagnée de ses éditions, même sur plusieurs paquets"""
+        expected = {"W00": ["111", "333"], "W01": ["222"], "W02": []}
+        assert self.isbns_by_work(biblio.iter_oeuvres_with_editions(batch_size=2)) == expected
+        assert self.isbns_by_work(biblio.page_oeuvres_with_editions("W00", 1)) == {"W01": ["222"]}
+
+    def test_index_follows_updates(self, biblio):
+        """Une édition rattachée à une autre œuvre change de groupe"""
+        biblio.update_edition(Edition("333", "W02"))
+        assert sorted(biblio.get_editions_of_oeuvres(["W00", "W02", "W09"])) == ["W00", "W02"]
+        assert [e.isbn for e in biblio.get_editions_of_oeuvre("W02")] == ["333"]
+
+        with pytest.raises(RuntimeError):
+            with biblio.transaction():
+                biblio.remove_edition("111")
+                biblio.update_edition(Edition("222", "W00"))
+                raise RuntimeError()
+        assert [e.isbn for e in biblio.get_editions_of_oeuvre("W00")] == ["111"]
+        assert [e.isbn for e in biblio.get_editions_of_oeuvre("W01")] == ["222"]
+
+    def test_work_id_changed_in_place(self, biblio):
+        """Une édition relue, modifiée en place puis enregistrée quitte son ancienne œuvre"""
+        edition = biblio.get_edition("333")
+        edition.work_id = "W02"
+        biblio.update_edition(edition)
+        assert [e.isbn for e in biblio.get_editions_of_oeuvre("W00")] == ["111"]
+        assert [e.isbn for e in biblio.get_editions_of_oeuvre("W02")] == ["333"]
+        assert biblio.get_stats()["oeuvres_avec_editions"] == 3
+
+        biblio.remove_oeuvre("W00")
+        assert biblio.get_edition("333").work_id == "W02"
+
+    def test_stats(self, biblio):
+        """Les statistiques sont agrégées par les repositories"""
+        biblio.update_edition(Edition("111", "W00"))
+        ebook, poche = Edition("444", "W01"), Edition("555", "W00")
+        ebook.format, poche.format = BookFormat.EPUB, BookFormat.POCHE
+        biblio.add_edition(ebook)
+        biblio.add_edition(poche)
+        assert biblio.get_stats() == {
+            "total_oeuvres": 3,
+            "total_editions": 5,
+            "editions_numeriques": 1,
+            "editions_physiques": 1,
+            "oeuvres_avec_editions": 2,
+            "oeuvres_sans_editions": 1,
+        }
@@ -0,0 +1,179 @@
+"""
+Tests de non-régression des plans de requête (EXPLAIN QUERY PLAN)
+
+Chaque méthode publique des repositories SQLite est appelée en enregistrant
+les requêtes exécutées. Aucune de ces requêtes ne doit lire une table entière
+sans index (ligne de plan "SCAN table" sans "USING ... INDEX"). Les parcours
+complets d'un index (get_all, COUNT) et les tables virtuelles FTS5 sont admis.
+"""
+import inspect
+import pytest
+from models.oeuvre import Oeuvre
+from models.edition import Edition
+from const.genre import Genre
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+
+
+# Appels couvrant toutes les requêtes de chaque repository: {méthode: arguments}
+OEUVRE_CALLS = {
+    "get_by_id": ("W1",),
+    "get_many": (["W1", "W2"],),
+    "get_all": (),
+    "count": (),
+    "page": ("W0", 10),
+    "iter_all": (10,),
+    "search": ("dnue",),
+    "search_ranked": ("dune",),
+    "get_by_author": ("frank herbert",),
+    "get_by_series": ("dune",),
+    "get_by_genre": (Genre.ROMAN,),
+    "get_by_theme": ("ecologie",),
+    "get_by_award": ("hugo",),
+    "get_by_co_author": ("brian herbert",),
+    "update": (None,),
+    "update_many": (None,),
+    "delete": ("W1",),
+    "delete_many": (["W1"],),
+}
+
+EDITION_CALLS = {
+    "get_by_id": ("111",),
+    "get_many": (["111", "222"],),
+    "get_all": (),
+    "count": (),
+    "count_by_format": (),
+    "count_works": (),
+    "count_works_without_editions": ([],),
+    "page": ("100", 10),
+    "iter_all": (10,),
+    "search": ("galimard",),
+    "search_ranked": ("111",),
+    "get_by_work_id": ("W1",),
+    "get_by_work_ids": (["W1", "W2"],),
+    "get_by_publisher": ("gallimard",),
+    "get_by_collection": ("folio",),
+    "get_by_year": (1965,),
+    "get_by_ean": ("9782070360222",),
+    "update": (None,),
+    "update_many": (None,),
+    "delete": ("111",),
+    "delete_many": (["111"],),
+}
+
+# Méthodes sans requête à vérifier (écritures par clé primaire, maintenance)
+EXEMPT = {"add", "add_many", "transaction", "rebuild_search_index"}
+
+
+def make_oeuvre():
+    """Crée l'œuvre de test"""
+    oeuvre = Oeuvre("W1")
+    oeuvre.title = "Dune"
+    oeuvre.author = "Frank Herbert"
+    oeuvre.genres = [Genre.ROMAN]
+    oeuvre.themes = ["Écologie"]
+    return oeuvre
+
+
+def make_edition():
+    """Crée l'édition de test"""
+    edition = Edition("111", "W1")
+    edition.publisher = "Gallimard"
+    edition.publication_year = 1965
+    return edition
+
+
+@pytest.fixture
+def repositories(tmp_path):
+    """Fixture fournissant les deux repositories, avec une œuvre et une édition"""
+    db_path = str(tmp_path / "catalogue.db")
+    oeuvres, editions = OeuvreSQLiteRepository(db_path), EditionSQLiteRepository(db_path)
+    oeuvres.add(make_oeuvre())
+    editions.add(make_edition())
+    return oeuvres, editions
+
+
+def bare_scans(conn, statement):
+    """Lignes du plan d'une requête qui lisent une table entière sans index"""
+    return [
+        f"{' '.join(statement.split())} -> {row[3]}"
+        for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}")
+        if row[3].startswith("SCAN ") and "USING" not in row[3] and "VIRTUAL TABLE" not in row[3]
+    ]
+
+
+def full_scans(repo, method, args):
+    """Appelle une méthode du repository et retourne les lignes de plan "SCAN" sans index"""
+    if args == (None,):
+        entity = make_oeuvre() if isinstance(repo, OeuvreSQLiteRepository) else make_edition()
+        args = ([entity],) if method.endswith("_many") else (entity,)
+
+    statements = []
+    with repo.transaction() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            result = getattr(repo, method)(*args)
+            if inspect.isgenerator(result):
+                list(result)
+        finally:
+            conn.set_trace_callback(None)
+
+        return [
+            scan
+            for statement in statements
+            if statement.split(None, 1)[0].upper() in ("SELECT", "UPDATE", "DELETE", "WITH")
+            for scan in bare_scans(conn, statement)
+        ]
+
+
+@pytest.mark.parametrize("method", sorted(OEUVRE_CALLS))
+def test_oeuvre_queries_use_indexes(repositories, method):
+    """Les requêtes des œuvres passent toutes par un index"""
+    oeuvres, _ = repositories
+    assert full_scans(oeuvres, method, OEUVRE_CALLS[method]) == []
+
+
+@pytest.mark.parametrize("method", sorted(EDITION_CALLS))
+def test_edition_queries_use_indexes(repositories, method):
+    """Les requêtes des éditions passent toutes par un index"""
+    _, editions = repositories
+    assert full_scans(editions, method, EDITION_CALLS[method]) == []
+
+
+@pytest.mark.parametrize("repo_class, calls", [
+    (OeuvreSQLiteRepository, OEUVRE_CALLS),
+    (EditionSQLiteRepository, EDITION_CALLS),
+])
+def test_every_query_is_checked(repo_class, calls):
+    """Toute nouvelle méthode publique doit être ajoutée aux appels vérifiés"""
+    public = {
+        name for name, _ in inspect.getmembers(repo_class, inspect.isfunction)
+        if not name.startswith("_")
+    }
+    assert public - EXEMPT == set(calls)
+
+
+@pytest.mark.parametrize("query", ["a", "hu", "hugo", "dnue", "victr", "978-2"])
+def test_search_never_reads_whole_table(repositories, query):
+    """La recherche, même d'un mot court, lit les lignes par clé: jamais la table entière"""
+    for repo, table in zip(repositories, ("oeuvres", "editions")):
+        statements = []
+        with repo.transaction() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                repo.search(query)
+            finally:
+                conn.set_trace_callback(None)
+            plans = [
+                row[3]
+                for statement in statements if statement.split(None, 1)[0].upper() == "SELECT"
+                for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}")
+            ]
+        assert not [plan for plan in plans if plan.split()[:2] == ["SCAN", table]], query
+
+
+def test_detects_full_scan(repositories):
+    """Le contrôle repère bien une requête sans index"""
+    oeuvres, _ = repositories
+    with oeuvres.transaction() as conn:
+        assert bare_scans(conn, "SELECT * FROM oeuvres WHERE summary = 'x'") != []
+        assert bare_scans(conn, "SELECT * FROM oeuvres ORDER BY title") == []
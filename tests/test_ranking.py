@@ -0,0 +1,112 @@
+"""
+Tests pour la recherche classée par pertinence (search_ranked)
+"""
+import pytest
+from unicorn.u_string import U_String
+from models.oeuvre import Oeuvre
+from models.edition import Edition
+from services.ranking import top_k
+from services.oeuvre_repository import OeuvreMemoryRepository
+from services.edition_repository import EditionMemoryRepository
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+
+
+OEUVRES = [
+    ("W1", "Le Rouge et le Noir", "Stendhal"),
+    ("W2", "Rougeole et autres maladies", "Jean Martin"),
+    ("W3", "Les Misérables", "Victor Hugo"),
+    ("W4", "Notre-Dame de Paris", "Victor Hugo"),
+    ("W5", "Histoire du rouge", "Michel Pastoureau"),
+    ("W6", "Stendhal et son temps", "Jean Prevost"),
+]
+
+
+def populate_oeuvres(repository):
+    """Ajoute les œuvres de test au repository"""
+    for work_id, title, author in OEUVRES:
+        oeuvre = Oeuvre(work_id)
+        oeuvre.title = title
+        oeuvre.author = author
+        repository.add(oeuvre)
+    return repository
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def oeuvre_repo(request, tmp_path):
+    """Fixture fournissant un repository d'œuvres peuplé (mémoire et SQLite)"""
+    if request.param == "memory":
+        return populate_oeuvres(OeuvreMemoryRepository())
+    return populate_oeuvres(OeuvreSQLiteRepository(str(tmp_path / "catalogue.db")))
+
+
+class TestMatchScore:
+    """Tests pour U_String.match_score"""
+
+    def test_tiers(self):
+        """Teste le barème mot exact > début de mot > sous-chaîne > floue"""
+        text = U_String("Le Rouge et le Noir")
+        assert text.match_score("rouge") == 1.0
+        assert text.match_score("rou") == 0.8
+        assert text.match_score("oug") == 0.6
+        assert text.match_score("ruge") == 0.4
+        assert text.match_score("xyz") == 0.0
+
+    def test_consistent_with_fuzzy_match(self):
+        """Un score nul équivaut à fuzzy_match faux"""
+        text = U_String("python programming")
+        for word in ["python", "pyth", "pithon", "progaming", "java", "zz"]:
+            assert (text.match_score(word) > 0) == text.fuzzy_match(word)
+
+
+class TestTopK:
+    """Tests pour ranking.top_k"""
+
+    def test_order_and_limit(self):
+        """Teste le tri décroissant, la limite et le filtrage des scores nuls"""
+        scored = [("a", 1.0), ("b", 3.0), ("c", 0.0), ("d", 2.0), ("e", 3.0)]
+        assert top_k(iter(scored), 3) == [("b", 3.0), ("e", 3.0), ("d", 2.0)]
+        assert top_k(iter(scored), 0) == []
+
+
+class TestSearchRanked:
+    """Tests pour search_ranked sur les repositories"""
+
+    def test_exact_title_word_first(self, oeuvre_repo):
+        """Un mot exact du titre passe avant un début de mot"""
+        results = oeuvre_repo.search_ranked("rouge")
+        assert [o.work_id for o, _ in results][:2] in (["W1", "W5"], ["W5", "W1"])
+        assert results[-1][0].work_id == "W2"
+        scores = [score for _, score in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_title_outweighs_author(self, oeuvre_repo):
+        """Le titre pèse plus lourd que l'auteur"""
+        results = oeuvre_repo.search_ranked("stendhal")
+        assert [o.work_id for o, _ in results] == ["W6", "W1"]
+
+    def test_limit(self, oeuvre_repo):
+        """Le nombre de résultats est borné"""
+        assert len(oeuvre_repo.search_ranked("rouge", limit=1)) == 1
+        assert oeuvre_repo.search_ranked("   ") == []
+
+    def test_same_matches_as_search(self):
+        """En mémoire, les résultats classés sont ceux de search()"""
+        repository = populate_oeuvres(OeuvreMemoryRepository())
+        for query in ["rouge", "victr", "hugo notre", "paris", "xyz"]:
+            ranked = {o.work_id for o, _ in repository.search_ranked(query, limit=100)}
+            assert ranked == {o.work_id for o in repository.search(query)}
+
+    @pytest.mark.parametrize("repository_class", ["memory", "sqlite"])
+    def test_editions(self, repository_class, tmp_path):
+        """Un ISBN exact passe avant un ISBN partiel"""
+        if repository_class == "memory":
+            repository = EditionMemoryRepository()
+        else:
+            OeuvreSQLiteRepository(str(tmp_path / "catalogue.db"))
+            repository = EditionSQLiteRepository(str(tmp_path / "catalogue.db"))
+        for isbn, publisher in [("9782070", "Gallimard"), ("978", "Folio"), ("123", "Seuil")]:
+            edition = Edition(isbn)
+            edition.publisher = publisher
+            repository.add(edition)
+
+        assert [e.isbn for e, _ in repository.search_ranked("978")] == ["978", "9782070"]
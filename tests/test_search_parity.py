@@ -0,0 +1,211 @@
+"""
+Tests de parité de la recherche: mêmes requêtes, mêmes résultats en mémoire et en SQLite
+"""
+import random
+import pytest
+from models.oeuvre import Oeuvre
+from models.edition import Edition
+from services.oeuvre_repository import OeuvreMemoryRepository
+from services.edition_repository import EditionMemoryRepository
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+from unicorn.u_string import U_String
+
+
+OEUVRES = [
+    ("W1", "Les Misérables", "Victor Hugo"),
+    ("W2", "Notre-Dame de Paris", "Victor Hugo"),
+    ("W3", "Anticonstitutionnellement", "Anonyme"),
+    ("W4", "L'Éducation sentimentale", "Gustave Flaubert"),
+    ("W5", "Le Petit Prince", "Antoine de Saint-Exupéry"),
+    ("W6", "Cent ans de solitude", "Gabriel García Márquez"),
+    ("W7", "Fondation et Empire", "Isaac Asimov"),
+    ("W8", "Germinal", "Émile Zola"),
+]
+
+EDITIONS = [
+    ("978-2-07-036024-5", "W1", "Gallimard"),
+    ("978-2-253-09681-4", "W2", "Le Livre de Poche"),
+    ("978-2-08-070462-2", "W4", "Flammarion"),
+    ("978-2-7436-2345-9", "W5", "Éditions du Seuil"),
+    ("2-02-0X4567-8", "W6", "Actes Sud"),
+]
+
+QUERIES = [
+    # Débuts de mots, mots entiers, accents et casse
+    "miserables", "MISÉRABLES", "vict hug", "hugo notre", "zola", "l'education",
+    # Milieux de mots
+    "rables", "constitution", "ndatio", "xupery", "tutionnel",
+    # Fautes de frappe
+    "miserbles", "victr hugo", "flaubrt", "asimof fondation", "sentimantale", "constitx",
+    # Mots courts, ponctuation, sans correspondance
+    "a", "de", "le prince", "-", "saint-exupery", "zzzzzz", "hugo camus",
+]
+
+EDITION_QUERIES = [
+    "gallimard", "galimard", "limard", "livre poche", "poche", "seul", "editions seuil",
+    "978", "07-036", "036024", "0x4567", "2-253", "flamarion", "sud actes", "22", "x", "inconnu",
+]
+
+
+def make_oeuvre(work_id, title, author):
+    """Crée une œuvre de test"""
+    oeuvre = Oeuvre(work_id)
+    oeuvre.title = title
+    oeuvre.author = author
+    return oeuvre
+
+
+def make_edition(isbn, work_id, publisher):
+    """Crée une édition de test"""
+    edition = Edition(isbn, work_id)
+    edition.publisher = publisher
+    return edition
+
+
+@pytest.fixture
+def oeuvres(tmp_path):
+    """Fixture fournissant les repositories d'œuvres en mémoire et SQLite, peuplés à l'identique"""
+    memory, sqlite = OeuvreMemoryRepository(), OeuvreSQLiteRepository(str(tmp_path / "catalogue.db"))
+    for repo in (memory, sqlite):
+        repo.add_many(make_oeuvre(*row) for row in OEUVRES)
+    return memory, sqlite
+
+
+@pytest.fixture
+def editions(tmp_path, oeuvres):
+    """Fixture fournissant les repositories d'éditions en mémoire et SQLite, peuplés à l'identique"""
+    memory, sqlite = EditionMemoryRepository(), EditionSQLiteRepository(str(tmp_path / "catalogue.db"))
+    memory.add_many(make_edition(*row) for row in EDITIONS)
+    for row in EDITIONS:
+        sqlite.add(make_edition(*row))
+    return memory, sqlite
+
+
+def work_ids(oeuvres):
+    """Identifiants triés des œuvres trouvées"""
+    return sorted(oeuvre.work_id for oeuvre in oeuvres)
+
+
+def isbns(editions):
+    """ISBN triés des éditions trouvées"""
+    return sorted(edition.isbn for edition in editions)
+
+
+class TestOeuvreParity:
+    """Tests de parité de la recherche des œuvres"""
+
+    def test_infix(self, oeuvres):
+        """Un milieu de mot est trouvé par les deux backends"""
+        for repo in oeuvres:
+            assert work_ids(repo.search("rables")) == ["W1"]
+            assert work_ids(repo.search("constitution")) == ["W3"]
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_same_results(self, oeuvres, query):
+        """Même ensemble de résultats pour search et search_ranked"""
+        memory, sqlite = oeuvres
+        assert work_ids(sqlite.search(query)) == work_ids(memory.search(query))
+        ranked = [oeuvre for oeuvre, _ in sqlite.search_ranked(query, limit=100)]
+        assert work_ids(ranked) == work_ids(oeuvre for oeuvre, _ in memory.search_ranked(query, limit=100))
+
+    def test_random_variants(self, oeuvres):
+        """Fragments et mots altérés tirés des titres: mêmes résultats"""
+        memory, sqlite = oeuvres
+        rng = random.Random(7)
+        words = [w for _, title, author in OEUVRES for w in U_String(f"{title} {author}").normalize().split()]
+        for _ in range(300):
+            word = rng.choice(words)
+            start = rng.randrange(len(word))
+            fragment = word[start:start + rng.randint(1, 12)]
+            if len(fragment) > 1 and rng.random() < 0.5:
+                position = rng.randrange(len(fragment))
+                fragment = fragment[:position] + rng.choice("aeiouxz") + fragment[position + 1:]
+            assert work_ids(sqlite.search(fragment)) == work_ids(memory.search(fragment)), fragment
+
+    def test_writes_keep_parity(self, oeuvres):
+        """Mots ajoutés par une mise à jour ou une insertion: trouvés aux fautes près"""
+        for repo in oeuvres:
+            oeuvre = repo.get_by_id("W8")
+            oeuvre.title = "Quatrevingt-treize"
+            repo.update(oeuvre)
+            repo.add(make_oeuvre("W9", "Vingt mille lieues sous les mers", "Jules Verne"))
+        memory, sqlite = oeuvres
+        for query in ("quatrevingt", "vingt", "quatrevingy", "germinal", "lieux mer", "verne"):
+            assert work_ids(sqlite.search(query)) == work_ids(memory.search(query)), query
+
+    def test_rebuild_search_index(self, oeuvres):
+        """Les index reconstruits donnent les mêmes résultats"""
+        memory, sqlite = oeuvres
+        sqlite.delete("W3")
+        memory.delete("W3")
+        sqlite.rebuild_search_index()
+        for query in ("constitution", "rables", "miserbles", "flaubrt"):
+            assert work_ids(sqlite.search(query)) == work_ids(memory.search(query)), query
+
+
+class TestEditionParity:
+    """Tests de parité de la recherche des éditions"""
+
+    @pytest.mark.parametrize("query", EDITION_QUERIES)
+    def test_same_results(self, editions, query):
+        """Même ensemble de résultats pour search et search_ranked"""
+        memory, sqlite = editions
+        assert isbns(sqlite.search(query)) == isbns(memory.search(query))
+        ranked = [edition for edition, _ in sqlite.search_ranked(query, limit=100)]
+        assert isbns(ranked) == isbns(edition for edition, _ in memory.search_ranked(query, limit=100))
+
+    def test_infix(self, editions):
+        """Un milieu d'éditeur ou d'ISBN est trouvé par les deux backends"""
+        for repo in editions:
+            assert isbns(repo.search("limard")) == ["978-2-07-036024-5"]
+            assert isbns(repo.search("036024")) == ["978-2-07-036024-5"]
+
+
+class TestSearchIndexTables:
+    """Tests des tables de la recherche floue SQLite (vocabulaire vivant, ISBN hors des variantes)"""
+
+    @staticmethod
+    def orphans(repo, table):
+        """Mots des n-grammes et des variantes qu'aucune ligne ne contient plus"""
+        with repo.transaction() as conn:
+            return {
+                word
+                for name in ("grams", "typos")
+                for (word,) in conn.execute(
+                    f"SELECT word FROM {table}_{name} WHERE word NOT IN (SELECT word FROM {table}_postings)"
+                )
+            }
+
+    def test_updated_and_deleted_words_are_purged(self, oeuvres):
+        """Les mots retirés par une mise à jour ou une suppression quittent le vocabulaire"""
+        memory, sqlite = oeuvres
+        for repo in oeuvres:
+            oeuvre = repo.get_by_id("W8")
+            oeuvre.title = "Quatrevingt-treize"
+            repo.update(oeuvre)
+            repo.delete("W3")
+        assert self.orphans(sqlite, "oeuvres") == set()
+        with sqlite.transaction() as conn:
+            words = {word for (word,) in conn.execute("SELECT word FROM oeuvres_typos")}
+        assert "germinal" not in words and "anticonstitutionnellement" not in words
+        for query in ("germinal", "germinl", "constitution", "quatrevingt"):
+            assert work_ids(sqlite.search(query)) == work_ids(memory.search(query)), query
+
+    def test_cascade_delete_purges_editions(self, editions, oeuvres):
+        """La suppression d'une œuvre retire les mots de ses éditions"""
+        _, sqlite_oeuvres = oeuvres
+        _, sqlite = editions
+        sqlite_oeuvres.delete("W1")
+        assert sqlite.search("gallimard") == []
+        assert self.orphans(sqlite, "editions") == set()
+
+    def test_isbns_and_numbers_stay_out_of_typos(self, oeuvres, editions):
+        """Les ISBN ne sont pas des mots du vocabulaire; les nombres n'ont pas de variantes"""
+        memory, sqlite = oeuvres
+        for repo in oeuvres:
+            repo.add(make_oeuvre("W9", "1984", "George Orwell"))
+        with sqlite.transaction() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM editions_typos WHERE word LIKE '978%'").fetchone()[0] == 0
+            assert conn.execute("SELECT COUNT(*) FROM oeuvres_typos WHERE word = '1984'").fetchone()[0] == 0
+        for query in ("1984", "198", "1985", "19844", "orwel"):
+            assert work_ids(sqlite.search(query)) == work_ids(memory.search(query)), query
@@ -0,0 +1,159 @@
+"""
+Tests pour le repository à deux niveaux et son journal d'écriture différée
+"""
+import time
+import pytest
+from models.oeuvre import Oeuvre
+from models.edition import Edition
+from services.bibliotheque import Bibliotheque
+from services.oeuvre_repository import OeuvreMemoryRepository
+from services.edition_repository import EditionMemoryRepository
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+from services.tiered_repository import TieredRepository, WriteBehindJournal
+
+
+def make_oeuvre(work_id, title="Germinal"):
+    """Crée une œuvre de test"""
+    oeuvre = Oeuvre(work_id)
+    oeuvre.title = title
+    oeuvre.author = "Émile Zola"
+    return oeuvre
+
+
+@pytest.fixture
+def paths(tmp_path):
+    """Fixture fournissant les chemins de la base et du journal"""
+    return str(tmp_path / "catalogue.db"), str(tmp_path / "catalogue.journal")
+
+
+def open_journal(paths, **options):
+    """Ouvre un journal sur les deux repositories SQLite (sans thread de report par défaut)"""
+    db_path, journal_path = paths
+    options.setdefault("flush_interval", None)
+    return WriteBehindJournal(
+        {"oeuvres": OeuvreSQLiteRepository(db_path), "editions": EditionSQLiteRepository(db_path)},
+        journal_path, **options
+    )
+
+
+def open_biblio(journal):
+    """Construit une bibliothèque à deux niveaux sur le journal"""
+    return Bibliotheque(
+        TieredRepository(OeuvreMemoryRepository(), journal, "oeuvres"),
+        TieredRepository(EditionMemoryRepository(), journal, "editions")
+    )
+
+
+class TestWriteBehind:
+    """Tests pour les écritures différées"""
+
+    def test_reads_before_flush(self, paths):
+        """Une écriture est lisible tout de suite, et n'arrive en base qu'au report"""
+        journal = open_journal(paths)
+        biblio = open_biblio(journal)
+        biblio.add_oeuvre(make_oeuvre("W1"))
+        biblio.add_edition(Edition("111", "W1"))
+
+        assert biblio.get_edition("111").work_id == "W1"
+        assert [e.isbn for e in biblio.get_editions_of_oeuvre("W1")] == ["111"]
+        assert journal.durable("oeuvres").get_by_id("W1") is None
+
+        assert journal.flush() == 2
+        assert journal.durable("editions").get_by_id("111").work_id == "W1"
+        assert journal.pending == 0
+        journal.close()
+
+    def test_snapshot_and_order(self, paths):
+        """Le journal garde l'état au moment de l'écriture et l'ordre des opérations"""
+        journal = open_journal(paths)
+        biblio = open_biblio(journal)
+        oeuvre = make_oeuvre("W1")
+        biblio.add_oeuvre(oeuvre)
+        oeuvre.title = "Nana"  # Modification en place, jamais enregistrée
+        biblio.add_edition(Edition("111", "W1"))
+        biblio.remove_oeuvre("W1")
+        biblio.add_oeuvre(make_oeuvre("W2", "La Curée"))
+        journal.flush()
+
+        oeuvres = journal.durable("oeuvres")
+        assert oeuvres.get_by_id("W1") is None
+        assert oeuvres.get_by_id("W2").title == "La Curée"
+        assert journal.durable("editions").get_by_id("111") is None
+        assert journal.rejected == []
+        journal.close()
+
+    def test_rollback_is_not_journaled(self, paths):
+        """Une transaction annulée n'écrit rien au journal"""
+        journal = open_journal(paths)
+        biblio = open_biblio(journal)
+        with pytest.raises(RuntimeError):
+            with biblio.transaction():
+                biblio.add_oeuvre(make_oeuvre("W1"))
+                biblio.add_edition(Edition("111", "W1"))
+                raise RuntimeError()
+        assert journal.pending == 0
+        assert biblio.get_oeuvre("W1") is None
+        journal.close()
+
+    def test_background_flush(self, paths):
+        """Le thread de report vide le journal à intervalle régulier"""
+        journal = open_journal(paths, flush_interval=0.01)
+        biblio = open_biblio(journal)
+        biblio.add_oeuvre(make_oeuvre("W1"))
+
+        deadline = time.monotonic() + 5
+        while journal.pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert journal.durable("oeuvres").get_by_id("W1") is not None
+        journal.close()
+
+
+class TestRecovery:
+    """Tests pour la reprise après un arrêt sans report"""
+
+    def test_replay_at_startup(self, paths):
+        """Les écritures acquittées mais pas reportées sont rejouées au redémarrage"""
+        journal = open_journal(paths, durability="fsync")
+        biblio = open_biblio(journal)
+        biblio.add_oeuvre(make_oeuvre("W1"))
+        biblio.update_oeuvre(make_oeuvre("W1", "Nana"))
+        biblio.add_edition(Edition("111", "W1"))
+        # Arrêt brutal: ni flush ni close
+
+        restarted = open_biblio(open_journal(paths))
+        assert restarted.get_oeuvre("W1").title == "Nana"
+        assert restarted.get_edition("111").work_id == "W1"
+
+    def test_replay_is_idempotent(self, paths):
+        """Un journal déjà en partie reporté peut être rejoué sans erreur"""
+        db_path, journal_path = paths
+        journal = open_journal(paths)
+        open_biblio(journal).add_oeuvre(make_oeuvre("W1"))
+        with open(journal_path, "rb") as file:
+            records = file.read()
+        journal.close()
+        with open(journal_path, "wb") as file:
+            file.write(records + records[:7])  # Déjà reporté, suivi d'un enregistrement tronqué
+
+        journal = open_journal(paths)
+        assert journal.rejected == []
+        assert journal.durable("oeuvres").count() == 1
+        journal.close()
+
+    def test_memory_durability(self, paths):
+        """En durabilité memory, aucun fichier n'est écrit"""
+        db_path, journal_path = paths
+        journal = WriteBehindJournal({"oeuvres": OeuvreSQLiteRepository(db_path)}, durability="memory",
+                                     flush_interval=None)
+        TieredRepository(OeuvreMemoryRepository(), journal, "oeuvres").add(make_oeuvre("W1"))
+        journal.close()
+        assert OeuvreSQLiteRepository(db_path).get_by_id("W1") is not None
+
+    def test_invalid_configuration(self, paths):
+        """Niveau de durabilité inconnu ou fichier manquant"""
+        db_path, _ = paths
+        durables = {"oeuvres": OeuvreSQLiteRepository(db_path)}
+        with pytest.raises(ValueError):
+            WriteBehindJournal(durables, "x.journal", durability="eventually")
+        with pytest.raises(ValueError):
+            WriteBehindJournal(durables, durability="fsync")
@@ -0,0 +1,135 @@
+"""
+Tests pour les unités de travail (Bibliotheque.transaction)
+"""
+import threading
+import pytest
+from models.oeuvre import Oeuvre
+from models.edition import Edition
+from services.bibliotheque import Bibliotheque
+from services.database import OeuvreSQLiteRepository, EditionSQLiteRepository
+from services.oeuvre_repository import OeuvreMemoryRepository
+
+
+def make_oeuvre(work_id, title="Germinal"):
+    """Crée une œuvre de test"""
+    oeuvre = Oeuvre(work_id)
+    oeuvre.title = title
+    oeuvre.author = "Émile Zola"
+    return oeuvre
+
+
+def make_edition(isbn, work_id):
+    """Crée une édition de test"""
+    edition = Edition(isbn, work_id)
+    edition.publisher = "Gallimard"
+    return edition
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def biblio(request, tmp_path):
+    """Fixture fournissant une bibliothèque avec une œuvre et une édition"""
+    if request.param == "memory":
+        biblio = Bibliotheque()
+    else:
+        db_path = str(tmp_path / "catalogue.db")
+        biblio = Bibliotheque(OeuvreSQLiteRepository(db_path), EditionSQLiteRepository(db_path))
+    biblio.add_oeuvre(make_oeuvre("W1"))
+    biblio.add_edition(make_edition("111", "W1"))
+    return biblio
+
+
+class TestTransaction:
+    """Tests pour l'atomicité des unités de travail"""
+
+    def test_commit(self, biblio):
+        """Les opérations du bloc sont toutes validées"""
+        with biblio.transaction():
+            biblio.add_oeuvre(make_oeuvre("W2", "Nana"))
+            biblio.add_edition(make_edition("222", "W2"))
+        assert biblio.get_edition("222").work_id == "W2"
+
+    def test_rollback_spans_both_repositories(self, biblio):
+        """Une exception annule les écritures des deux repositories"""
+        with pytest.raises(RuntimeError):
+            with biblio.transaction():
+                biblio.add_oeuvre(make_oeuvre("W2", "Nana"))
+                biblio.add_edition(make_edition("222", "W2"))
+                biblio.remove_edition("111")
+                raise RuntimeError()
+
+        assert biblio.get_oeuvre("W2") is None
+        assert biblio.get_edition("222") is None
+        assert biblio.get_edition("111") is not None
+        assert biblio.search_oeuvres("nana") == []
+
+    def test_rollback_restores_updates(self, biblio):
+        """Une entité remplacée retrouve sa version d'avant, index compris"""
+        with pytest.raises(ValueError):
+            with biblio.transaction():
+                biblio.update_oeuvre(make_oeuvre("W1", "La Bête humaine"))
+                biblio.add_edition(make_edition("111", "W1"))  # ISBN déjà existant
+
+        assert biblio.get_oeuvre("W1").title == "Germinal"
+        assert [o.work_id for o in biblio.search_oeuvres("germinal")] == ["W1"]
+        assert biblio.search_oeuvres("humaine") == []
+
+    def test_remove_oeuvre_removes_editions(self, biblio):
+        """Supprimer une œuvre supprime ses éditions dans la même transaction"""
+        biblio.add_edition(make_edition("222", "W1"))
+        biblio.remove_oeuvre("W1")
+        assert biblio.editions == []
+
+    def test_single_commit(self, tmp_path):
+        """Avec SQLite, tout le bloc ne coûte qu'un commit"""
+        db_path = str(tmp_path / "catalogue.db")
+        oeuvres = OeuvreSQLiteRepository(db_path)
+        biblio = Bibliotheque(oeuvres, EditionSQLiteRepository(db_path))
+
+        statements = []
+        with oeuvres.transaction() as conn:
+            conn.set_trace_callback(statements.append)
+        with biblio.transaction():
+            for i in range(5):
+                biblio.add_oeuvre(make_oeuvre(f"W{i}"))
+                biblio.add_edition(make_edition(f"{i}{i}{i}", f"W{i}"))
+        with oeuvres.transaction() as conn:
+            conn.set_trace_callback(None)
+
+        assert sum(1 for statement in statements if statement.upper() == "COMMIT") == 1
+        assert len(biblio.editions) == 5
+
+
+class TestJournalThreads:
+    """Tests pour le journal d'annulation en mémoire partagé entre threads"""
+
+    @staticmethod
+    def in_thread(function):
+        """Exécute une fonction dans un autre thread et attend sa fin"""
+        thread = threading.Thread(target=function)
+        thread.start()
+        thread.join()
+
+    def test_rollback_ignores_other_threads(self):
+        """L'annulation d'un thread ne défait pas les écritures d'un autre, faites hors transaction"""
+        repo = OeuvreMemoryRepository()
+        with pytest.raises(RuntimeError):
+            with repo.transaction():
+                repo.add(make_oeuvre("W1"))
+                self.in_thread(lambda: repo.add(make_oeuvre("W2")))
+                raise RuntimeError()
+        assert [oeuvre.work_id for oeuvre in repo.get_all()] == ["W2"]
+
+    def test_rollback_while_other_thread_in_transaction(self):
+        """Une transaction annulée est restaurée même si un autre thread en a une ouverte"""
+        repo = OeuvreMemoryRepository()
+
+        def failing():
+            with pytest.raises(RuntimeError):
+                with repo.transaction():
+                    repo.add(make_oeuvre("W2"))
+                    raise RuntimeError()
+
+        with repo.transaction():
+            repo.add(make_oeuvre("W1"))
+            self.in_thread(failing)
+        assert [oeuvre.work_id for oeuvre in repo.get_all()] == ["W1"]
@@ -0,0 +1,91 @@
+"""
+Tests pour la requête floue compilée (U_FuzzyQuery)
+"""
+import random
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from unicorn.u_string import U_String
+from unicorn.u_fuzzy_query import U_FuzzyQuery
+from unicorn.u_fuzzy_term import U_FuzzyTerm
+
+
+DOCUMENTS = [
+    "Les Misérables Victor Hugo",
+    "Le Petit Prince Antoine de Saint-Exupéry",
+    "Cent ans de solitude Gabriel García Márquez",
+    "anticonstitutionnellement",
+    "",
+]
+
+
+class TestCompile:
+    """Tests pour la compilation de la requête"""
+
+    def test_normalizes_query(self):
+        """La requête est normalisée et découpée une seule fois"""
+        query = U_FuzzyQuery.compile("  Victor   HUGÖ ")
+        assert query.words == ["victor", "hugo"]
+        assert query.text == "victor hugo"
+
+    def test_empty_query(self):
+        """Une requête vide ne filtre aucun document"""
+        query = U_FuzzyQuery.compile("   ")
+        assert not query
+        assert query.matches("les miserables")
+
+
+class TestMatches:
+    """Tests pour la méthode matches"""
+
+    def test_all_words_required(self):
+        """Chaque mot doit correspondre au document"""
+        document = U_String(DOCUMENTS[0]).normalize()
+        assert U_FuzzyQuery.compile("victr hugo").matches(document)
+        assert U_FuzzyQuery.compile("miserbles").matches(document)
+        assert not U_FuzzyQuery.compile("hugo camus").matches(document)
+
+    def test_window_substitution(self):
+        """Une fenêtre du mot à une substitution près correspond"""
+        assert U_FuzzyQuery.compile("constitx").matches("anticonstitutionnellement")
+        assert not U_FuzzyQuery.compile("konstitx").matches("anticonstitutionnellement")
+
+    @pytest.mark.parametrize("query", [
+        "", "a", "hugo", "hugi", "victr", "miserbles", "misé", "prynce", "exupery",
+        "constitx", "marqez", "solitud", "xyz", "zz", "saint exupery", "garcia marquez",
+    ])
+    def test_same_as_fuzzy_match(self, query):
+        """Un mot compilé donne le même résultat que fuzzy_match"""
+        compiled = U_FuzzyQuery.compile(query)
+        for text in DOCUMENTS:
+            document = U_String(text).normalize()
+            expected = all(U_String(text).fuzzy_match(word) for word in compiled.words)
+            assert compiled.matches(document) == expected
+
+    def test_bit_parallel_distance(self):
+        """La distance bit-parallèle concorde avec la distance de Levenshtein"""
+        rng = random.Random(42)
+        for _ in range(2000):
+            pattern = "".join(rng.choice("abc") for _ in range(rng.randint(1, 9)))
+            word = "".join(rng.choice("abc") for _ in range(rng.randint(0, 11)))
+            expected = U_String(pattern).levenshtein_distance(word) <= 2
+            assert U_FuzzyQuery.compile(pattern)._terms[0].within(word, 2) == expected
+
+
+class TestSharedTerm:
+    """Tests pour le cœur commun à U_String.fuzzy_match et U_FuzzyQuery"""
+
+    def test_same_term_class(self):
+        """La requête compilée est faite de U_FuzzyTerm, seuils partagés avec U_String"""
+        assert all(isinstance(term, U_FuzzyTerm) for term in U_FuzzyQuery.compile("victor hugo")._terms)
+        assert U_String._prefixMatchThreshold == U_FuzzyTerm._prefixMatchThreshold
+
+    def test_no_circular_import(self):
+        """u_string s'importe seul, sans charger u_fuzzy_query"""
+        code = (
+            "import sys; from unicorn.u_string import U_String; "
+            "assert U_String('Hugo').fuzzy_match('hugi'); "
+            "assert 'unicorn.u_fuzzy_query' not in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).resolve().parents[1])
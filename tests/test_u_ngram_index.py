@@ -0,0 +1,104 @@
+"""
+Tests pour l'index de n-grammes (U_NgramIndex)
+"""
+import pytest
+from unicorn.u_string import U_String
+from unicorn.u_ngram_index import U_NgramIndex
+from models.oeuvre import Oeuvre
+from services.oeuvre_repository import OeuvreMemoryRepository
+
+
+DOCUMENTS = {
+    "W1": "Les Misérables Victor Hugo",
+    "W2": "Notre-Dame de Paris Victor Hugo",
+    "W3": "Le Petit Prince Antoine de Saint-Exupéry",
+    "W4": "L'Étranger Albert Camus",
+    "W5": "La Peste Albert Camus",
+    "W6": "Cent ans de solitude Gabriel García Márquez",
+    "W7": "anticonstitutionnellement",
+    "W8": "",
+}
+
+QUERIES = [
+    "", "a", "al", "hugo", "hugi", "victr", "miserables", "miserbles", "misé",
+    "camu", "kamus", "peste", "pest", "prin", "prynce", "exupery", "constitx",
+    "constitu", "garcia", "marqez", "solitud", "xyz", "zz", "etranger", "dame",
+]
+
+
+@pytest.fixture
+def index():
+    """Fixture fournissant un index peuplé"""
+    index = U_NgramIndex()
+    for doc_id, text in DOCUMENTS.items():
+        index.add(doc_id, text)
+    return index
+
+
+def brute_force(word, documents=DOCUMENTS):
+    """Résultat de référence: fuzzy_match sur chaque document"""
+    return {doc_id for doc_id, text in documents.items() if U_String(text).fuzzy_match(word)}
+
+
+class TestCandidates:
+    """Tests pour la méthode candidates"""
+
+    @pytest.mark.parametrize("word", QUERIES)
+    def test_no_false_negative(self, index, word):
+        """Les candidats contiennent toujours les documents trouvés par fuzzy_match"""
+        assert brute_force(word) <= index.candidates(word)
+
+    def test_narrows_candidates(self, index):
+        """Un mot précis ne retourne qu'un petit nombre de candidats"""
+        assert index.candidates("miserables") == {"W1"}
+        assert index.candidates("wkw") == set()
+
+    def test_diacritics_and_case(self, index):
+        """La requête est normalisée comme dans fuzzy_match"""
+        assert "W4" in index.candidates("ÉTRANGER")
+        assert "W6" in index.candidates("márquez")
+
+
+class TestIncrementalMaintenance:
+    """Tests pour la maintenance incrémentale de l'index"""
+
+    def test_remove(self, index):
+        """Un document retiré n'est plus candidat"""
+        assert index.remove("W1") is True
+        assert "W1" not in index
+        assert "W1" not in index.candidates("miserables")
+        assert index.remove("W1") is False
+
+    def test_reindex(self, index):
+        """Réindexer un document remplace ses anciens mots"""
+        index.add("W1", "Quatrevingt-treize Victor Hugo")
+        assert "W1" not in index.candidates("miserables")
+        assert "W1" in index.candidates("quatrevingt")
+        assert len(index) == len(DOCUMENTS)
+
+    def test_vocabulary_cleanup(self, index):
+        """Les mots qui ne sont plus utilisés sortent du vocabulaire"""
+        for doc_id in DOCUMENTS:
+            index.remove(doc_id)
+        assert index._postings == {}
+        assert index._grams == {}
+
+
+class TestRepositorySearch:
+    """Teste que la recherche du repository garde la sémantique de fuzzy_match"""
+
+    def test_search_matches_brute_force(self):
+        """La recherche indexée retourne les mêmes œuvres qu'un parcours complet"""
+        repository = OeuvreMemoryRepository()
+        for doc_id, text in DOCUMENTS.items():
+            oeuvre = Oeuvre(doc_id)
+            oeuvre.title = text
+            repository.add(oeuvre)
+
+        for query in QUERIES + ["victor hugo", "albert kamus", "petit prynce"]:
+            words = query.split()
+            expected = [
+                doc_id for doc_id, text in DOCUMENTS.items()
+                if words and all(U_String(f"{text} ").fuzzy_match(word) for word in words)
+            ]
+            assert [o.work_id for o in repository.search(query)] == expected
@@ -37,6 +37,26 @@ class TestRemoveDiacritics:
         assert "è" not in result
 
 
+    def test_ligatures(self):
+        """Teste le développement des ligatures"""
+        assert U_String("Œuvres complètes").remove_diacritics() == "OEuvres completes"
+        assert U_String("cœur et ex æquo").remove_diacritics() == "coeur et ex aequo"
+        assert U_String("\ufb01n").remove_diacritics() == "fin"
+
+    def test_decomposed_input(self):
+        """Teste une chaîne déjà décomposée (e + accent combinant)"""
+        assert U_String("e\u0301te\u0301").remove_diacritics() == "ete"
+
+    def test_outside_latin_table(self):
+        """Teste les caractères hors de la table (chemin NFD)"""
+        assert U_String("Ἀθῆναι à Athènes").remove_diacritics() == "Αθηναι a Athenes"
+
+    def test_returns_plain_str(self):
+        """Teste que le résultat est une str, y compris pour une chaîne ASCII"""
+        assert type(U_String("Hello").remove_diacritics()) is str
+        assert type(U_String("Héllo").remove_diacritics()) is str
+
+
 class TestLevenshteinDistance:
     """Tests pour la méthode levenshtein_distance"""
     
@@ -86,6 +106,43 @@ class TestLevenshteinDistance:
         assert dist1 == dist2
 
 
+class TestLevenshteinWithin:
+    """Tests pour la méthode levenshtein_within (distance bornée)"""
+
+    def test_identical_strings(self):
+        """Teste avec chaînes identiques"""
+        text = U_String("hello")
+        assert text.levenshtein_within("hello", 0) == True
+
+    def test_empty_strings(self):
+        """Teste avec chaînes vides"""
+        assert U_String("").levenshtein_within("", 0) == True
+        assert U_String("").levenshtein_within("ab", 2) == True
+        assert U_String("abc").levenshtein_within("", 2) == False
+
+    def test_threshold(self):
+        """Teste la frontière du seuil"""
+        text = U_String("kitten")
+        assert text.levenshtein_within("sitting", 3) == True
+        assert text.levenshtein_within("sitting", 2) == False
+        assert text.levenshtein_within("sitting", -1) == False
+
+    def test_length_difference_shortcut(self):
+        """Teste le rejet immédiat quand les longueurs sont trop éloignées"""
+        text = U_String("short")
+        assert text.levenshtein_within("very long string", 2) == False
+
+    @pytest.mark.parametrize("max_distance", [0, 1, 2, 3])
+    def test_consistent_with_full_distance(self, max_distance):
+        """Teste la cohérence avec levenshtein_distance sur de nombreux couples"""
+        words = ["chat", "char", "chats", "hat", "xxat", "python", "pithon",
+                 "programming", "progaming", "constitu", "constitx", "", "a", "ab", "ba"]
+        for word in words:
+            for other in words:
+                expected = U_String(word).levenshtein_distance(other) <= max_distance
+                assert U_String(word).levenshtein_within(other, max_distance) == expected
+
+
 class TestFuzzyMatch:
     """Tests pour la méthode fuzzy_match"""
     
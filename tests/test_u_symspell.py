@@ -0,0 +1,80 @@
+"""
+Tests pour le dictionnaire de suppressions (U_SymSpell)
+"""
+import pytest
+from unicorn.u_string import U_String
+from unicorn.u_symspell import U_SymSpell
+from models.edition import Edition
+from services.edition_repository import EditionMemoryRepository
+
+
+VOCABULARY = ["gallimard", "flammarion", "seuil", "folio", "pocket", "hachette", "actes", "sud", "le"]
+
+
+@pytest.fixture
+def symspell():
+    """Fixture fournissant un dictionnaire peuplé"""
+    symspell = U_SymSpell()
+    for word in VOCABULARY:
+        symspell.add(word)
+    return symspell
+
+
+class TestLookup:
+    """Tests pour la méthode lookup"""
+
+    def test_exact_word(self, symspell):
+        """Un mot exact est retrouvé"""
+        assert symspell.lookup("seuil", 0) == {"seuil"}
+
+    def test_typos(self, symspell):
+        """Les fautes de frappe sont corrigées jusqu'à la distance demandée"""
+        assert symspell.lookup("galimard", 1) == {"gallimard"}
+        assert symspell.lookup("flamarrion", 2) == {"flammarion"}
+        assert symspell.lookup("flamarrion", 1) == set()
+
+    @pytest.mark.parametrize("word", ["sued", "sd", "fol", "pockett", "hachete", "xyz", "", "l"])
+    @pytest.mark.parametrize("max_distance", [1, 2])
+    def test_consistent_with_levenshtein(self, symspell, word, max_distance):
+        """Le résultat est exactement l'ensemble des mots à distance <= max_distance"""
+        expected = {w for w in VOCABULARY if U_String(w).levenshtein_distance(word) <= max_distance}
+        assert symspell.lookup(word, max_distance) == expected
+
+    def test_remove(self, symspell):
+        """Un mot retiré n'est plus proposé"""
+        symspell.remove("seuil")
+        assert "seuil" not in symspell
+        assert symspell.lookup("seuil", 2) == set()
+        assert len(symspell) == len(VOCABULARY) - 1
+
+
+class TestRepositorySearch:
+    """Teste la tolérance aux fautes de frappe sur l'éditeur"""
+
+    def test_publisher_typo(self):
+        """Une édition est trouvée malgré une faute dans le nom de l'éditeur"""
+        repository = EditionMemoryRepository()
+        for isbn, publisher in [("111", "Gallimard"), ("222", "Actes Sud"), ("333", "Éditions du Seuil")]:
+            edition = Edition(isbn)
+            edition.publisher = publisher
+            repository.add(edition)
+
+        assert [e.isbn for e in repository.search("galimard")] == ["111"]
+        assert [e.isbn for e in repository.search("actes sid")] == ["222"]
+        assert [e.isbn for e in repository.search("editions seul")] == ["333"]
+        assert [e.isbn for e in repository.search("seuil editoins")] == ["333"]
+        # L'ISBN est cherché par fragment d'au moins 3 caractères, sans faute ni mélange avec l'éditeur
+        assert [e.isbn for e in repository.search("222")] == ["222"]
+        assert repository.search("22") == []
+        assert repository.search("111 galimard") == []
+
+    def test_isbn_not_in_vocabulary(self):
+        """Seuls les mots de l'éditeur sont indexés: pas l'ISBN, unique par édition"""
+        repository = EditionMemoryRepository()
+        for isbn in ("978-2-07-036024-5", "978-2-07-036025-2"):
+            edition = Edition(isbn)
+            edition.publisher = "Gallimard"
+            repository.add(edition)
+
+        assert len(repository._index._typos) == 1
+        assert len(repository.search("07-03602")) == 2
@@ -0,0 +1,78 @@
+"""
+Requête floue compilée, réutilisable sur de nombreux documents
+"""
+from typing import List
+
+from unicorn.u_fuzzy_term import U_FuzzyTerm
+from unicorn.u_string import U_String
+
+
+class U_FuzzyQuery:
+    """
+    Requête de recherche floue compilée une fois, puis testée sur de nombreux documents
+
+    U_String.fuzzy_match renormalise la requête et recalcule préfixe, seuil et
+    sous-chaînes à chaque appel. Ici, ce travail est fait par compile(): matches()
+    ne fait plus que comparer un document déjà normalisé aux mots précompilés.
+
+    Exemple:
+        query = U_FuzzyQuery.compile("Victr Hugo")
+        results = [doc for doc in documents if query.matches(doc)]
+    """
+
+    __slots__ = ('text', 'words', '_terms')
+
+    def __init__(self, words: List[str]) -> None:
+        """
+        Compile des mots de requête déjà normalisés
+
+        Args:
+            words: Les mots de la requête (sans accents, en minuscules)
+        """
+        self.words = list(words)
+        self.text = ' '.join(self.words)
+        self._terms = tuple(U_FuzzyTerm(word) for word in self.words)
+
+    @classmethod
+    def compile(cls, text: str) -> 'U_FuzzyQuery':
+        """
+        Normalise et compile une requête
+
+        Args:
+            text: La requête saisie (accents et casse quelconques)
+
+        Returns:
+            La requête compilée, un terme par mot
+        """
+        return cls(U_String(text).normalize().split())
+
+    def __bool__(self) -> bool:
+        """Une requête sans mot ne filtre rien"""
+        return bool(self._terms)
+
+    def matches(self, normalized_document: str) -> bool:
+        """
+        Vérifie que chaque mot de la requête correspond au document
+
+        Args:
+            normalized_document: Le texte du document, déjà normalisé
+                (U_String.normalize ou champs *_normalized des modèles)
+
+        Returns:
+            True si tous les mots correspondent (avec tolérance aux fautes)
+        """
+        words = None
+        for term in self._terms:
+            if term.contained_in(normalized_document):
+                continue
+            if words is None:
+                # Découpage fait une seule fois, partagé par tous les mots
+                words = normalized_document.split()
+            if not term.matches_words(words):
+                return False
+        return True
+
+    @staticmethod
+    def match_term(pattern: str, normalized_document: str) -> bool:
+        """Vérifie un seul motif normalisé (éventuellement avec espaces) contre un document"""
+        return U_FuzzyTerm(pattern).matches(normalized_document)
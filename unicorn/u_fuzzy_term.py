@@ -0,0 +1,150 @@
+"""
+Mot de requête floue compilé (sous-chaîne, préfixe, Levenshtein, fenêtre glissante)
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Une lettre (ni chiffre, ni ponctuation): les mots sans lettre (nombres, ISBN)
+# ne sont pas comparés par Levenshtein
+_LETTER = re.compile(r"[^\W\d_]")
+
+
+class U_FuzzyTerm:
+    """
+    Un mot de requête compilé: tout le travail côté requête est fait une fois
+
+    Cœur de U_String.fuzzy_match et de U_FuzzyQuery:
+    1. sous-chaîne
+    2. préfixe (75% du mot) pour les mots >= 3 caractères
+    3. Levenshtein <= seuil avec un mot du document de longueur proche (et contenant une lettre)
+    4. fenêtre glissante (10 premières positions) à distance <= 1
+    """
+
+    __slots__ = ('pattern', 'prefix', 'threshold', '_length', '_peq', '_high', '_mask', '_halves')
+
+    # Seuil de correspondance par préfixe (75%)
+    _prefixMatchThreshold = 0.75
+    # Nombre maximum de sous-chaînes à vérifier pour éviter les problèmes de performance
+    _maxSubstringChecks = 10
+
+    def __init__(self, pattern: str) -> None:
+        """
+        Précalcule le préfixe, le seuil et la table de correspondance du mot
+
+        Args:
+            pattern: Le mot de requête, déjà normalisé
+        """
+        length = len(pattern)
+        self.pattern = pattern
+        self._length = length
+        self.threshold = 1 if length <= 4 else 2
+        self.prefix: Optional[str] = None
+        if length >= 3:
+            self.prefix = pattern[:int(length * U_FuzzyTerm._prefixMatchThreshold)]
+
+        # Table de Myers: caractère -> masque des positions où il apparaît dans le mot
+        self._peq: Dict[str, int] = {}
+        for position, char in enumerate(pattern):
+            self._peq[char] = self._peq.get(char, 0) | (1 << position)
+        self._high = 1 << (length - 1) if length else 0
+        self._mask = (1 << length) - 1
+
+        # Deux fenêtres de même longueur à distance 1 ne diffèrent que d'une
+        # substitution: l'une des deux moitiés est donc identique
+        middle = length // 2
+        self._halves: Tuple[Tuple[int, str], ...] = ((0, pattern[:middle]), (middle, pattern[middle:]))
+
+    def contained_in(self, document: str) -> bool:
+        """Étapes 1 et 2: le mot ou son préfixe apparaît dans le document"""
+        return self.pattern in document or (self.prefix is not None and self.prefix in document)
+
+    def matches_words(self, words: List[str]) -> bool:
+        """Étapes 3 et 4: un mot du document est suffisamment proche"""
+        length = self._length
+        for word in words:
+            word_length = len(word)
+            if abs(word_length - length) <= 2 and self.within(word, self.threshold) and self.typo_tolerant(word):
+                return True
+            if word_length >= length and self._window_match(word):
+                return True
+        return False
+
+    def matches(self, document: str) -> bool:
+        """Vérifie le mot contre un document normalisé"""
+        return self.contained_in(document) or self.matches_words(document.split())
+
+    @staticmethod
+    def typo_tolerant(word: str) -> bool:
+        """
+        Vérifie qu'un mot du document est comparé par Levenshtein (étape 3)
+
+        Un nombre ou un ISBN ne se retrouve que par sous-chaîne ou par fenêtre:
+        ses variantes n'ont pas à entrer dans les dictionnaires de suppressions.
+        """
+        return _LETTER.search(word) is not None
+
+    def within(self, text: str, max_distance: int) -> bool:
+        """
+        Vérifie si la distance de Levenshtein au mot est <= max_distance
+
+        Algorithme bit-parallèle de Myers (variante de Hyyrö pour la distance
+        globale): une colonne entière de la matrice est calculée par quelques
+        opérations sur des entiers, à partir de la table précalculée du mot.
+
+        Args:
+            text: Le mot du document
+            max_distance: Distance maximale tolérée
+
+        Returns:
+            True si la distance est <= max_distance
+        """
+        length = self._length
+        remaining = len(text)
+        if abs(remaining - length) > max_distance:
+            return False
+        if not length:
+            return remaining <= max_distance
+
+        peq, high, mask = self._peq, self._high, self._mask
+        vp, vn, score = mask, 0, length
+        for char in text:
+            eq = peq.get(char, 0)
+            xv = eq | vn
+            xh = (((eq & vp) + vp) ^ vp) | eq
+            hp = vn | (~(xh | vp) & mask)
+            hn = vp & xh
+            if hp & high:
+                score += 1
+            elif hn & high:
+                score -= 1
+            remaining -= 1
+            # Le score final ne peut baisser que d'une unité par caractère restant
+            if score - remaining > max_distance:
+                return False
+            hp = ((hp << 1) | 1) & mask
+            hn = (hn << 1) & mask
+            vp = hn | (~(xv | hp) & mask)
+            vn = hp & xv
+        return score <= max_distance
+
+    def _window_match(self, word: str) -> bool:
+        """Cherche une fenêtre du mot à distance <= 1 (au plus une substitution)"""
+        pattern, length = self.pattern, self._length
+        positions = min(len(word) - length + 1, U_FuzzyTerm._maxSubstringChecks)
+        for start in range(positions):
+            for offset, half in self._halves:
+                if word.startswith(half, start + offset):
+                    if self._hamming_within_one(word, start):
+                        return True
+                    break
+        return False
+
+    def _hamming_within_one(self, word: str, start: int) -> bool:
+        """Vérifie qu'une fenêtre ne diffère du mot qu'en une position au plus"""
+        mismatches = 0
+        for char, expected in zip(word[start:start + self._length], self.pattern):
+            if char != expected:
+                mismatches += 1
+                if mismatches > 1:
+                    return False
+        return True
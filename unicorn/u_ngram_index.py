@@ -0,0 +1,199 @@
+"""
+Index inversé de n-grammes pour pré-filtrer la recherche floue
+"""
+from typing import Dict, Hashable, List, Set
+
+from unicorn.u_fuzzy_term import U_FuzzyTerm
+from unicorn.u_string import U_String
+from unicorn.u_symspell import U_SymSpell
+
+
+class U_NgramIndex:
+    """
+    Index inversé maintenu incrémentalement sur les mots normalisés de documents
+
+    Trois niveaux d'index:
+    - vocabulaire: mot normalisé -> identifiants des documents qui le contiennent
+    - n-grammes (1 à 3 caractères): n-gramme -> mots du vocabulaire qui le contiennent
+    - suppressions (U_SymSpell): variantes d'un mot -> mots du vocabulaire
+      (mots contenant une lettre: voir U_FuzzyTerm.typo_tolerant)
+
+    candidates() retourne un sur-ensemble des documents pour lesquels
+    U_String(texte).fuzzy_match(mot) est vrai, sans aucun calcul de Levenshtein:
+    il suffit ensuite de vérifier ces candidats avec fuzzy_match.
+    """
+
+    # Longueur maximale des n-grammes indexés (trigrammes)
+    _maxGramLength = 3
+
+    def __init__(self) -> None:
+        """Initialise un index vide"""
+        self._documents: Dict[Hashable, Set[str]] = {}
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._typos = U_SymSpell()
+
+    def __len__(self) -> int:
+        """Nombre de documents indexés"""
+        return len(self._documents)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        """Vérifie si un document est indexé"""
+        return doc_id in self._documents
+
+    @staticmethod
+    def tokenize(text: str) -> Set[str]:
+        """Découpe un texte en mots normalisés (sans accents, minuscules)"""
+        return set(U_String(text).remove_diacritics().lower().split())
+
+    def add(self, doc_id: Hashable, text: str) -> None:
+        """
+        Indexe (ou réindexe) un document
+
+        Args:
+            doc_id: Identifiant du document
+            text: Texte à indexer (normalisé ici, comme dans fuzzy_match)
+        """
+        if doc_id in self._documents:
+            self.remove(doc_id)
+
+        tokens = self.tokenize(text)
+        self._documents[doc_id] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                for gram in self._grams_of(token):
+                    self._grams.setdefault(gram, set()).add(token)
+                if U_FuzzyTerm.typo_tolerant(token):
+                    self._typos.add(token)
+            postings.add(doc_id)
+
+    def remove(self, doc_id: Hashable) -> bool:
+        """
+        Retire un document de l'index
+
+        Args:
+            doc_id: Identifiant du document
+
+        Returns:
+            True si le document était indexé
+        """
+        tokens = self._documents.pop(doc_id, None)
+        if tokens is None:
+            return False
+
+        for token in tokens:
+            postings = self._postings[token]
+            postings.discard(doc_id)
+            if postings:
+                continue
+            # Plus aucun document ne contient ce mot: le sortir du vocabulaire
+            del self._postings[token]
+            self._typos.remove(token)
+            for gram in self._grams_of(token):
+                vocabulary = self._grams[gram]
+                vocabulary.discard(token)
+                if not vocabulary:
+                    del self._grams[gram]
+        return True
+
+    def candidates(self, word: str) -> Set[Hashable]:
+        """
+        Retourne les documents pouvant correspondre à un mot de requête
+
+        Garantit l'absence de faux négatifs par rapport à fuzzy_match:
+        - sous-chaîne / préfixe: le mot du document contient le motif
+        - Levenshtein <= seuil: le mot est retrouvé par le dictionnaire de suppressions
+        - fenêtre glissante à distance 1: une des deux moitiés apparaît telle quelle
+
+        Args:
+            word: Un mot de la requête
+
+        Returns:
+            Ensemble (sur-ensemble) des identifiants de documents candidats
+        """
+        query = U_String(word).remove_diacritics().lower()
+        if not query:
+            # La chaîne vide est sous-chaîne de tout document
+            return set(self._documents)
+
+        length = len(query)
+        window_span = U_String._maxSubstringChecks - 1 + length
+
+        if length >= 3:
+            pattern = query[:int(length * U_String._prefixMatchThreshold)]
+        else:
+            pattern = query
+        tokens = set(self._tokens_containing(pattern))
+        tokens |= self._typo_tokens(query)
+
+        for piece in self._split(query, 2):
+            tokens.update(
+                token for token in self._tokens_containing(piece)
+                if len(token) >= length and piece in token[:window_span]
+            )
+
+        return self._documents_of(tokens)
+
+    def typo_candidates(self, word: str) -> Set[Hashable]:
+        """
+        Retourne les documents contenant un mot proche du mot de requête
+
+        Un mot du document correspond s'il est à distance de Levenshtein <= 1
+        (requête de 4 caractères ou moins) ou <= 2, comme dans fuzzy_match.
+        Le résultat est exact: aucune vérification supplémentaire n'est nécessaire.
+
+        Args:
+            word: Un mot de la requête (éventuellement mal orthographié)
+
+        Returns:
+            Ensemble des identifiants de documents correspondants
+        """
+        query = U_String(word).remove_diacritics().lower()
+        return self._documents_of(self._typo_tokens(query))
+
+    def _typo_tokens(self, query: str) -> Set[str]:
+        """Retourne les mots du vocabulaire à distance tolérée d'une requête normalisée"""
+        threshold = 1 if len(query) <= 4 else 2
+        return self._typos.lookup(query, threshold)
+
+    def _documents_of(self, tokens: Set[str]) -> Set[Hashable]:
+        """Retourne l'union des documents contenant l'un des mots"""
+        documents: Set[Hashable] = set()
+        for token in tokens:
+            documents.update(self._postings[token])
+        return documents
+
+    def _tokens_containing(self, piece: str) -> Set[str]:
+        """Retourne les mots du vocabulaire contenant exactement le morceau"""
+        if not piece:
+            return self._postings.keys()
+        if len(piece) <= self._maxGramLength:
+            return self._grams.get(piece, set())
+
+        size = self._maxGramLength
+        vocabularies = []
+        for i in range(len(piece) - size + 1):
+            vocabulary = self._grams.get(piece[i:i + size])
+            if not vocabulary:
+                return set()
+            vocabularies.append(vocabulary)
+        # Partir du trigramme le plus rare puis vérifier la sous-chaîne complète
+        smallest = min(vocabularies, key=len)
+        return {token for token in smallest if piece in token}
+
+    @classmethod
+    def _grams_of(cls, token: str) -> Set[str]:
+        """Retourne tous les n-grammes (1 à 3 caractères) d'un mot"""
+        return {
+            token[i:i + size]
+            for size in range(1, cls._maxGramLength + 1)
+            for i in range(len(token) - size + 1)
+        }
+
+    @staticmethod
+    def _split(text: str, parts: int) -> List[str]:
+        """Découpe un texte en morceaux contigus de tailles équilibrées"""
+        length = len(text)
+        return [text[i * length // parts:(i + 1) * length // parts] for i in range(parts)]
@@ -1,21 +1,77 @@
+import re
 import unicodedata
 
+from unicorn.u_fuzzy_term import U_FuzzyTerm
+
+
+def _strip_marks(text: str) -> str:
+    """Décompose (NFD) puis retire les marques diacritiques (catégorie Mn)"""
+    # Décompose les caractères accentués (é -> e + ´)
+    nfd = unicodedata.normalize('NFD', text)
+    # Garde seulement les caractères non-diacritiques
+    return ''.join(c for c in nfd if unicodedata.category(c) != 'Mn')
+
+
+# Ligatures non décomposées par NFD, remplacées par leurs lettres
+_LIGATURES = {
+    'Œ': 'OE', 'œ': 'oe', 'Æ': 'AE', 'æ': 'ae',     # français
+    'ª': 'a', 'º': 'o',                             # ordinaux espagnols et portugais
+    '\ufb00': 'ff', '\ufb01': 'fi', '\ufb02': 'fl',  # ligatures typographiques
+    '\ufb03': 'ffi', '\ufb04': 'ffl', '\ufb05': 'st', '\ufb06': 'st',
+}
+
+# Dernier caractère couvert par la table (fin de Latin étendu B)
+_TABLE_END = 0x024F
+
+
+def _build_diacritics_table() -> dict:
+    """Précalcule la table str.translate: Latin-1, Latin étendu A et B, ligatures"""
+    ligatures = str.maketrans(_LIGATURES)
+    table = {}
+    for code in range(0x80, _TABLE_END + 1):
+        value = _strip_marks(chr(code)).translate(ligatures)
+        if value != chr(code):
+            table[code] = value
+    table.update(ligatures)
+    return table
+
+
+_DIACRITICS_TABLE = _build_diacritics_table()
+
+# Suites de caractères hors de la table, à traiter par le chemin NFD
+_OUTSIDE_TABLE = re.compile(f'[^\\x00-\\u{_TABLE_END:04x}]+')
+
 
 class U_String(str):
     """Classe personnalisée pour les chaînes de caractères avec des fonctionnalités supplémentaires"""
 
-    # Seuil de correspondance par préfixe (75%)
-    _prefixMatchThreshold = 0.75
-    # Nombre maximum de sous-chaînes à vérifier pour éviter les problèmes de performance
-    _maxSubstringChecks = 10
+    # Seuils de la recherche floue, définis avec son cœur (U_FuzzyTerm)
+    _prefixMatchThreshold = U_FuzzyTerm._prefixMatchThreshold
+    _maxSubstringChecks = U_FuzzyTerm._maxSubstringChecks
+    # Qualité d'une correspondance (match_score), de la plus forte à la plus faible
+    _exactWordScore = 1.0
+    _wordPrefixScore = 0.8
+    _substringScore = 0.6
+    _fuzzyScore = 0.4
 
     def remove_diacritics(self) -> str:
-        """Supprime les diacritiques (accents)"""
-        # Décompose les caractères accentués (é -> e + ´)
-        nfd = unicodedata.normalize('NFD', self)
-        # Garde seulement les caractères non-diacritiques
-        return ''.join(c for c in nfd if unicodedata.category(c) != 'Mn')
+        """Supprime les diacritiques (accents) et développe les ligatures (œ -> oe)
+
+        Chemin rapide: une chaîne ASCII est retournée telle quelle, et les
+        caractères latins accentués sont traduits par une table précalculée.
+        La décomposition NFD n'est appliquée qu'aux caractères hors de la table.
+        """
+        if self.isascii():
+            return str(self)
+        text = self.translate(_DIACRITICS_TABLE)
+        if text.isascii():
+            return text
+        return _OUTSIDE_TABLE.sub(lambda match: _strip_marks(match.group()), text)
     
+    def normalize(self) -> str:
+        """Normalise la chaîne pour les comparaisons (sans accents, en minuscules)"""
+        return self.remove_diacritics().lower()
+
     def levenshtein_distance(self, other: str) -> int:
         """Calcule la distance de Levenshtein entre deux chaînes (optimisé)"""
         if self == other:
@@ -43,6 +99,54 @@ class U_String(str):
             previous_row, current_row = current_row, previous_row
         return previous_row[len_s2]
 
+    def levenshtein_within(self, other: str, max_distance: int) -> bool:
+        """Vérifie si la distance de Levenshtein est <= max_distance (calcul borné)
+
+        Seule la bande diagonale |i - j| <= max_distance de la matrice est calculée,
+        et le calcul s'arrête dès qu'une ligne entière dépasse max_distance.
+        """
+        if max_distance < 0:
+            return False
+        if self == other:
+            return True
+        s1, s2 = (self, other) if len(self) <= len(other) else (other, self)
+        len_s1, len_s2 = len(s1), len(s2)
+        # La différence de longueur est un minorant de la distance
+        if len_s2 - len_s1 > max_distance:
+            return False
+
+        # Toute valeur > max_distance est plafonnée (hors bande = trop loin)
+        too_far = max_distance + 1
+        previous_row = [min(j, too_far) for j in range(len_s2 + 1)]
+        current_row = [too_far] * (len_s2 + 1)
+
+        for i in range(1, len_s1 + 1):
+            low = max(1, i - max_distance)
+            high = min(len_s2, i + max_distance)
+            current_row[0] = min(i, too_far)
+            if low > 1:
+                current_row[low - 1] = too_far
+            row_min = current_row[low - 1]
+            char = s1[i - 1]
+            for j in range(low, high + 1):
+                cost = 0 if char == s2[j - 1] else 1
+                value = min(
+                    previous_row[j] + 1,       # suppression
+                    current_row[j - 1] + 1,    # insertion
+                    previous_row[j - 1] + cost, # substitution
+                    too_far
+                )
+                current_row[j] = value
+                if value < row_min:
+                    row_min = value
+            if high < len_s2:
+                current_row[high + 1] = too_far
+            # Sortie anticipée: toute la ligne est déjà trop loin
+            if row_min > max_distance:
+                return False
+            previous_row, current_row = current_row, previous_row
+        return previous_row[len_s2] <= max_distance
+
     def fuzzy_match(self, other: str) -> bool:
         """Vérifie si une chaîne correspond à une autre avec tolérance aux erreurs
         
@@ -50,47 +154,31 @@ class U_String(str):
         1. Correspondance exacte (sous-chaîne)
         2. Correspondance par préfixe pour mots >= 3 caractères
         3. Recherche floue avec Levenshtein sur les mots
+
+        Pour tester une même requête sur de nombreux textes, préférer
+        U_FuzzyQuery.compile(), qui ne fait le travail côté requête qu'une fois.
         """
-        # Normalisation une seule fois
-        normalized_self = self.remove_diacritics().lower()
-        normalized_other = U_String(other).remove_diacritics().lower()
+        return U_FuzzyTerm(U_String(other).normalize()).matches(self.normalize())
 
-        # 1. Correspondance exacte (sous-chaîne)
-        if normalized_other in normalized_self:
-            return True
+    def match_score(self, other: str) -> float:
+        """Mesure la qualité de la correspondance avec une autre chaîne (entre 0 et 1)
 
-        # 2. Correspondance par préfixe (au moins 60% du mot)
-        if len(normalized_other) >= 3:
-            prefix_length = int(len(normalized_other) * self._prefixMatchThreshold)
-            prefix = normalized_other[:prefix_length]
-            if prefix in normalized_self:
-                return True
+        Barème:
+        - mot identique: 1.0
+        - début d'un mot: 0.8
+        - sous-chaîne: 0.6
+        - correspondance floue (préfixe partiel ou Levenshtein): 0.4
+        - aucune correspondance (fuzzy_match faux): 0.0
+        """
+        normalized_self = self.normalize()
+        normalized_other = U_String(other).normalize()
 
-        # 3. Recherche floue par mot avec distance de Levenshtein
-        words = normalized_self.split()
-        threshold = 1 if len(normalized_other) <= 4 else 2
-        
-        for word in words:
-            if not word:
-                continue
-
-            # Correspondance exacte déjà testée ligne 57, skip
-            # Vérifier la distance de Levenshtein pour les mots de longueur similaire
-            if abs(len(word) - len(normalized_other)) <= 2:
-                distance = self.levenshtein_distance(normalized_other) if word == self else U_String(word).levenshtein_distance(normalized_other)
-                if distance <= threshold:
-                    return True
-
-            # Vérifier si le mot de la requête est une sous-chaîne avec tolérance
-            if len(word) >= len(normalized_other):
-                substrings_checked = 0
-                for i in range(len(word) - len(normalized_other) + 1):
-                    if substrings_checked >= self._maxSubstringChecks:
-                        break
-                    substring = word[i:i + len(normalized_other)]
-                    distance = U_String(substring).levenshtein_distance(normalized_other)
-                    if distance <= 1:
-                        return True
-                    substrings_checked += 1
-
-        return False
+        if normalized_other in normalized_self:
+            words = normalized_self.split()
+            if normalized_other in words:
+                return self._exactWordScore
+            if any(word.startswith(normalized_other) for word in words):
+                return self._wordPrefixScore
+            return self._substringScore
+
+        return self._fuzzyScore if self.fuzzy_match(other) else 0.0
@@ -0,0 +1,95 @@
+"""
+Dictionnaire de suppressions (approche SymSpell) pour la correction de fautes de frappe
+"""
+from typing import Dict, Set
+
+from unicorn.u_string import U_String
+
+
+class U_SymSpell:
+    """
+    Dictionnaire de variantes par suppression sur un vocabulaire de mots
+
+    Chaque mot du vocabulaire est indexé sous toutes ses variantes obtenues en
+    supprimant jusqu'à max_distance caractères. Si deux mots sont à distance de
+    Levenshtein <= k, ils partagent une variante à k suppressions au plus de chaque
+    côté: la recherche d'un mot mal orthographié ne coûte donc que quelques accès
+    au dictionnaire, quelle que soit la taille du vocabulaire.
+    """
+
+    # Distance d'édition maximale précalculée
+    _maxEditDistance = 2
+
+    def __init__(self, max_distance: int = _maxEditDistance) -> None:
+        """
+        Initialise un dictionnaire vide
+
+        Args:
+            max_distance: Nombre maximal de suppressions précalculées
+        """
+        self.max_distance = max_distance
+        self._words: Set[str] = set()
+        self._deletes: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        """Taille du vocabulaire"""
+        return len(self._words)
+
+    def __contains__(self, word: str) -> bool:
+        """Vérifie si un mot est dans le vocabulaire"""
+        return word in self._words
+
+    def add(self, word: str) -> None:
+        """Ajoute un mot au vocabulaire"""
+        if word in self._words:
+            return
+        self._words.add(word)
+        for variant in self.variants(word, self.max_distance):
+            self._deletes.setdefault(variant, set()).add(word)
+
+    def remove(self, word: str) -> None:
+        """Retire un mot du vocabulaire"""
+        if word not in self._words:
+            return
+        self._words.discard(word)
+        for variant in self.variants(word, self.max_distance):
+            words = self._deletes[variant]
+            words.discard(word)
+            if not words:
+                del self._deletes[variant]
+
+    def lookup(self, word: str, max_distance: int) -> Set[str]:
+        """
+        Retourne les mots du vocabulaire à distance de Levenshtein <= max_distance
+
+        Args:
+            word: Le mot recherché (éventuellement mal orthographié)
+            max_distance: Distance maximale (bornée par celle précalculée)
+
+        Returns:
+            Ensemble des mots du vocabulaire suffisamment proches
+        """
+        max_distance = min(max_distance, self.max_distance)
+        candidates: Set[str] = set()
+        for variant in self.variants(word, max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+        query = U_String(word)
+        return {
+            candidate for candidate in candidates
+            if abs(len(candidate) - len(word)) <= max_distance
+            and query.levenshtein_within(candidate, max_distance)
+        }
+
+    @staticmethod
+    def variants(word: str, max_distance: int) -> Set[str]:
+        """Retourne le mot et toutes ses variantes à max_distance suppressions au plus"""
+        variants = {word}
+        level = {word}
+        for _ in range(max_distance):
+            level = {
+                variant[:i] + variant[i + 1:]
+                for variant in level
+                for i in range(len(variant))
+            }
+            variants |= level
+        return variants